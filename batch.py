@@ -0,0 +1,66 @@
+# 命令行批处理：不启动界面，按任务描述文件批量生成、加噪声、滤波并保存信号
+# 用法：python batch.py jobs.json [-o 输出目录] [-j 进程数]
+# 只依赖 engine（NumPy/SciPy），不会导入 PyQt5 或 matplotlib
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+
+from engine.jobs import expand_jobs, load_spec, run_job, warm_up
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量生成、处理并保存信号')
+    parser.add_argument('spec', help='任务描述文件（.json / .yaml）')
+    parser.add_argument('-o', '--output-dir', help='输出目录（默认取任务描述中的 output_dir，或 output）')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='并行进程数（默认为 CPU 核数）')
+    parser.add_argument('--data-dir', default='data', help='心电数据目录')
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec)
+        jobs = expand_jobs(spec)
+    except (OSError, ValueError) as e:
+        print(f'任务描述文件有误: {e}', file=sys.stderr)
+        return 2
+    output_dir = args.output_dir or spec.get('output_dir', 'output')
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results, failures = [], []
+    # 每个进程先导入 SciPy，导入时间不计入第一个任务的耗时
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1, args.jobs), initializer=warm_up) as pool:
+        futures = {pool.submit(run_job, job, output_dir, args.data_dir): job['name'] for job in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # 任务描述有误（如 "period": null）或执行出错时只记录该任务失败，其余任务继续
+                failures.append({'name': name, 'error': repr(e)})
+                print(f'{name:<32} 失败: {e!r}', file=sys.stderr)
+                continue
+            results.append(result)
+            shape = f"{result['sets']}×{result['samples']}" if 'sets' in result else str(result['samples'])
+            if 'generate_s' in result:
+                timing = (f"生成 {result['generate_s']:8.4f}s  处理 {result['process_s']:8.4f}s  "
+                          f"写入 {result['write_s']:8.4f}s")
+            else:
+                timing = f"总计 {result['total_s']:8.4f}s（{'流式' if result.get('streamed') else '参数扫描'}，各步骤交替进行）"
+            print(f"{name:<32} {shape:>12} 点  {timing}")
+    elapsed = time.perf_counter() - start
+
+    # 保存每个任务的耗时摘要
+    results.sort(key=lambda r: r['name'])
+    failures.sort(key=lambda r: r['name'])
+    with open(os.path.join(output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump({'elapsed_s': elapsed, 'failures': len(failures), 'failed': failures, 'jobs': results}, f,
+                  ensure_ascii=False, indent=2)
+    print(f'完成 {len(results)} 个任务，失败 {len(failures)} 个，总耗时 {elapsed:.3f}s')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
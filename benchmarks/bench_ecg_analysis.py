@@ -0,0 +1,62 @@
+# 心电分析：整段 R 波检测，以及动态演示中逐帧输入新点的流式检测
+import numpy as np
+import pytest
+
+import engine
+
+SAMPLE_RATE = 500.0
+
+
+def simulated_ecg(size, rate=75):
+    # 模拟心电：每个 RR 间期一个窄高斯 R 波，叠加基线和噪声
+    rr = 60.0 / rate
+    t = np.arange(size) / SAMPLE_RATE
+    phase = (t + rr / 2) % rr - rr / 2
+    return 2150 + 100 * np.exp(-(phase / 0.01) ** 2) + np.random.default_rng(0).normal(0, 5, size)
+
+
+@pytest.fixture
+def ecg(size):
+    return simulated_ecg(size)
+
+
+def bench_detect_r_peaks(benchmark, size, ecg):
+    benchmark.group = 'ecg-r-peaks'
+    peaks = benchmark(engine.detect_r_peaks, ecg, SAMPLE_RATE)
+    assert abs(len(peaks) - size / SAMPLE_RATE / 0.8) <= 2
+
+
+@pytest.mark.parametrize('rate', [250, 300])
+def bench_detect_r_peaks_high_rate(benchmark, size, rate):
+    # 心率很高（界面中有 300 次/分的记录）时相邻心搏不能合并，实测心率与设定值一致
+    benchmark.group = 'ecg-r-peaks-high-rate'
+    if size < 10 ** 4:
+        pytest.skip('至少需要几秒的数据才能测得心率')
+    peaks = benchmark(engine.detect_r_peaks, simulated_ecg(size, rate), SAMPLE_RATE)
+    assert abs(engine.mean_heart_rate(peaks, SAMPLE_RATE) - rate) < 1
+
+
+@pytest.mark.parametrize('baseline', ['zero', 'constant', 'drift'])
+def bench_detect_r_peaks_flat(benchmark, size, baseline):
+    # 只有基线（导联脱落、恒定值、缓慢漂移）时没有 R 波，起始处的滤波瞬态和舍入误差不能被当成 R 波
+    benchmark.group = 'ecg-r-peaks-flat'
+    t = np.arange(size) / SAMPLE_RATE
+    y = {'zero': np.zeros(size), 'constant': np.full(size, 2000.0),
+         'drift': 2000 + 30 * np.sin(2 * np.pi * 0.3 * t) + 5 * t}[baseline]
+    peaks = benchmark(engine.detect_r_peaks, y, SAMPLE_RATE)
+    assert len(peaks) == 0
+
+
+def bench_stream_r_peaks(benchmark, size, ecg):
+    benchmark.group = 'ecg-r-peaks-stream'
+    if size > 10 ** 5:
+        pytest.skip('逐帧输入的耗时与点数成正比，只测较小的规模')
+
+    def stream():
+        # 60 FPS 回放时每帧约 8 个新点
+        detector = engine.QrsDetector(SAMPLE_RATE)
+        for start in range(0, size, 8):
+            detector.process(ecg[start:start + 8])
+        return detector.flush()
+
+    benchmark(stream)
@@ -0,0 +1,32 @@
+# 心电 CSV 读取：第一次解析 CSV，以及之后从 .npy 缓存映射读取
+import os
+
+import numpy as np
+import pytest
+
+from engine.ecg_data import cache_path, load_recording, parse_csv
+
+
+@pytest.fixture
+def ecg_csv(tmp_path_factory, size):
+    path = os.path.join(tmp_path_factory.mktemp('ecg'), 'bpm60.csv')
+    values = 2150 + 50 * np.sin(np.linspace(0, 2 * np.pi * size / 500, size))
+    np.savetxt(path, values, fmt='%.3f')
+    return path
+
+
+def bench_parse_csv(benchmark, size, ecg_csv):
+    benchmark.group = 'ecg-parse'
+    if size > 10 ** 6:
+        # 一千万行文本解析一次就要十几秒，只测一轮
+        benchmark.pedantic(parse_csv, args=(ecg_csv,), rounds=1, iterations=1)
+    else:
+        benchmark(parse_csv, ecg_csv)
+
+
+def bench_load_cached(benchmark, size, ecg_csv):
+    benchmark.group = 'ecg-cached'
+    load_recording(ecg_csv)
+    assert os.path.exists(cache_path(ecg_csv))
+    # 读取缓存并取出所有数据
+    benchmark(lambda: np.asarray(load_recording(ecg_csv)).sum())
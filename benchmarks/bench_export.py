@@ -0,0 +1,30 @@
+# 导出后再由 File → Open 的读取函数读回：数据与原信号一致（整数格式在量化误差以内）
+import os
+
+import numpy as np
+import pytest
+
+import engine
+from engine.writers import WAV_FULL_SCALE
+
+SAMPLE_RATE = 1000.0
+# 导出格式 → 读回后允许的最大误差（相对于信号幅值）
+FORMATS = {
+    '.npy': 0.0,
+    '.csv': 0.0,
+    '.f32': 1e-6,
+    '.i16': 1.0 / WAV_FULL_SCALE,
+}
+
+
+@pytest.mark.parametrize('extension', FORMATS)
+def bench_export_roundtrip(benchmark, size, signal, extension, tmp_path):
+    benchmark.group = f'export{extension}'
+    if extension == '.csv' and size > 10 ** 6:
+        pytest.skip('CSV 只测到 10^6 点')
+    path = os.path.join(tmp_path, 'signal' + extension)
+    benchmark(engine.export_signal, path, signal, sample_rate=SAMPLE_RATE)
+    loaded = engine.read_signal(path)
+    assert len(loaded) == size
+    peak = np.abs(signal).max()
+    assert np.abs(np.asarray(loaded.data) - signal).max() <= FORMATS[extension] * peak
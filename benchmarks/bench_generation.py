@@ -0,0 +1,31 @@
+# 波形生成：四种基本信号（plot_sin 等）和 N 个分量的合成信号（plot_synthesis）
+import pytest
+
+import engine
+
+
+class Component:
+    def __init__(self, signal_type, period, amplitude=1.0, baseline=0.0, phase=0.0):
+        self.signal_type = signal_type
+        self.period = period
+        self.amplitude = amplitude
+        self.baseline = baseline
+        self.phase = phase
+
+
+@pytest.mark.parametrize('signal_type', sorted(engine.SIGNAL_TYPES))
+def bench_generate(benchmark, size, signal_type):
+    benchmark.group = f'generate-{signal_type}'
+    timebase = engine.TimeBase.from_duration(10.0, size)
+    x, out = timebase.axis(), timebase.empty()
+    benchmark(engine.generate, signal_type, x, 1.0, 2.0, 0.5, 0.1, out=out)
+
+
+@pytest.mark.parametrize('components', [1, 8, 64])
+def bench_synthesis(benchmark, size, components):
+    benchmark.group = f'synthesis-{components}'
+    timebase = engine.TimeBase.from_duration(10.0, size)
+    signal_data_list = [Component(i % 4 + 1, 1.0 + i / 10, 1.0 / (i + 1), 0.0, i / 7)
+                        for i in range(components)]
+    x, out = timebase.axis(), timebase.empty()
+    benchmark(engine.synthesize, signal_data_list, x, out=out)
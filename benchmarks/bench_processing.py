@@ -0,0 +1,28 @@
+# 加噪声和 filter_enable 的两个滤波分支（零相位 Butterworth / 平滑滤波）
+import numpy as np
+import pytest
+
+import engine
+
+
+def bench_add_noise(benchmark, size, signal):
+    benchmark.group = 'noise'
+    benchmark(engine.add_gaussian_noise, signal, 0.1, 0)
+
+
+@pytest.mark.parametrize('noise_type', engine.NOISE_TYPES)
+def bench_colored_noise(benchmark, size, noise_type):
+    benchmark.group = f'noise-{noise_type}'
+    benchmark(engine.colored_noise, size, noise_type, rng=0, sample_rate=500.0, dtype=np.float32)
+
+
+def bench_butterworth(benchmark, size, signal):
+    benchmark.group = 'filter-butterworth'
+    # 与 filter_enable 相同的参数：4 阶，截止频率按奈奎斯特频率归一化为 0.1
+    benchmark(engine.butter_filter, signal, 4, 0.1, 2.0, zero_phase=True)
+
+
+@pytest.mark.parametrize('mode', engine.SMOOTH_MODES)
+def bench_smooth(benchmark, size, signal, mode):
+    benchmark.group = f'filter-{mode}'
+    benchmark(engine.smooth, signal, 5, mode=mode)
@@ -0,0 +1,31 @@
+# 主窗口在 offscreen 平台上的重绘耗时：静态绘图（check_signalType）和动态演示的一帧
+import pytest
+
+
+@pytest.fixture
+def window(qapp, size):
+    main = pytest.importorskip('main')
+    window = main.MyMainWindow()
+    window.resize(1200, 800)
+    # 所有计算在当前线程完成，测得的是完整的生成 + 重绘时间
+    window.async_threshold = float('inf')
+    window.sample_count = size
+    window.update_timebase()
+    window.basic_signal.setChecked(True)
+    window.signalType.setCurrentIndex(0)
+    yield window
+    if window.dynamic_enable is True:
+        main.MyMainWindow.dynamic_enable(window)
+    window.close()
+
+
+def bench_static_redraw(benchmark, size, window):
+    benchmark.group = 'redraw-static'
+    benchmark(window.check_signalType)
+
+
+def bench_dynamic_frame(benchmark, size, window):
+    benchmark.group = 'redraw-dynamic'
+    type(window).dynamic_enable(window)
+    window.timer.stop()
+    benchmark(window.basic_update_plot)
@@ -0,0 +1,9 @@
+# 频谱窗口（SpectrumDialog）中的频谱计算：加窗幅度谱和 Welch 功率谱
+import pytest
+
+
+@pytest.mark.parametrize('method', ['amplitude', 'welch'])
+def bench_spectrum(benchmark, qapp, size, signal, method):
+    from child_window2 import compute_spectrum
+    benchmark.group = f'spectrum-{method}'
+    benchmark(compute_spectrum, signal, 500.0, method)
@@ -0,0 +1,48 @@
+# 性能回归检查（CI 入口）
+# 运行 pytest-benchmark 测试，与提交在 benchmarks/.baselines 中的基准结果比较，
+# 任一测试的最短耗时比基准慢超过 --threshold 时返回非零退出码；当前机器（操作系统、Python 版本）没有基准时也返回非零
+# 用法：python benchmarks/check_regression.py [--threshold 50%] [--max-size 100000]
+#       python benchmarks/check_regression.py --save    # 在当前机器上重新生成基准，之后提交 .baselines 下新生成的文件
+import argparse
+import glob
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(BENCH_DIR, '.baselines')
+# CI 中比较的默认规模：覆盖到 10^5 点，整套测试在一分钟左右完成
+DEFAULT_MAX_SIZE = 10 ** 5
+
+
+def machine_baselines():
+    # 当前机器对应目录下保存的基准文件（pytest-benchmark 按“系统-解释器-版本-位数”分目录）
+    from pytest_benchmark.utils import get_machine_id
+
+    return sorted(glob.glob(os.path.join(BASELINE_DIR, get_machine_id(), '*.json')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='性能回归检查')
+    # 同一台虚拟机上重复运行，小规模测试的最短耗时也会相差 20%~40%；真正的回归（如失去向量化）通常是数倍
+    parser.add_argument('--threshold', default='50%', help='允许变慢的比例（按最短耗时比较）')
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE, help='只运行不超过该长度的规模')
+    parser.add_argument('--save', action='store_true', help='保存为新的基准，不做比较')
+    args = parser.parse_args()
+
+    command = [sys.executable, '-m', 'pytest', BENCH_DIR, '-q', '--max-size', str(args.max_size)]
+    if args.save:
+        command.append('--benchmark-save=baseline')
+    else:
+        baselines = machine_baselines()
+        if not baselines:
+            print(f'没有当前机器的基准结果（{BASELINE_DIR}），先运行 --save 生成并提交', file=sys.stderr)
+            return 2
+        # 与最新的基准比较
+        command += ['--benchmark-compare=' + os.path.basename(baselines[-1]).split('_')[0],
+                    '--benchmark-compare-fail=min:' + args.threshold]
+    return subprocess.run(command, cwd=BENCH_DIR).returncode
+
+
+if __name__ == '__main__':
+    sys.exit(main())
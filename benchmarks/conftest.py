@@ -0,0 +1,47 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+# 重绘测试使用 Qt 的 offscreen 平台，不需要显示器
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# 信号长度从 10^3 到 10^7
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+# 基准结果默认保存在 benchmarks/.baselines 下（按机器和 Python 版本分目录）
+BASELINE_STORAGE = 'file://' + os.path.join(BENCH_DIR, '.baselines')
+
+
+def pytest_addoption(parser):
+    parser.addoption('--max-size', type=int, default=SIZES[-1], help='只运行不超过该长度的规模')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # 没有指定 --benchmark-storage 时，无论从哪个目录运行都使用 benchmarks/.baselines
+    if config.getoption('benchmark_storage', None) == 'file://./.benchmarks':
+        config.option.benchmark_storage = BASELINE_STORAGE
+
+
+def pytest_generate_tests(metafunc):
+    # 使用 size 参数的测试按 SIZES 展开
+    if 'size' in metafunc.fixturenames:
+        limit = metafunc.config.getoption('max_size')
+        metafunc.parametrize('size', [size for size in SIZES if size <= limit])
+
+
+@pytest.fixture
+def signal(size):
+    # 带噪声的正弦信号
+    x = np.linspace(0, 10, size)
+    return np.sin(2 * np.pi * x) + np.random.default_rng(0).normal(0, 0.1, size)
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    QApplication = pytest.importorskip('PyQt5.QtWidgets').QApplication
+    return QApplication.instance() or QApplication([])
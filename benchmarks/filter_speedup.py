@@ -0,0 +1,65 @@
+# 移动平均滤波性能对比：原 filter_enable 中的逐点 Python 循环 vs engine.moving_average
+# 用法：python benchmarks/filter_speedup.py [--legacy-max 200000]
+# 原实现是 O(N·k) 的解释执行，超过 --legacy-max 的规模按单点耗时线性外推
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine import moving_average, smooth  # noqa: E402
+
+SIZES = [2_000, 20_000, 200_000, 2_000_000, 10_000_000]
+FILTER_SIZE = 5
+
+
+def legacy_filter(y, filter_size):
+    # 原 filter_enable 中心电信号分支的实现
+    filtered_y = []
+    for i in range(len(y)):
+        start_idx = max(0, i - filter_size + 1)
+        end_idx = min(i + 1, len(y))
+        window = y[start_idx:end_idx]
+        filtered_y.append(np.mean(window))
+    return filtered_y
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='移动平均滤波性能对比')
+    parser.add_argument('--legacy-max', type=int, default=200_000, help='实际运行原实现的最大样本数')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'N':>12} {'legacy (s)':>12} {'mean (s)':>10} {'median (s)':>11} {'ema (s)':>9} {'speedup':>9}")
+    per_sample = None
+    for n in SIZES:
+        y = 2000 + 50 * rng.standard_normal(n)
+        if n <= args.legacy_max:
+            y_list = y.tolist()
+            legacy = best_of(lambda: legacy_filter(y_list, FILTER_SIZE), 1)
+            per_sample = legacy / n
+            legacy_text = f'{legacy:12.4f}'
+        else:
+            legacy = per_sample * n
+            legacy_text = f'{legacy:11.2f}*'
+        repeat = 5 if n <= 200_000 else 1
+        mean_t = best_of(lambda: moving_average(y, FILTER_SIZE), repeat)
+        median_t = best_of(lambda: smooth(y, FILTER_SIZE, mode='median'), repeat)
+        ema_t = best_of(lambda: smooth(y, FILTER_SIZE, mode='ema'), repeat)
+        print(f'{n:>12} {legacy_text} {mean_t:10.4f} {median_t:11.4f} {ema_t:9.4f} {legacy / mean_t:8.0f}x')
+    print('* 按单点耗时外推')
+
+
+if __name__ == '__main__':
+    main()
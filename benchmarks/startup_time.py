@@ -0,0 +1,78 @@
+# 启动时间测试
+# 1. 导入耗时：用 python -X importtime 测量 import main 的累计耗时，超过 --budget-ms 时返回非零退出码，
+#    并检查子窗口、scipy 等按需加载的模块没有在启动时被导入
+# 2. 首窗时间：启动程序直到主窗口显示完成的时间（SIGVIS_QUIT_ON_SHOW 使程序显示主窗口后立即退出）
+# 用法：python benchmarks/startup_time.py [--budget-ms 1500] [--runs 5] [--command dist/main/main.exe]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 启动时不应导入的模块（第一次使用时才加载）
+LAZY_MODULES = ['child_window1', 'child_window2', 'child_window3', 'scipy', 'engine.jobs']
+
+
+def parse_importtime(stderr):
+    # 解析 -X importtime 的输出，返回 {模块名: (自身耗时, 累计耗时)}（微秒），以及顶层导入的顺序
+    times, top = {}, []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+        if 1 < len(name) - len(name.lstrip()) <= 3:
+            top.append(name.strip())
+    return times, top
+
+
+def measure_imports(python, env):
+    code = 'import sys, main; print(",".join(sorted(sys.modules)))'
+    result = subprocess.run([python, '-X', 'importtime', '-c', code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    times, top = parse_importtime(result.stderr)
+    return times, top, set(result.stdout.strip().split(','))
+
+
+def measure_first_window(command, runs, env):
+    env = dict(env, SIGVIS_QUIT_ON_SHOW='1')
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='启动时间测试')
+    parser.add_argument('--budget-ms', type=float, default=1500, help='import main 的累计耗时上限（毫秒）')
+    parser.add_argument('--runs', type=int, default=5, help='首窗时间的测量次数')
+    parser.add_argument('--command', nargs='+', help='要测量首窗时间的程序（默认 python main.py，可指定打包后的 exe）')
+    parser.add_argument('--skip-window', action='store_true', help='只测量导入耗时')
+    args = parser.parse_args()
+    env = dict(os.environ)
+
+    times, top, loaded = measure_imports(sys.executable, env)
+    total_ms = times['main'][1] / 1000
+    print(f'import main: {total_ms:.1f} ms（上限 {args.budget_ms:.0f} ms）')
+    for name in sorted(top, key=lambda n: -times[n][1])[:10]:
+        print(f'  {name:<48} {times[name][1] / 1000:8.1f} ms')
+    failed = total_ms > args.budget_ms
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    if eager:
+        print(f'启动时被导入的按需加载模块: {", ".join(eager)}')
+        failed = True
+
+    if not args.skip_window:
+        command = args.command or [sys.executable, 'main.py']
+        samples = measure_first_window(command, args.runs, env)
+        print(f'首窗时间（{args.runs} 次）: 最短 {min(samples) * 1000:.0f} ms，'
+              f'中位数 {statistics.median(samples) * 1000:.0f} ms')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
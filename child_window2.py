@@ -1,13 +1,27 @@
-import numpy as np
 from PyQt5.QtWidgets import  QVBoxLayout, QDialog
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from engine import amplitude_spectrum, Pipeline, ArraySource, SpectrumSink
+from instrument import timed
+
+def compute_spectrum(signal_data, sample_rate, method='amplitude', window='hann'):
+    # 计算频谱，不涉及界面，可以在后台线程中执行；Welch 谱由流水线逐块计算（与 engine.welch 相同）
+    if method == 'welch':
+        freqs, power = Pipeline(ArraySource(signal_data, sample_rate)).run(SpectrumSink(window=window))[0]
+        return freqs, power
+    return amplitude_spectrum(signal_data, sample_rate, window=window)
 
 class SpectrumDialog(QDialog):
-    def __init__(self, signal_data,sample_rate, parent=None):
+    # method='amplitude' 为加窗的单边幅度谱，method='welch' 为 Welch 平均功率谱密度（适合长信号）
+    # spectrum 为已经计算好的 (频率轴, 频谱)，不为 None 时不再重新计算
+    def __init__(self, signal_data,sample_rate, parent=None, method='amplitude', window='hann', spectrum=None):
         super(SpectrumDialog, self).__init__(parent)
+        self.method = method
+        self.window = window
+        self.spectrum = spectrum
         self.initUI(signal_data,sample_rate)
 
+    @timed
     def initUI(self, signal_data,sample_rate):
         self.setWindowTitle('频谱图')
         self.setLayout(QVBoxLayout())
@@ -19,15 +33,18 @@ class SpectrumDialog(QDialog):
         self.layout().addWidget(self.canvas)
 
         # 计算频谱
-        N = len(signal_data)
-        T = 1.0 / sample_rate
-        yf = np.fft.rfftfreq(N, T)
-        y = np.fft.rfft(signal_data)
+        if self.spectrum is None:
+            self.spectrum = compute_spectrum(signal_data, sample_rate, self.method, self.window)
+        yf, y = self.spectrum
 
         # 绘制频谱图
-        self.ax.plot(yf, np.abs(y))
+        self.ax.plot(yf, y)
         self.ax.set_xlabel('f (Hz)')
-        self.ax.set_ylabel('amplitude')
+        if self.method == 'welch':
+            self.ax.set_yscale('log')
+            self.ax.set_ylabel('PSD')
+        else:
+            self.ax.set_ylabel('amplitude')
         self.ax.set_title('Spectrogram')
         # 调整坐标轴范围以适应数据
         self.ax.relim()
@@ -0,0 +1,63 @@
+from PyQt5.QtWidgets import QVBoxLayout, QDialog
+from PyQt5.QtCore import QTimer
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from engine import StreamingSpectrogram
+
+class SpectrogramDialog(QDialog):
+    # 非模态的实时频谱图（瀑布图）窗口：样本通过 push 增量送入，
+    # 只更新同一个 imshow 对象的数据，按固定帧率重绘，与主窗口的定时器互不影响
+    def __init__(self, sample_rate, parent=None, nperseg=256, history=200, refresh_interval=33):
+        super(SpectrogramDialog, self).__init__(parent)
+        self.nperseg = nperseg
+        self.history = history
+        self.dirty = False
+        self.initUI()
+        self.reset(sample_rate)
+
+        # 重绘定时器，默认约 30 帧每秒
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.timeout.connect(self.redraw)
+        self.redraw_timer.start(refresh_interval)
+
+    def initUI(self):
+        self.setWindowTitle('实时频谱图')
+        self.setLayout(QVBoxLayout())
+
+        # 创建matplotlib的Figure和Canvas
+        self.fig = Figure()
+        self.ax = self.fig.add_subplot(111)
+        self.canvas = FigureCanvas(self.fig)
+        self.layout().addWidget(self.canvas)
+        self.image = None
+
+    def reset(self, sample_rate):
+        # 信号或采样率改变时重新开始
+        self.spectrogram = StreamingSpectrogram(sample_rate, nperseg=self.nperseg, history=self.history)
+        extent = (-self.history, 0, 0, self.spectrogram.freqs[-1])
+        if self.image is None:
+            self.image = self.ax.imshow(self.spectrogram.image(), origin='lower', aspect='auto',
+                                        interpolation='nearest', extent=extent)
+            self.fig.colorbar(self.image, ax=self.ax, label='dB')
+            self.ax.set_xlabel('frame')
+            self.ax.set_ylabel('f (Hz)')
+            self.ax.set_title('Spectrogram')
+        else:
+            self.image.set_extent(extent)
+        self.dirty = True
+
+    def push(self, samples):
+        # 送入新样本，有新帧时标记需要重绘
+        if self.spectrogram.push(samples):
+            self.dirty = True
+
+    def redraw(self):
+        if not self.dirty or not self.isVisible():
+            return
+        # 原地更新图像数据和颜色范围（最大值以下 80dB）
+        data = self.spectrogram.image()
+        self.image.set_data(data)
+        vmax = data.max()
+        self.image.set_clim(vmax - 80, vmax)
+        self.canvas.draw_idle()
+        self.dirty = False
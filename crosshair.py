@@ -0,0 +1,103 @@
+from matplotlib.lines import Line2D
+from matplotlib.transforms import blended_transform_factory
+
+from engine.query import PointQuery
+
+
+class Crosshair:
+    # 悬停十字光标：鼠标移动时吸附到最近的采样点，显示十字线和坐标读数
+    # 取值使用 PointQuery（x 单调时二分查找，否则使用缓存的显示坐标空间索引），每次移动不扫描整个数组；
+    # 十字线和读数是画布上的动画对象，缓存不含它们的背景，每次移动只 blit 这几个对象，不重绘曲线
+    def __init__(self, canvas, ax, source, radius=10.0):
+        # source() 返回全分辨率的 (x, y)，没有可查询的数据（如动态演示中）时返回 None
+        self.canvas = canvas
+        self.ax = ax
+        self.source = source
+        self.radius = radius
+        self.query = PointQuery()
+        self._background = None
+        style = dict(color='gray', linewidth=0.8, linestyle='--', animated=True, visible=False)
+        # 放在 figure 上而不是坐标轴上：ax.clear() 不会移除它们，也不会影响 relim / autoscale
+        self.vline = Line2D([0, 0], [0, 1], transform=blended_transform_factory(ax.transData, ax.transAxes),
+                            **style)
+        self.hline = Line2D([0, 1], [0, 0], transform=blended_transform_factory(ax.transAxes, ax.transData),
+                            **style)
+        self.text = canvas.figure.text(0.01, 0.99, '', transform=ax.transAxes, color='purple',
+                                       verticalalignment='top', animated=True, visible=False)
+        for artist in (self.vline, self.hline):
+            artist.set_clip_box(ax.bbox)
+            canvas.figure.add_artist(artist)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.mpl_connect('motion_notify_event', self._on_move)
+        self.canvas.mpl_connect('axes_leave_event', self._on_leave)
+
+    @property
+    def artists(self):
+        return self.vline, self.hline, self.text
+
+    @property
+    def visible(self):
+        return self.vline.get_visible()
+
+    def update_data(self):
+        # 取当前数据，返回是否有可查询的数据
+        data = self.source()
+        if data is None:
+            return False
+        self.query.set_data(*data)
+        return len(self.query) > 0
+
+    def pick(self, event, radius=None):
+        # 鼠标事件位置周围 radius 像素内（显示坐标中）距离最近的采样点下标，没有时返回 None
+        if event.inaxes is not self.ax or not self.update_data():
+            return None
+        return self.query.pick(event.x, event.y, self.ax.transData.get_affine().get_matrix(),
+                               self.radius if radius is None else radius, self.ax.bbox.extents)
+
+    def clear(self):
+        # 隐藏十字线但不重绘（如动态演示开始前，由实时绘图器接管画布）
+        for artist in self.artists:
+            artist.set_visible(False)
+
+    def hide(self):
+        if not self.visible:
+            return
+        self.clear()
+        if self._background is not None:
+            self.canvas.restore_region(self._background)
+            self.canvas.blit(self.ax.bbox)
+
+    def _on_draw(self, event):
+        # 每次完整重绘后重新缓存背景
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self.visible:
+            self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.canvas.figure.draw_artist(artist)
+
+    def _on_move(self, event):
+        if event.inaxes is not self.ax or self._background is None or not self.update_data():
+            self.hide()
+            return
+        # x 单调时按横坐标吸附，否则吸附到 radius 像素内最近的点
+        if self.query.monotonic:
+            index = self.query.nearest_x(event.xdata)
+        else:
+            index = self.pick(event)
+        if index is None:
+            self.hide()
+            return
+        x, y = self.query.point(index)
+        self.vline.set_xdata([x, x])
+        self.hline.set_ydata([y, y])
+        self.text.set_text(f'x = {x:.6g}   y = {y:.6g}   [{index}]')
+        for artist in self.artists:
+            artist.set_visible(True)
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.ax.bbox)
+
+    def _on_leave(self, event):
+        self.hide()
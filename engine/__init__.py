@@ -0,0 +1,54 @@
+# 信号计算引擎：纯 NumPy 实现，不依赖 PyQt5 / matplotlib，
+# 可在批处理脚本或工作进程中直接使用，界面层只负责调用和绘图
+from .timebase import TimeBase
+from .generators import (SINE, TRIANGLE, SAWTOOTH, SQUARE, SIGNAL_TYPES,
+                         sine, triangle, sawtooth, square, generate)
+from .synthesis import group_components, synthesize
+from .sweep import SWEEP_BUDGET, parameter_grid, sweep, sweep_synthesis
+from .incremental import IncrementalGenerator
+from .noise import (NOISE_TYPES, NoiseStream, gaussian_noise, add_gaussian_noise, colored_noise, add_noise,
+                    signal_power, snr_scale)
+from .filters import (SMOOTH_MODES, moving_average, moving_median,
+                      exponential_moving_average, smooth)
+from .butterworth import BTYPES, ButterworthFilter, butter_sos, butter_filter
+from .ecg_data import ECG_SAMPLE_RATE, EcgDataset, ecg_csv_path, load_recording, recording_sample_rate
+from .playback import RingBuffer, EcgPlayback
+from .ecg_analysis import (QRS_BAND, QrsDetector, detect_r_peaks, rr_intervals, heart_rate,
+                           mean_heart_rate)
+from .lod import UniformAxis, MinMaxPyramid, minmax_decimate, preview_minmax
+from .query import DisplayIndex, PointQuery, is_monotonic, nearest_sample
+from .readers import READERS, SignalFile, reader, read_signal
+from .writers import (WRITERS, writer, export_signal, iter_chunks, generated_chunks,
+                      synthesized_chunks)
+from .pipeline import (PIPELINE_CHUNK, CACHE_BUDGET, SignalSource, SynthesisSource, ArraySource, FileSource,
+                       Stage, NoiseStage, FilterStage, DecimateStage, ArraySink, SpectrumSink, PeakSink,
+                       StageCache, Pipeline)
+from .history import HISTORY_BUDGET, ProcessingHistory
+from .spectrum import (WINDOWS, get_window, next_fast_len, rfft_frequencies,
+                       amplitude_spectrum, welch, StreamingSpectrogram)
+
+__all__ = [
+    'TimeBase',
+    'SINE', 'TRIANGLE', 'SAWTOOTH', 'SQUARE', 'SIGNAL_TYPES',
+    'sine', 'triangle', 'sawtooth', 'square', 'generate',
+    'group_components', 'synthesize',
+    'SWEEP_BUDGET', 'parameter_grid', 'sweep', 'sweep_synthesis',
+    'IncrementalGenerator',
+    'NOISE_TYPES', 'NoiseStream', 'gaussian_noise', 'add_gaussian_noise', 'colored_noise', 'add_noise',
+    'signal_power', 'snr_scale',
+    'SMOOTH_MODES', 'moving_average', 'moving_median', 'exponential_moving_average', 'smooth',
+    'BTYPES', 'ButterworthFilter', 'butter_sos', 'butter_filter',
+    'ECG_SAMPLE_RATE', 'EcgDataset', 'ecg_csv_path', 'load_recording', 'recording_sample_rate',
+    'RingBuffer', 'EcgPlayback',
+    'QRS_BAND', 'QrsDetector', 'detect_r_peaks', 'rr_intervals', 'heart_rate', 'mean_heart_rate',
+    'UniformAxis', 'MinMaxPyramid', 'minmax_decimate', 'preview_minmax',
+    'DisplayIndex', 'PointQuery', 'is_monotonic', 'nearest_sample',
+    'READERS', 'SignalFile', 'reader', 'read_signal',
+    'WRITERS', 'writer', 'export_signal', 'iter_chunks', 'generated_chunks', 'synthesized_chunks',
+    'PIPELINE_CHUNK', 'CACHE_BUDGET', 'SignalSource', 'SynthesisSource', 'ArraySource', 'FileSource',
+    'Stage', 'NoiseStage', 'FilterStage', 'DecimateStage', 'ArraySink', 'SpectrumSink', 'PeakSink',
+    'StageCache', 'Pipeline',
+    'HISTORY_BUDGET', 'ProcessingHistory',
+    'WINDOWS', 'get_window', 'next_fast_len', 'rfft_frequencies', 'amplitude_spectrum', 'welch',
+    'StreamingSpectrogram',
+]
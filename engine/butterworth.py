@@ -0,0 +1,79 @@
+import functools
+
+import numpy as np
+
+# 支持的滤波器类型
+BTYPES = ('lowpass', 'highpass', 'bandpass')
+
+
+def _normalize_cutoff(cutoff, fs, btype):
+    # 统一截止频率的格式，作为缓存键的一部分；带通滤波需要 (低, 高) 两个截止频率
+    if btype not in BTYPES:
+        raise ValueError(f"未知的滤波器类型: {btype}")
+    nyquist = fs / 2
+    if btype == 'bandpass':
+        low, high = (float(c) for c in cutoff)
+        if not 0 < low < high < nyquist:
+            raise ValueError("带通截止频率必须满足 0 < 低 < 高 < fs/2")
+        return (low, high)
+    cutoff = float(cutoff)
+    if not 0 < cutoff < nyquist:
+        raise ValueError("截止频率必须在 (0, fs/2) 范围内")
+    return cutoff
+
+
+@functools.lru_cache(maxsize=64)
+def _design(order, cutoff, fs, btype):
+    from scipy.signal import butter
+
+    return butter(order, cutoff, btype=btype, fs=fs, output='sos')
+
+
+def butter_sos(order, cutoff, fs, btype='lowpass'):
+    # 设计 Butterworth 滤波器，返回二阶节（SOS）系数，按 (order, cutoff, fs, btype) 缓存
+    # 返回的数组被所有调用方共享，不要原地修改
+    if order < 1:
+        raise ValueError("滤波器阶数必须大于 0")
+    fs = float(fs)
+    return _design(int(order), _normalize_cutoff(cutoff, fs, btype), fs, btype)
+
+
+class ButterworthFilter:
+    # 流式 Butterworth 滤波器：在多次 process 调用之间保留滤波器状态，
+    # 长信号或实时信号可以逐块滤波，结果与一次性滤波整段信号相同
+    def __init__(self, order, cutoff, fs, btype='lowpass'):
+        self.sos = butter_sos(order, cutoff, fs, btype)
+        self.zi = None
+
+    def reset(self):
+        # 清除滤波器状态，下一块数据重新开始
+        self.zi = None
+
+    def process(self, chunk, out=None):
+        from scipy.signal import sosfilt, sosfilt_zi
+
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if len(chunk) == 0:
+            return np.empty(0) if out is None else out
+        if self.zi is None:
+            # 以第一个点的稳态作为初始状态，避免起始处的阶跃瞬态
+            self.zi = sosfilt_zi(self.sos) * chunk[0]
+        result, self.zi = sosfilt(self.sos, chunk, zi=self.zi)
+        if out is None:
+            return result
+        out[:] = result
+        return out
+
+
+def butter_filter(y, order, cutoff, fs, btype='lowpass', zero_phase=False):
+    # 对整段信号进行 Butterworth 滤波
+    # zero_phase=True 时前向-反向各滤波一次（离线使用），没有相位延迟；信号过短时退化为因果滤波
+    from scipy.signal import sosfiltfilt
+
+    y = np.asarray(y, dtype=np.float64)
+    sos = butter_sos(order, cutoff, fs, btype)
+    if zero_phase:
+        padlen = 3 * (2 * len(sos) + 1 - min((sos[:, 2] == 0).sum(), (sos[:, 5] == 0).sum()))
+        if len(y) > padlen:
+            return sosfiltfilt(sos, y, padlen=padlen)
+    return ButterworthFilter(order, cutoff, fs, btype).process(y)
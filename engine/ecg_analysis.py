@@ -0,0 +1,214 @@
+import collections
+import functools
+
+import numpy as np
+
+from .butterworth import ButterworthFilter, butter_sos
+
+# Pan-Tompkins QRS 检测的默认参数：带通频率（Hz）、积分窗口、不应期和初始学习时长（秒）
+# 不应期略短于 300 次/分的 RR 间期（0.2 秒），最高心率的记录也能逐个检出
+QRS_BAND = (5.0, 15.0)
+QRS_WINDOW = 0.15
+QRS_REFRACTORY = 0.15
+QRS_LEARNING = 2.0
+# 积分信号的下限（相对于 (信号最大绝对值 × 采样率)²）：低于它的峰只是舍入误差（如恒定的信号），不作为 R 波
+QRS_FLOOR = 1e-9
+# 整段检测时每次处理的点数，限制中间结果的内存占用
+_BLOCK = 1 << 20
+# 计算平均 RR 间期的心搏数
+_RR_HISTORY = 8
+
+
+@functools.lru_cache(maxsize=16)
+def _bandpass_delay(band, fs):
+    # 带通滤波器在中心频率处的群延迟（点数），用于在原始信号中定位 R 波
+    from scipy.signal import group_delay, sos2tf
+
+    b, a = sos2tf(butter_sos(2, band, fs, 'bandpass'))
+    _, delay = group_delay((b, a), w=[np.sqrt(band[0] * band[1])], fs=fs)
+    return int(round(float(delay[0])))
+
+
+class QrsDetector:
+    # 流式 R 波检测（Pan-Tompkins）：带通滤波、微分、平方、滑动窗口积分都是向量化的，
+    # 滤波器和积分器状态在多次 process 调用之间保留；积分信号中前后半个积分窗口内的最大值作为候选峰，
+    # 再按自适应阈值（信号峰 / 噪声峰的指数平均）和不应期逐个判断，RR 间期过长时在漏检区间内以半阈值回溯
+    # 候选峰需要其后半个积分窗口的点才能确定，结果比输入延迟约 window / 2；
+    # 逐块处理与一次处理整段得到的 R 波位置相同，位置为从第一个输入点开始计数的绝对下标
+    def __init__(self, sample_rate, band=QRS_BAND, window=QRS_WINDOW, refractory=QRS_REFRACTORY,
+                 learning=QRS_LEARNING):
+        fs = float(sample_rate)
+        band = tuple(float(f) for f in band)
+        self.sample_rate = fs
+        self.bandpass = ButterworthFilter(2, band, fs, 'bandpass')
+        # 五点微分 y[n] = (2x[n] + x[n-1] - x[n-3] - 2x[n-4]) * fs / 8
+        self.derivative = np.array([2.0, 1.0, 0.0, -1.0, -2.0]) * (fs / 8)
+        self.window = max(1, int(round(window * fs)))
+        self.refractory = max(1, int(round(refractory * fs)))
+        # 候选峰的邻域（前后各半个积分窗口）：比不应期短，心率很高时相邻的心搏不会合并为一个候选峰
+        self.neighborhood = max(1, self.window // 2)
+        self.learning = max(1, int(round(learning * fs)))
+        # 积分信号的峰值滞后于 R 波的点数上限（积分窗口 + 微分和带通滤波的延迟）
+        self.delay = self.window + 2 + _bandpass_delay(band, fs)
+        self.reset()
+
+    def reset(self):
+        # 清除所有状态，下一块数据重新开始计数
+        self.bandpass.reset()
+        self.zi = np.zeros(len(self.derivative) - 1)
+        self.tail = np.zeros(self.window - 1)
+        self.raw = np.empty(0)
+        self.mwi = np.empty(0)
+        self.offset = 0  # 缓冲区第一个点的绝对下标
+        self.count = 0  # 已输入的点数
+        self.checked = 0  # 该位置之前的候选峰已经判断过
+        self.spki = self.npki = None
+        self.floor = 0.0  # 积分信号的下限，学习阶段按信号幅值确定
+        self.last_peak = None
+        self.rr = collections.deque(maxlen=_RR_HISTORY)
+        self.rejected = []  # 上一个 R 波之后被判为噪声的候选峰 (位置, 积分值, R 波位置)
+
+    @property
+    def threshold(self):
+        return self.npki + 0.25 * (self.spki - self.npki)
+
+    def process(self, chunk):
+        # 输入一块数据，返回新确定的 R 波位置
+        from scipy.signal import lfilter
+
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if len(chunk) == 0:
+            return np.empty(0, dtype=np.int64)
+        filtered = self.bandpass.process(chunk)
+        energy, self.zi = lfilter(self.derivative, [1.0], filtered, zi=self.zi)
+        np.square(energy, out=energy)
+        self.raw = np.concatenate((self.raw, chunk))
+        self.mwi = np.concatenate((self.mwi, self._integrate(energy)))
+        self.count += len(chunk)
+        return self._pick(self.count - self.neighborhood)
+
+    def flush(self):
+        # 输入结束：确定剩余的候选峰
+        return self._pick(self.count)
+
+    def detect(self, y):
+        # 检测整段信号中的 R 波，按块处理，内存占用与信号长度无关（除结果外）
+        self.reset()
+        peaks = [self.process(y[start:start + _BLOCK]) for start in range(0, len(y), _BLOCK)]
+        peaks.append(self.flush())
+        return np.concatenate(peaks)
+
+    def _integrate(self, energy):
+        # 滑动窗口积分：window 个点的平均值，前一块末尾的 window - 1 个点作为上下文
+        extended = np.concatenate((self.tail, energy))
+        cumulative = np.concatenate(([0.0], np.cumsum(extended)))
+        if self.window > 1:
+            self.tail = extended[-(self.window - 1):]
+        return (cumulative[self.window:] - cumulative[:-self.window]) / self.window
+
+    def _learn(self):
+        # 用开头 learning 个点（不足时用全部）初始化信号峰和噪声峰的水平；
+        # 跳过前 delay 个点（滤波器和积分器的起始瞬态），信号不足 delay 个点时不检测
+        learn = self.mwi[self.delay:self.learning]
+        if len(learn) == 0:
+            return
+        self.spki = float(learn.max()) / 3
+        self.npki = float(learn.mean()) / 2
+        self.floor = (QRS_FLOOR * float(np.abs(self.raw[:self.learning]).max()) * self.sample_rate) ** 2
+
+    def _pick(self, end):
+        peaks = []
+        if self.spki is None:
+            if self.count < self.learning and end < self.count:
+                return np.empty(0, dtype=np.int64)
+            self._learn()
+            if self.spki is None:
+                # 没有输入任何数据
+                return np.empty(0, dtype=np.int64)
+        if end > self.checked:
+            candidates = self._candidates(max(self.checked, self.delay), end)
+            values = self.mwi[candidates - self.offset]
+            for candidate, value, r_peak in zip(candidates.tolist(), values.tolist(),
+                                                self._locate(candidates).tolist()):
+                self._classify(candidate, value, r_peak, peaks)
+            self.checked = end
+        # 只保留后续判断需要的上下文
+        keep = max(self.offset, end - max(self.neighborhood, self.delay) - 1)
+        self.raw = self.raw[keep - self.offset:]
+        self.mwi = self.mwi[keep - self.offset:]
+        self.offset = keep
+        return np.array(peaks, dtype=np.int64)
+
+    def _candidates(self, lo, end):
+        # [lo, end) 中积分值为前后 neighborhood 个点内最大值的位置（平台取第一个点）
+        from scipy.ndimage import maximum_filter1d
+
+        r = self.neighborhood
+        start = max(lo - r, self.offset)
+        stop = min(end + r, self.count)
+        segment = self.mwi[start - self.offset:stop - self.offset]
+        # 缓冲区两端之外按 -inf 处理，只有在信号开头和结尾时才会用到
+        peak = maximum_filter1d(segment, 2 * r + 1, mode='constant', cval=-np.inf)
+        # 缓冲区中保留了 lo 之前至少 neighborhood 个点，只有信号的第一个点没有前一个点
+        previous = np.concatenate(([-np.inf], segment[:-1]))
+        mask = (segment == peak) & (segment > previous)
+        return np.flatnonzero(mask[lo - start:end - start]) + lo
+
+    def _locate(self, candidates):
+        # 对所有候选峰一起计算：在原始信号中积分峰之前 delay 个点内找到偏离中值最大的点作为 R 波
+        # （信号开头不足 delay 个点时重复第一个点）
+        index = np.maximum(candidates[:, np.newaxis] + np.arange(-self.delay, 1), self.offset)
+        windows = self.raw[index - self.offset]
+        deviation = np.abs(windows - np.median(windows, axis=1, keepdims=True))
+        return index[np.arange(len(candidates)), np.argmax(deviation, axis=1)]
+
+    def _classify(self, candidate, value, r_peak, peaks):
+        since = None if self.last_peak is None else candidate - self.last_peak
+        if value > max(self.threshold, self.floor) and (since is None or since > self.refractory):
+            if since is not None and self.rr and since > 1.66 * sum(self.rr) / len(self.rr):
+                self._search_back(candidate, peaks)
+            self.spki = 0.125 * value + 0.875 * self.spki
+            self._accept(candidate, r_peak, peaks)
+        else:
+            self.npki = 0.125 * value + 0.875 * self.npki
+            self.rejected.append((candidate, value, r_peak))
+
+    def _search_back(self, candidate, peaks):
+        # 漏检回溯：在上一个 R 波和当前 R 波之间，取超过半阈值的最高噪声候选峰作为漏检的 R 波
+        half = 0.5 * self.threshold
+        missed = [c for c in self.rejected
+                  if c[1] > half and c[0] - self.last_peak > self.refractory and candidate - c[0] > self.refractory]
+        if missed:
+            position, value, r_peak = max(missed, key=lambda c: c[1])
+            self.spki = 0.25 * value + 0.75 * self.spki
+            self._accept(position, r_peak, peaks)
+
+    def _accept(self, candidate, r_peak, peaks):
+        if self.last_peak is not None:
+            self.rr.append(candidate - self.last_peak)
+        self.last_peak = candidate
+        self.rejected = []
+        peaks.append(r_peak)
+
+
+def detect_r_peaks(y, sample_rate, **options):
+    # 检测整段心电信号中的 R 波位置；options 见 QrsDetector
+    return QrsDetector(sample_rate, **options).detect(y)
+
+
+def rr_intervals(peaks, sample_rate):
+    # 相邻 R 波之间的间期（秒）
+    return np.diff(np.asarray(peaks)) / float(sample_rate)
+
+
+def heart_rate(peaks, sample_rate):
+    # 瞬时心率：返回每个 RR 间期结束的时刻（秒）和 60 / RR（次/分）
+    peaks = np.asarray(peaks)
+    return peaks[1:] / float(sample_rate), 60.0 / rr_intervals(peaks, sample_rate)
+
+
+def mean_heart_rate(peaks, sample_rate):
+    # 平均心率（次/分），取 RR 间期的中位数，不受个别漏检、误检的影响；R 波少于 2 个时返回 None
+    if len(peaks) < 2:
+        return None
+    return 60.0 / float(np.median(rr_intervals(peaks, sample_rate)))
@@ -0,0 +1,112 @@
+import collections
+import json
+import os
+
+import numpy as np
+
+# 心电数据文件所在目录及文件名格式
+DATA_DIR = 'data'
+FILE_PATTERN = 'bpm{}.csv'
+# 二进制缓存文件的后缀
+CACHE_SUFFIX = '.cache.npy'
+# 头文件：与数据文件同名，加上该后缀（如 bpm60.csv.json），内容示例 {"sample_rate": 360}
+HEADER_SUFFIX = '.json'
+# 心电记录的默认采样率（Hz），记录的头文件没有给出采样率时使用
+ECG_SAMPLE_RATE = 500.0
+
+
+def ecg_csv_path(heart_rate, data_dir=DATA_DIR):
+    # 根据心率值得到对应的 CSV 文件路径
+    return os.path.join(data_dir, FILE_PATTERN.format(heart_rate))
+
+
+def cache_path(csv_path):
+    # CSV 文件对应的二进制缓存文件路径
+    return csv_path + CACHE_SUFFIX
+
+
+def read_header(path):
+    # 读取数据文件的头文件（path + HEADER_SUFFIX），没有时返回空字典
+    header_path = path + HEADER_SUFFIX
+    if not os.path.exists(header_path):
+        return {}
+    with open(header_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def recording_sample_rate(path):
+    # 记录的采样率，由头文件给出，未知时返回 None
+    rate = read_header(path).get('sample_rate')
+    return float(rate) if rate else None
+
+
+def _sniff(csv_path, column):
+    # 根据第一行判断分隔符（逗号、分号、制表符或空白）以及是否有表头
+    with open(csv_path, encoding='utf-8') as f:
+        first = f.readline()
+    delimiter = next((d for d in (',', ';', '\t') if d in first), None)
+    try:
+        float(first.split(delimiter)[column])
+        header = 0
+    except (ValueError, IndexError):
+        header = 1
+    return delimiter, header
+
+
+def parse_csv(csv_path, column=0):
+    # 一次性解析 CSV 文件的一列（默认第一列），返回 float64 数组；
+    # 使用 NumPy 的 C 实现解析文本，自动识别分隔符并跳过表头
+    delimiter, header = _sniff(csv_path, column)
+    return np.loadtxt(csv_path, delimiter=delimiter, skiprows=header, usecols=column,
+                      dtype=np.float64, ndmin=1, encoding='utf-8')
+
+
+def load_recording(csv_path):
+    # 读取一条心电记录：第一次读取时将 CSV 转换为 .npy 缓存文件，
+    # 之后只要缓存文件不早于 CSV 文件就直接以内存映射方式打开，不再解析文本
+    sidecar = cache_path(csv_path)
+    source_mtime = os.path.getmtime(csv_path)
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= source_mtime:
+        return np.load(sidecar, mmap_mode='r')
+    data = parse_csv(csv_path)
+    try:
+        # 先写入临时文件再替换，避免中途失败留下损坏的缓存
+        tmp_path = sidecar + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, data)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        # 数据目录不可写时直接使用解析结果
+        return data
+    return np.load(sidecar, mmap_mode='r')
+
+
+class EcgDataset:
+    # 心电记录数据集：按文件路径缓存最近使用的记录（LRU），
+    # 源文件被修改后自动重新加载
+    def __init__(self, data_dir=DATA_DIR, max_recordings=8):
+        self.data_dir = data_dir
+        self.max_recordings = max_recordings
+        self._recordings = collections.OrderedDict()
+
+    def load(self, heart_rate):
+        # 读取指定心率值的心电记录，返回只读数组（内存映射）
+        path = ecg_csv_path(heart_rate, self.data_dir)
+        mtime = os.path.getmtime(path)
+        entry = self._recordings.get(path)
+        if entry is not None and entry[0] == mtime:
+            self._recordings.move_to_end(path)
+            return entry[1]
+        data = load_recording(path)
+        self._recordings[path] = (mtime, data)
+        self._recordings.move_to_end(path)
+        while len(self._recordings) > self.max_recordings:
+            self._recordings.popitem(last=False)
+        return data
+
+    def sample_rate(self, heart_rate):
+        # 指定心率值的记录的采样率：头文件中的 sample_rate，未知时为 ECG_SAMPLE_RATE
+        return recording_sample_rate(ecg_csv_path(heart_rate, self.data_dir)) or ECG_SAMPLE_RATE
+
+    def clear(self):
+        self._recordings.clear()
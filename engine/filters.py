@@ -0,0 +1,109 @@
+import numpy as np
+
+# 平滑滤波方式
+SMOOTH_MODES = ('mean', 'median', 'ema')
+# 中值滤波每块处理的元素个数上限
+_MEDIAN_BLOCK = 1 << 22
+
+
+def _prepare_input(y, size):
+    if size < 1:
+        raise ValueError("滤波器大小必须大于 0")
+    return np.asarray(y, dtype=np.float64)
+
+
+def _prepare_out(n, out):
+    if out is None:
+        return np.empty(n, dtype=np.float64)
+    if out.shape != (n,):
+        raise ValueError("out 的长度必须与输入信号相同")
+    return out
+
+
+def _check_edge(edge):
+    if edge not in ('zero', 'shrink'):
+        raise ValueError(f"未知的边界处理方式: {edge}")
+
+
+def moving_average(y, size, edge='shrink', out=None):
+    # 因果移动平均滤波：第 i 个输出为 y[i - size + 1 : i + 1] 的平均值，输出长度与输入相同
+    # edge='shrink' 开头不足 size 个点时只对已有的点求平均
+    # edge='zero'   开头不足 size 个点时按 0 补齐
+    # 使用累加和计算窗口和，复杂度 O(N)，与窗口大小无关
+    y = _prepare_input(y, size)
+    _check_edge(edge)
+    n = len(y)
+    out = _prepare_out(n, out)
+    if n == 0:
+        return out
+    # 先减去均值再累加，减小长信号累加和的舍入误差
+    offset = y.mean()
+    csum = np.empty(n + 1, dtype=np.float64)
+    csum[0] = 0.0
+    np.cumsum(y - offset, out=csum[1:])
+    # 开头不足 size 个点的部分
+    m = min(size, n)
+    counts = np.arange(1, m + 1, dtype=np.float64)
+    if edge == 'shrink':
+        np.divide(csum[1:m + 1], counts, out=out[:m])
+        out[:m] += offset
+    else:
+        out[:m] = (csum[1:m + 1] + offset * counts) / size
+    # 完整窗口的部分
+    if n > size:
+        np.subtract(csum[size + 1:], csum[1:n - size + 1], out=out[size:])
+        out[size:] /= size
+        out[size:] += offset
+    return out
+
+
+def moving_median(y, size, edge='shrink', out=None):
+    # 因果移动中值滤波，窗口与 moving_average 相同，适合去除脉冲干扰
+    # 按块处理滑动窗口视图，临时内存不超过 _MEDIAN_BLOCK 个元素
+    y = _prepare_input(y, size)
+    _check_edge(edge)
+    n = len(y)
+    out = _prepare_out(n, out)
+    if n == 0:
+        return out
+    padded = np.concatenate([np.zeros(size - 1), y])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, size)
+    step = max(1, _MEDIAN_BLOCK // size)
+    for start in range(0, n, step):
+        np.median(windows[start:start + step], axis=1, out=out[start:start + step])
+    if edge == 'shrink':
+        # 开头不足 size 个点的部分只对已有的点求中值
+        for i in range(min(size - 1, n)):
+            out[i] = np.median(y[:i + 1])
+    return out
+
+
+def exponential_moving_average(y, alpha, edge='shrink', out=None):
+    # 指数移动平均：out[i] = alpha * y[i] + (1 - alpha) * out[i - 1]
+    # edge='shrink' 以第一个点作为初始值，edge='zero' 以 0 作为初始值
+    from scipy.signal import lfilter
+
+    if not 0 < alpha <= 1:
+        raise ValueError("alpha 必须在 (0, 1] 范围内")
+    y = np.asarray(y, dtype=np.float64)
+    _check_edge(edge)
+    n = len(y)
+    out = _prepare_out(n, out)
+    if n == 0:
+        return out
+    zi = [(1 - alpha) * y[0]] if edge == 'shrink' else [0.0]
+    out[:], _ = lfilter([alpha], [1.0, alpha - 1.0], y, zi=zi)
+    return out
+
+
+def smooth(y, size, mode='mean', edge='shrink', out=None):
+    # 按指定方式进行平滑滤波，ema 模式下 size 换算为 alpha = 2 / (size + 1)
+    if mode == 'mean':
+        return moving_average(y, size, edge=edge, out=out)
+    if mode == 'median':
+        return moving_median(y, size, edge=edge, out=out)
+    if mode == 'ema':
+        if size < 1:
+            raise ValueError("滤波器大小必须大于 0")
+        return exponential_moving_average(y, 2.0 / (size + 1), edge=edge, out=out)
+    raise ValueError(f"未知的滤波方式: {mode}")
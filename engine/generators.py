@@ -0,0 +1,85 @@
+import numpy as np
+
+# 信号类型编号，与 SignalData.signal_type 保持一致（界面下拉框索引 + 1）
+SINE = 1  # 正弦波
+TRIANGLE = 2  # 三角波
+SAWTOOTH = 3  # 锯齿波
+SQUARE = 4  # 方波
+
+
+def _output_dtype(x):
+    # 输出类型与时间轴一致（float32 或 float64），其它类型按 float64 处理
+    dtype = np.asarray(x).dtype
+    return dtype if dtype in (np.float32, np.float64) else np.dtype(np.float64)
+
+
+def _prepare_out(x, out):
+    # 所有生成函数都支持预分配的 out 缓冲区，批量生成时避免每次调用重新分配内存
+    if out is None:
+        return np.empty(np.shape(x), dtype=_output_dtype(x))
+    if out.shape != np.shape(x):
+        raise ValueError("out 的形状必须与 x 相同")
+    return out
+
+
+def _wrapped_phase(x, period, phase, out):
+    # 考虑相位偏移，并将 x - phase 映射到 [0, period) 以确保周期性
+    np.subtract(x, phase, out=out)
+    np.mod(out, period, out=out)
+    return out
+
+
+def sine(x, period, amplitude=1.0, baseline=0.0, phase=0.0, out=None):
+    # 正弦波：amplitude * sin(2π(x - phase) / period) + baseline
+    out = _prepare_out(x, out)
+    np.subtract(x, phase, out=out)
+    out *= 2 * np.pi / period
+    np.sin(out, out=out)
+    out *= amplitude
+    out += baseline
+    return out
+
+
+def triangle(x, period, amplitude=1.0, baseline=0.0, phase=0.0, out=None):
+    # 三角波：amplitude * |wrap(x - phase) - period / 2| + baseline
+    out = _wrapped_phase(x, period, phase, _prepare_out(x, out))
+    out -= period / 2
+    np.abs(out, out=out)
+    out *= amplitude
+    out += baseline
+    return out
+
+
+def sawtooth(x, period, amplitude=1.0, baseline=0.0, phase=0.0, out=None):
+    # 锯齿波：baseline + amplitude * wrap(x - phase) / period
+    out = _wrapped_phase(x, period, phase, _prepare_out(x, out))
+    out *= amplitude / period
+    out += baseline
+    return out
+
+
+def square(x, period, amplitude=1.0, baseline=0.0, phase=0.0, out=None):
+    # 方波：baseline + amplitude * sign(sin(2π(x - phase) / period))
+    out = sine(x, period, phase=phase, out=out)
+    np.sign(out, out=out)
+    out *= amplitude
+    out += baseline
+    return out
+
+
+# 信号类型编号到生成函数的映射
+SIGNAL_TYPES = {
+    SINE: sine,
+    TRIANGLE: triangle,
+    SAWTOOTH: sawtooth,
+    SQUARE: square,
+}
+
+
+def generate(signal_type, x, period, amplitude=1.0, baseline=0.0, phase=0.0, out=None):
+    # 按信号类型编号生成波形
+    try:
+        func = SIGNAL_TYPES[signal_type]
+    except KeyError:
+        raise ValueError(f"未知的信号类型: {signal_type}") from None
+    return func(x, period, amplitude, baseline, phase, out=out)
@@ -0,0 +1,129 @@
+import numpy as np
+
+from .pipeline import PIPELINE_CHUNK, StageCache, Pipeline, ArraySource, ArraySink
+
+# 处理历史缓存各步骤输出的默认内存预算（字节）
+HISTORY_BUDGET = 256 << 20
+
+
+class ProcessingHistory:
+    # 非破坏式处理：原始信号保持不变，依次应用启用的步骤得到显示的信号。
+    # 每一步是一个流水线处理阶段（engine.NoiseStage、engine.FilterStage 等），与批处理任务使用同一套阶段，
+    # 由 engine.Pipeline 计算；各步骤的输出按 Pipeline.keys()（原始信号 + 到该步为止所有启用步骤的参数）放在
+    # engine.StageCache 中，撤销、重做、启用/停用某一步或修改某一步的参数时，只重新计算未缓存的下游步骤
+    def __init__(self, budget=HISTORY_BUDGET, cache=None, chunk_size=PIPELINE_CHUNK):
+        self.cache = StageCache(budget) if cache is None else cache
+        self.chunk_size = int(chunk_size)
+        self.steps = []
+        self.undone = []  # 撤销的步骤，可以重做；添加新步骤时清空
+        self.disabled = set()  # 停用的步骤
+        self.source = None
+        self.source_key = None
+        self.sample_rate = 1.0
+        self.bypass = False  # 为 True 时直接显示原始信号，步骤保留
+
+    def __len__(self):
+        return len(self.steps)
+
+    @property
+    def active(self):
+        # 是否有需要应用的步骤
+        return bool(self.stages())
+
+    def enabled(self, index):
+        return self.steps[index] not in self.disabled
+
+    def stages(self):
+        # 需要应用的步骤
+        return [] if self.bypass else [stage for stage in self.steps if stage not in self.disabled]
+
+    def set_source(self, y, sample_rate=1.0, key=None):
+        # 设置原始信号；key 为生成该信号的全部参数（相同的键保证数据相同），默认以数组对象本身作为键
+        self.source = y
+        self.sample_rate = float(sample_rate)
+        self.source_key = key
+
+    def add(self, stage):
+        self.steps.append(stage)
+        self.undone.clear()
+        return stage
+
+    def undo(self):
+        # 撤销最后一步，没有步骤时返回 None
+        if not self.steps:
+            return None
+        stage = self.steps.pop()
+        self.undone.append(stage)
+        return stage
+
+    def redo(self):
+        if not self.undone:
+            return None
+        stage = self.undone.pop()
+        self.steps.append(stage)
+        return stage
+
+    def toggle(self, index, enabled=None):
+        stage = self.steps[index]
+        if enabled is None:
+            enabled = stage in self.disabled
+        if enabled:
+            self.disabled.discard(stage)
+        else:
+            self.disabled.add(stage)
+        return stage
+
+    def update(self, index, **params):
+        # 修改某一步的参数，上游步骤的缓存结果不受影响
+        old = self.steps[index]
+        stage = old.replace(**params)
+        if old in self.disabled:
+            self.disabled.discard(old)
+            self.disabled.add(stage)
+        self.steps[index] = stage
+        return stage
+
+    def clear(self):
+        # 删除所有步骤（可以逐步重做）
+        self.undone.extend(reversed(self.steps))
+        self.steps.clear()
+
+    def pipeline(self, y=None, sample_rate=None, stages=None, cache=True):
+        # 计算结果的流水线；各阶段复制一份，同时运行的多条流水线不共享状态
+        y = self.source if y is None else y
+        sample_rate = self.sample_rate if sample_rate is None else sample_rate
+        source = ArraySource(y, sample_rate, self.source_key if y is self.source else None)
+        stages = [stage.replace() for stage in (self.stages() if stages is None else stages)]
+        return Pipeline(source, stages, self.chunk_size, self.cache if cache else None)
+
+    def keys(self):
+        # 每个启用步骤输出的缓存键
+        return self.pipeline().keys()[1:]
+
+    def task(self):
+        # 按当前的原始信号和步骤构造计算结果的函数，可以在后台线程中执行，之后修改步骤不影响已构造的函数
+        source = self.source
+        if not self.active:
+            return lambda: source
+        pipeline = self.pipeline()
+        return lambda: _run(pipeline, source)
+
+    def result(self):
+        # 应用所有启用的步骤后的信号
+        return self.task()()
+
+    def apply(self, y, sample_rate=None, frame=None):
+        # 对新的数据（动态演示的每一帧）应用所有启用的步骤，不使用缓存；
+        # frame 不为 None 时固定种子的噪声以 (种子, 帧号) 为种子，每帧的噪声不同
+        stages = self.stages()
+        if not stages:
+            return y
+        if frame is not None:
+            stages = [stage.replace(seed=tuple(np.atleast_1d(stage.params['seed'])) + (frame,))
+                      if stage.params.get('seed') is not None else stage for stage in stages]
+        return _run(self.pipeline(y, sample_rate, stages, cache=False), y)
+
+
+def _run(pipeline, y):
+    # 结果为浮点数，保持原始信号的精度（float32 的信号不升为 float64）
+    return pipeline.run(ArraySink(dtype=np.result_type(np.asarray(y).dtype, np.float32)))[0]
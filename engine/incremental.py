@@ -0,0 +1,107 @@
+import threading
+
+import numpy as np
+
+from .generators import SIGNAL_TYPES, SINE, TRIANGLE, SAWTOOTH, SQUARE, _prepare_out
+
+
+class IncrementalGenerator:
+    # 按依赖关系缓存波形计算的中间结果，参数修改时只重新计算受影响的阶段：
+    #   相位包裹后的自变量 mod(x - phase, period)：依赖 (时间轴, 周期, 相位)，三角波和锯齿波共用
+    #   单位正弦 sin(2π(x - phase) / period)：依赖 (时间轴, 周期, 相位)，正弦波和方波共用
+    #   单位波形（幅值 1、基线 0）：依赖 (类型, 时间轴, 周期, 相位)
+    #   输出 amplitude * 单位波形 + baseline：修改幅值和基线只需要这一步
+    # 只修改相位且相位差是采样间隔的整数倍、时间轴覆盖整数个周期时，单位波形通过循环移位得到
+    # 可以同时在界面线程和后台线程中调用，缓存的读写由锁保护（缓存的数组只读，取出后不会再被修改）
+    def __init__(self):
+        self._stages = {}  # 阶段名 → (键, 结果)
+        self._lock = threading.RLock()
+        # 各阶段实际计算的次数，便于确认缓存是否生效
+        self.stats = {'argument': 0, 'sine': 0, 'unit': 0, 'shift': 0}
+
+    def clear(self):
+        with self._lock:
+            self._stages.clear()
+
+    def _lookup(self, stage, key):
+        entry = self._stages.get(stage)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        return None
+
+    def _store(self, stage, key, value):
+        value.flags.writeable = False
+        self._stages[stage] = (key, value)
+        return value
+
+    def argument(self, timebase, period, phase):
+        # 相位包裹后的自变量，映射到 [0, period)
+        key = (timebase.key(), period, phase)
+        value = self._lookup('argument', key)
+        if value is None:
+            self.stats['argument'] += 1
+            value = np.subtract(timebase.axis(), phase, dtype=timebase.dtype)
+            np.mod(value, period, out=value)
+            value = self._store('argument', key, value)
+        return value
+
+    def unit_sine(self, timebase, period, phase):
+        key = (timebase.key(), period, phase)
+        value = self._lookup('sine', key)
+        if value is None:
+            self.stats['sine'] += 1
+            value = np.subtract(timebase.axis(), phase, dtype=timebase.dtype)
+            value *= 2 * np.pi / period
+            np.sin(value, out=value)
+            value = self._store('sine', key, value)
+        return value
+
+    def _shifted_unit(self, signal_type, timebase, period, phase):
+        # 只有相位改变时尝试用循环移位代替重新计算
+        entry = self._stages.get('unit')
+        if entry is None:
+            return None
+        (old_type, old_timebase, old_period, old_phase), old_unit = entry
+        if (old_type, old_timebase, old_period) != (signal_type, timebase.key(), period):
+            return None
+        shift = (phase - old_phase) * timebase.sample_rate
+        cycles = timebase.num_samples * timebase.dt / period
+        if not (np.isclose(shift, round(shift), rtol=0, atol=1e-9)
+                and np.isclose(cycles, round(cycles), rtol=0, atol=1e-9)):
+            return None
+        self.stats['shift'] += 1
+        return np.roll(old_unit, int(round(shift)))
+
+    def unit(self, signal_type, timebase, period, phase):
+        # 幅值为 1、基线为 0 的波形
+        with self._lock:
+            return self._unit(signal_type, timebase, period, phase)
+
+    def _unit(self, signal_type, timebase, period, phase):
+        if signal_type not in SIGNAL_TYPES:
+            raise ValueError(f"未知的信号类型: {signal_type}")
+        key = (signal_type, timebase.key(), period, phase)
+        value = self._lookup('unit', key)
+        if value is not None:
+            return value
+        value = self._shifted_unit(signal_type, timebase, period, phase)
+        if value is None:
+            self.stats['unit'] += 1
+            if signal_type == SINE:
+                value = self.unit_sine(timebase, period, phase)
+            elif signal_type == SQUARE:
+                value = np.sign(self.unit_sine(timebase, period, phase))
+            elif signal_type == TRIANGLE:
+                value = self.argument(timebase, period, phase) - period / 2
+                np.abs(value, out=value)
+            elif signal_type == SAWTOOTH:
+                value = self.argument(timebase, period, phase) / period
+        return self._store('unit', key, value)
+
+    def generate(self, signal_type, timebase, period, amplitude=1.0, baseline=0.0, phase=0.0, out=None):
+        # 返回 amplitude * 单位波形 + baseline，结果写入新数组或 out 中
+        unit = self.unit(signal_type, timebase, float(period), float(phase))
+        out = _prepare_out(unit, out)
+        np.multiply(unit, amplitude, out=out)
+        out += baseline
+        return out
@@ -0,0 +1,251 @@
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+
+from .timebase import TimeBase
+from .generators import SINE, TRIANGLE, SAWTOOTH, SQUARE, SIGNAL_TYPES, generate
+from .synthesis import synthesize
+from .sweep import parameter_grid, sweep, sweep_synthesis
+from .ecg_data import DATA_DIR, EcgDataset
+from .writers import EXPORT_CHUNK, export_signal
+from .pipeline import Pipeline, SignalSource, SynthesisSource, ArraySource, ArraySink, NoiseStage, FilterStage
+
+# 任务描述中的信号名称
+SIGNAL_NAMES = {
+    'sine': SINE,
+    'triangle': TRIANGLE,
+    'sawtooth': SAWTOOTH,
+    'square': SQUARE,
+}
+# 噪声描述中传给 NoiseStream 的选项
+NOISE_OPTIONS = ('density', 'leak', 'hum_frequency', 'harmonics')
+
+
+class JobError(ValueError):
+    # 任务描述不合法
+    pass
+
+
+class _Component:
+    # 合成信号的一个分量，属性与 SignalData 相同
+    def __init__(self, spec):
+        self.signal_type = signal_type(spec.get('signal', SINE))
+        self.period = float(spec['period'])
+        self.amplitude = float(spec.get('amplitude', 1.0))
+        self.baseline = float(spec.get('baseline', 0.0))
+        self.phase = float(spec.get('phase', 0.0))
+
+
+def signal_type(value):
+    # 信号类型可以是名称（'sine'）或编号（1~4）
+    if isinstance(value, str):
+        try:
+            return SIGNAL_NAMES[value.lower()]
+        except KeyError:
+            raise JobError(f"未知的信号类型: {value}") from None
+    if int(value) not in SIGNAL_TYPES:
+        raise JobError(f"未知的信号类型: {value}")
+    return int(value)
+
+
+def load_spec(path):
+    # 读取 JSON 或 YAML 格式的任务描述文件（YAML 需要安装 PyYAML）
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def expand_jobs(spec):
+    # 展开任务列表：defaults 合并到每个任务中，带 sweep 的任务按参数组合展开成多个任务
+    defaults = spec.get('defaults', {})
+    jobs = []
+    for index, job in enumerate(spec.get('jobs', [])):
+        job = dict(defaults, **job)
+        name = job.get('name', f'job{index:04d}')
+        sweep = job.pop('sweep', None)
+        if not sweep:
+            jobs.append(dict(job, name=name))
+            continue
+        keys = sorted(sweep)
+        for values in itertools.product(*(sweep[key] for key in keys)):
+            suffix = '_'.join(f'{key}{value}' for key, value in zip(keys, values))
+            jobs.append(dict(job, name=f'{name}_{suffix}', **dict(zip(keys, values))))
+    names = [job['name'] for job in jobs]
+    if len(set(names)) != len(names):
+        raise JobError("任务名称不能重复")
+    return jobs
+
+
+def job_timebase(job):
+    # 时间基准：给出 sample_rate 时按 duration 或 sample_count 确定点数，
+    # 否则与界面相同，sample_count 个点覆盖 duration（默认 10 个周期）
+    dtype = job.get('dtype', 'float64')
+    count = job.get('sample_count')
+    duration = job.get('duration')
+    if duration is None:
+        periods = [float(c['period']) for c in job.get('components', [])]
+        periods += [float(c['period']) for components in job.get('component_sets', []) for c in components]
+        periods += [float(p) for p in np.atleast_1d(job.get('grid', {}).get('period', []))]
+        periods = periods or [float(job['period'])]
+        duration = 10 * abs(max(periods, key=abs))
+    if 'sample_rate' in job:
+        rate = float(job['sample_rate'])
+        if count is None:
+            count = int(round(float(duration) * rate)) + 1
+        return TimeBase(rate, int(count), dtype=dtype)
+    return TimeBase.from_duration(float(duration), int(count or 1000), dtype=dtype)
+
+
+def build_signal(job, data_dir=DATA_DIR):
+    # 按任务描述生成原始信号，返回 (信号, 采样率)
+    if 'ecg' in job:
+        # 采样率：任务中的 sample_rate，否则取自记录的头文件，都没有时为默认的 500 Hz
+        dataset = EcgDataset(job.get('data_dir', data_dir))
+        recording = dataset.load(job['ecg'])
+        count = job.get('sample_count')
+        y = np.array(recording[:count] if count else recording, dtype=np.float64)
+        return y, float(job.get('sample_rate') or dataset.sample_rate(job['ecg']))
+    timebase = job_timebase(job)
+    x = timebase.axis()
+    if 'components' in job:
+        components = [_Component(c) for c in job['components']]
+        y = synthesize(components, x, out=timebase.empty())
+    else:
+        y = generate(signal_type(job.get('signal', SINE)), x, float(job['period']),
+                     float(job.get('amplitude', 1.0)), float(job.get('baseline', 0.0)),
+                     float(job.get('phase', 0.0)), out=timebase.empty())
+    return y, timebase.sample_rate
+
+
+def job_stages(job):
+    # 任务的处理阶段（engine.NoiseStage、engine.FilterStage）：
+    # noise: {"type": 噪声类型（默认 white）, "scale": 标准差, "snr_db": 信噪比（给定时忽略 scale）,
+    #         "seed": 随机种子, 以及 density、leak、hum_frequency、harmonics 等选项}
+    # filter: {"type": "butterworth", "order", "cutoff"（Hz）, "btype", "zero_phase"（默认 True）}
+    #      或 {"type": "mean" / "median" / "ema", "size"}
+    stages = []
+    noise = job.get('noise')
+    if noise:
+        options = {key: noise[key] for key in NOISE_OPTIONS if key in noise}
+        try:
+            stages.append(NoiseStage(noise.get('type', 'white'), float(noise.get('scale', 0.1)),
+                                     seed=noise.get('seed'), snr_db=noise.get('snr_db'), **options))
+        except ValueError as e:
+            raise JobError(f"噪声参数不合法: {e}") from None
+    spec = job.get('filter')
+    if spec:
+        options = {key: value for key, value in spec.items() if key != 'type'}
+        options.setdefault('zero_phase', True)
+        try:
+            stages.append(FilterStage(spec.get('type', 'butterworth'), **options))
+        except (KeyError, ValueError) as e:
+            raise JobError(f"滤波参数不合法: {e}") from None
+    return stages
+
+
+def streamable(job):
+    # 不需要整段数据的任务可以逐块处理：不是心电记录，所有处理阶段都是流式的
+    # （不按信噪比加噪声、没有零相位滤波）
+    return 'ecg' not in job and all(stage.streaming for stage in job_stages(job))
+
+
+def job_pipeline(job, timebase, chunk_size=EXPORT_CHUNK):
+    # 按任务描述组装流水线：基本信号或合成信号 → 噪声 → 滤波，各阶段都是流式时内存占用与点数无关
+    if 'components' in job:
+        source = SynthesisSource([_Component(c) for c in job['components']], timebase)
+    else:
+        source = SignalSource(signal_type(job.get('signal', SINE)), timebase, float(job['period']),
+                              float(job.get('amplitude', 1.0)), float(job.get('baseline', 0.0)),
+                              float(job.get('phase', 0.0)))
+    return Pipeline(source, job_stages(job), chunk_size)
+
+
+def run_grid_job(job, output_dir):
+    # 向量化参数扫描：grid 中每个参数的取值做笛卡尔积，所有波形一次广播生成，
+    # 结果（参数组数 × 点数）直接写入内存映射的 <name>.npy，各组参数保存在 <name>.params.npz
+    start = time.perf_counter()
+    timebase = job_timebase(job)
+    path = os.path.join(output_dir, f"{job['name']}.npy")
+    if 'component_sets' in job:
+        sets = [[_Component(c) for c in components] for components in job['component_sets']]
+        result = sweep_synthesis(sets, timebase.axis(), path=path)
+    else:
+        # 不在 grid 中的参数取任务中的固定值
+        axes = dict({'amplitude': 1.0, 'baseline': 0.0, 'phase': 0.0}, **job['grid'])
+        for key in ('period', 'amplitude', 'baseline', 'phase'):
+            axes[key] = job['grid'].get(key, job.get(key, axes.get(key)))
+        if axes['period'] is None:
+            raise JobError(f"任务 {job['name']} 缺少 period")
+        grid = parameter_grid(**axes)
+        np.savez(os.path.join(output_dir, f"{job['name']}.params.npz"), **grid)
+        result = sweep(signal_type(job.get('signal', SINE)), timebase.axis(), path=path, **grid)
+    shape = result.shape
+    del result
+    finished = time.perf_counter()
+    return {
+        'name': job['name'],
+        'path': path,
+        'sets': shape[0],
+        'samples': shape[1],
+        'sample_rate': timebase.sample_rate,
+        'total_s': finished - start,
+    }
+
+
+def run_stream_job(job, path):
+    # 通过流水线逐块生成、加噪声、滤波并写入文件，各步骤交替进行，只给出总耗时
+    start = time.perf_counter()
+    timebase = job_timebase(job)
+    job_pipeline(job, timebase).export(path, **job.get('export', {}))
+    finished = time.perf_counter()
+    return {
+        'name': job['name'],
+        'path': path,
+        'samples': timebase.num_samples,
+        'sample_rate': timebase.sample_rate,
+        'streamed': True,
+        'total_s': finished - start,
+    }
+
+
+def warm_up():
+    # 进程池的初始化函数：预先导入各处理函数按需导入的 SciPy 模块，
+    # 每个进程第一个任务的耗时不再包括导入时间（实测 1~2.5 s）
+    import scipy.ndimage  # noqa: F401
+    import scipy.signal  # noqa: F401
+
+
+def run_job(job, output_dir, data_dir=DATA_DIR):
+    # 执行一个任务并把结果保存为 <name>.<format>（默认 npy，也可以是 csv、wav、f32、i16 等），
+    # 返回包含耗时的结果摘要；export 中的选项（如 fmt、peak、dtype）传给 export_signal
+    # 整段处理的任务分别给出生成、处理、写入的耗时（generate_s、process_s、write_s），
+    # 参数扫描和流式任务的各步骤交替进行，只给出总耗时 total_s
+    if 'grid' in job or 'component_sets' in job:
+        return run_grid_job(job, output_dir)
+    path = os.path.join(output_dir, f"{job['name']}.{job.get('format', 'npy')}")
+    if streamable(job):
+        return run_stream_job(job, path)
+    start = time.perf_counter()
+    y, sample_rate = build_signal(job, data_dir)
+    generated = time.perf_counter()
+    stages = job_stages(job)
+    if stages:
+        y, = Pipeline(ArraySource(y, sample_rate), stages).run(ArraySink(dtype=y.dtype))
+    processed = time.perf_counter()
+    export_signal(path, y, sample_rate=sample_rate, **job.get('export', {}))
+    finished = time.perf_counter()
+    return {
+        'name': job['name'],
+        'path': path,
+        'samples': len(y),
+        'sample_rate': sample_rate,
+        'generate_s': generated - start,
+        'process_s': processed - generated,
+        'write_s': finished - processed,
+        'total_s': finished - start,
+    }
@@ -0,0 +1,167 @@
+import numpy as np
+
+
+def _visible_range(x, x0, x1):
+    # 可见范围 [x0, x1] 对应的下标范围，两端各多取一个点，保证曲线延伸到画布边缘
+    i0 = max(0, int(x.searchsorted(x0, side='left')) - 1)
+    i1 = min(len(x), int(x.searchsorted(x1, side='right')) + 1)
+    return i0, max(i0, i1)
+
+
+def _interleave(xs, mins, maxs):
+    # 每个桶输出 (最小值, 最大值) 两个点，画出来是一条竖线，保留峰值
+    ys = np.empty(2 * len(mins), dtype=np.result_type(mins, maxs))
+    ys[0::2] = mins
+    ys[1::2] = maxs
+    return np.repeat(xs, 2), ys
+
+
+class UniformAxis:
+    # 等间隔的 x 轴 start + i * step，不实际分配数组，用于很长的导入信号；
+    # 支持金字塔查询用到的 len、下标、切片和 searchsorted
+    def __init__(self, num_samples, step=1.0, start=0.0):
+        self.num_samples = int(num_samples)
+        self.step = float(step)
+        self.start = float(start)
+
+    def __len__(self):
+        return self.num_samples
+
+    @property
+    def shape(self):
+        return (self.num_samples,)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.start + np.arange(*index.indices(self.num_samples)) * self.step
+        index = np.asarray(index)
+        if np.any((index >= self.num_samples) | (index < -self.num_samples)):
+            raise IndexError("下标超出范围")
+        return self.start + np.where(index < 0, index + self.num_samples, index) * self.step
+
+    def _value(self, i):
+        return self.start + i * self.step
+
+    def searchsorted(self, value, side='left'):
+        # 与 np.searchsorted 相同的语义：先由等间隔公式估计位置，再用实际坐标值修正舍入误差
+        n = self.num_samples
+        i = int(np.clip(np.round((value - self.start) / self.step), 0, n))
+        if side == 'left':
+            while i > 0 and self._value(i - 1) >= value:
+                i -= 1
+            while i < n and self._value(i) < value:
+                i += 1
+        else:
+            while i > 0 and self._value(i - 1) > value:
+                i -= 1
+            while i < n and self._value(i) <= value:
+                i += 1
+        return i
+
+
+def _as_axis(x):
+    return x if isinstance(x, UniformAxis) else np.asarray(x)
+
+
+def preview_minmax(x, y, buckets, window=256):
+    # 快速预览：不读取全部数据，只从均匀分布的 buckets 个位置各读取 window 个点求极值，
+    # 内存映射打开的大文件只需读取其中很小一部分即可显示
+    n = len(y)
+    buckets = max(1, int(buckets))
+    if n <= buckets * window:
+        return minmax_decimate(x, y, x[0], x[-1], buckets) if n else (x[0:0], y[0:0])
+    starts = np.linspace(0, n - window, buckets).astype(np.intp)
+    blocks = np.asarray(y[starts[:, np.newaxis] + np.arange(window)])
+    return _interleave(x[starts], blocks.min(axis=1), blocks.max(axis=1))
+
+
+def minmax_decimate(x, y, x0, x1, buckets):
+    # 不使用金字塔，直接对可见范围做极值抽取，耗时与可见点数成正比（用于逐帧变化的数据）
+    x = _as_axis(x)
+    y = np.asarray(y)
+    i0, i1 = _visible_range(x, x0, x1)
+    n = i1 - i0
+    buckets = max(1, int(buckets))
+    if n <= 2 * buckets:
+        return x[i0:i1], y[i0:i1]
+    step = -(-n // buckets)
+    starts = np.arange(0, n, step)
+    seg = y[i0:i1]
+    return _interleave(x[i0 + starts], np.minimum.reduceat(seg, starts), np.maximum.reduceat(seg, starts))
+
+
+# 建金字塔时每次处理的组数，使一批数据留在 CPU 缓存中
+_BLOCK_ROWS = 1 << 14
+
+
+def _block_minmax(mins, maxs, factor):
+    # 每 factor 个点一组求 mins 的最小值和 maxs 的最大值，最后不足一组的部分单独成组；
+    # 把数据看成（组数 × factor）的矩阵逐列比较，并按批处理，比 reduceat 快数倍
+    n = len(mins)
+    full = n // factor * factor
+    count = -(-n // factor)
+    out_min = np.empty(count, dtype=mins.dtype)
+    out_max = np.empty(count, dtype=maxs.dtype)
+    rows_min = mins[:full].reshape(-1, factor)
+    rows_max = maxs[:full].reshape(-1, factor)
+    for r0 in range(0, len(rows_min), _BLOCK_ROWS):
+        r1 = min(r0 + _BLOCK_ROWS, len(rows_min))
+        lo, hi = out_min[r0:r1], out_max[r0:r1]
+        block_min, block_max = rows_min[r0:r1], rows_max[r0:r1]
+        np.copyto(lo, block_min[:, 0])
+        np.copyto(hi, block_max[:, 0])
+        for k in range(1, factor):
+            np.minimum(lo, block_min[:, k], out=lo)
+            np.maximum(hi, block_max[:, k], out=hi)
+    if full < n:
+        out_min[-1] = mins[full:].min()
+        out_max[-1] = maxs[full:].max()
+    return out_min, out_max
+
+
+class MinMaxPyramid:
+    # 信号的极值金字塔：第 k 层把原始数据按 factor**k 个点一组，保存每组的最小值和最大值
+    # 查询任意可见范围时，先选择合适的层，再合并成约 buckets 个桶，输出约 2 * buckets 个点，
+    # 查询耗时只与 buckets 和 factor 有关，与信号总长度无关；x 必须单调递增
+    def __init__(self, x, y, factor=8):
+        if factor < 2:
+            raise ValueError("factor 必须不小于 2")
+        # x 可以是数组或 UniformAxis
+        self.x = _as_axis(x)
+        self.y = np.asarray(y)
+        if self.x.shape != self.y.shape:
+            raise ValueError("x 和 y 的长度必须相同")
+        self.factor = factor
+        # 每层为 (每组点数, 最小值, 最大值)，第 0 层为原始数据
+        self.levels = [(1, self.y, self.y)]
+        mins, maxs, block = self.y, self.y, 1
+        while len(mins) > 2 * factor:
+            mins, maxs = _block_minmax(mins, maxs, factor)
+            block *= factor
+            self.levels.append((block, mins, maxs))
+
+    def __len__(self):
+        return len(self.y)
+
+    def query(self, x0, x1, buckets):
+        # 返回可见范围 [x0, x1] 内用于绘制的 (xs, ys)
+        i0, i1 = _visible_range(self.x, x0, x1)
+        n = i1 - i0
+        buckets = max(1, int(buckets))
+        if n <= 2 * buckets:
+            return self.x[i0:i1], self.y[i0:i1]
+        # 选择每组点数不超过 n / buckets 的最粗的一层
+        target = n // buckets
+        block, mins, maxs = self.levels[0]
+        for level in self.levels[1:]:
+            if level[0] > target:
+                break
+            block, mins, maxs = level
+        b0 = i0 // block
+        b1 = -(-i1 // block)
+        group = -(-(b1 - b0) // buckets)
+        starts = np.arange(0, b1 - b0, group)
+        xs = self.x[np.minimum((b0 + starts) * block, len(self.x) - 1)]
+        return _interleave(xs,
+                           np.minimum.reduceat(mins[b0:b1], starts),
+                           np.maximum.reduceat(maxs[b0:b1], starts))
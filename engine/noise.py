@@ -0,0 +1,193 @@
+import functools
+
+import numpy as np
+
+# 噪声类型：白噪声、粉红噪声（1/f）、布朗噪声（1/f^2）、脉冲噪声、工频干扰
+NOISE_TYPES = ('white', 'pink', 'brown', 'impulse', 'hum')
+# 粉红噪声滤波器（3 阶 IIR，在 10^-3 fs 到 fs/2 范围内近似 1/f 功率谱）
+_PINK_B = (0.049922035, -0.095993537, 0.050612699, -0.004408786)
+_PINK_A = (1.0, -2.494956002, 2.017265875, -0.522189400)
+# 计算滤波器输出功率时截取的冲激响应长度
+_RESPONSE_TAPS = 1 << 16
+# 每次生成的块大小，限制滤波、正弦计算等临时数组的内存占用
+_BLOCK = 1 << 20
+# 脉冲噪声每次抽取的脉冲个数，与块大小无关，保证逐块生成与整段生成的随机数序列一致
+_IMPULSE_BATCH = 1024
+# 工频干扰默认频率（Hz）及各次谐波的相对幅度
+HUM_FREQUENCY = 50.0
+HUM_HARMONICS = ((1, 1.0), (3, 0.3), (5, 0.1))
+
+
+def gaussian_noise(size, scale=1.0, rng=None, dtype=np.float64, out=None):
+    # 生成均值为 0、标准差为 scale 的高斯白噪声
+    # rng 可以是 numpy.random.Generator 或整数种子，None 时使用随机种子
+    rng = np.random.default_rng(rng)
+    if out is None:
+        out = np.empty(size, dtype=dtype)
+    rng.standard_normal(out=out, dtype=out.dtype)
+    out *= scale
+    return out
+
+
+def add_gaussian_noise(y, scale=1.0, rng=None, out=None):
+    # 在信号 y 上叠加高斯白噪声，out 可以是 y 本身以实现原地修改
+    y = np.asarray(y)
+    dtype = _float_dtype(y.dtype)
+    noise = gaussian_noise(y.shape, scale, rng=rng, dtype=dtype)
+    return np.add(y, noise, out=out)
+
+
+def _float_dtype(dtype):
+    # 噪声只生成 float32 / float64，其他类型的信号按 float64 处理
+    return np.dtype(dtype) if dtype in (np.float32, np.float64) else np.dtype(np.float64)
+
+
+@functools.lru_cache(maxsize=None)
+def _unit_power_pink():
+    # 把粉红噪声滤波器的输出归一化为单位功率：白噪声经过滤波器后的功率等于冲激响应的平方和
+    from scipy.signal import lfilter
+
+    impulse = np.zeros(_RESPONSE_TAPS)
+    impulse[0] = 1.0
+    response = lfilter(_PINK_B, _PINK_A, impulse)
+    return np.array(_PINK_B) / np.sqrt(np.dot(response, response)), np.array(_PINK_A)
+
+
+def signal_power(y):
+    # 信号的交流功率（方差），不计直流分量，心电信号的基线不会影响按信噪比确定的噪声强度
+    return float(np.var(y))
+
+
+def snr_scale(y, snr_db):
+    # 使单位功率噪声与信号 y 的信噪比为 snr_db 分贝的缩放系数
+    return float(np.sqrt(signal_power(y) / 10 ** (snr_db / 10)))
+
+
+class NoiseStream:
+    # 有状态的噪声发生器，生成的噪声功率为 scale^2：
+    # 随机数生成器、滤波器状态和采样位置在多次 generate 调用之间延续，
+    # 种子相同时逐块生成的结果拼接起来与一次生成整段完全相同，可用于实时信号和流式导出
+    # density 为脉冲噪声每个采样点出现脉冲的概率，leak 为布朗噪声积分器的泄漏系数（越接近 1 低频越多），
+    # hum_frequency / harmonics 为工频干扰的基波频率和 (谐波次数, 相对幅度)，高于 fs/2 的谐波被忽略
+    def __init__(self, noise_type='white', scale=1.0, rng=None, sample_rate=1.0, dtype=np.float64,
+                 density=0.001, leak=0.999, hum_frequency=HUM_FREQUENCY, harmonics=HUM_HARMONICS):
+        if noise_type not in NOISE_TYPES:
+            raise ValueError(f"未知的噪声类型: {noise_type}")
+        self.noise_type = noise_type
+        self.scale = float(scale)
+        self.rng = np.random.default_rng(rng)
+        self.sample_rate = float(sample_rate)
+        self.dtype = _float_dtype(dtype)
+        self.position = 0
+        self.zi = None
+        if noise_type == 'pink':
+            self.b, self.a = _unit_power_pink()
+        elif noise_type == 'brown':
+            if not 0 < leak < 1:
+                raise ValueError("leak 必须在 (0, 1) 范围内")
+            # 泄漏积分器 out[i] = leak * out[i - 1] + w[i]，输入乘以 sqrt(1 - leak^2) 使输出为单位功率
+            self.b, self.a = np.array([np.sqrt(1 - leak * leak)]), np.array([1.0, -leak])
+        elif noise_type == 'impulse':
+            if not 0 < density <= 1:
+                raise ValueError("density 必须在 (0, 1] 范围内")
+            # 幅度为 ±1/sqrt(density) 的随机符号脉冲，平均功率为 1
+            self.density = float(density)
+            self.pending = np.empty(0, dtype=np.int64)
+            self.pending_signs = np.empty(0)
+            self.last_impulse = -1
+        elif noise_type == 'hum':
+            nyquist = self.sample_rate / 2
+            harmonics = [(k * float(hum_frequency), float(w)) for k, w in harmonics if k * hum_frequency < nyquist]
+            if not harmonics:
+                raise ValueError("工频干扰的频率必须低于 fs/2")
+            frequencies, weights = np.array(harmonics).T
+            # 各谐波为正弦波，功率为幅度平方的一半，归一化后总功率为 1
+            self.frequencies = frequencies
+            self.weights = weights * np.sqrt(2 / np.dot(weights, weights))
+            self.phases = self.rng.uniform(0, 2 * np.pi, len(frequencies))
+
+    def generate(self, n, out=None):
+        # 生成接下来的 n 个噪声点
+        if out is None:
+            out = np.empty(n, dtype=self.dtype)
+        elif out.shape != (n,):
+            raise ValueError("out 的长度必须为 n")
+        fill = getattr(self, f'_{self.noise_type}')
+        for start in range(0, n, _BLOCK):
+            block = out[start:start + _BLOCK]
+            fill(block)
+            self.position += len(block)
+        if self.scale != 1:
+            out *= self.scale
+        return out
+
+    def chunks(self, chunk_size, num_samples):
+        # 逐块生成共 num_samples 个噪声点
+        for start in range(0, num_samples, chunk_size):
+            yield self.generate(min(chunk_size, num_samples - start))
+
+    def _white(self, out):
+        self.rng.standard_normal(out=out, dtype=out.dtype)
+
+    def _filtered(self, out):
+        from scipy.signal import lfilter
+
+        self._white(out)
+        if self.zi is None:
+            self.zi = np.zeros(len(self.a) - 1)
+        out[:], self.zi = lfilter(self.b, self.a, out, zi=self.zi)
+
+    _pink = _filtered
+    _brown = _filtered
+
+    def _impulse(self, out):
+        out[:] = 0
+        end = self.position + len(out)
+        while True:
+            if len(self.pending) == 0:
+                # 相邻脉冲的间隔服从几何分布，按固定批次抽取
+                gaps = self.rng.geometric(self.density, _IMPULSE_BATCH)
+                self.pending = self.last_impulse + np.cumsum(gaps)
+                self.pending_signs = self.rng.choice((-1.0, 1.0), _IMPULSE_BATCH) / np.sqrt(self.density)
+                self.last_impulse = int(self.pending[-1])
+            count = np.searchsorted(self.pending, end)
+            out[self.pending[:count] - self.position] = self.pending_signs[:count]
+            self.pending = self.pending[count:]
+            self.pending_signs = self.pending_signs[count:]
+            if len(self.pending):
+                return
+
+    def _hum(self, out):
+        t = np.arange(self.position, self.position + len(out), dtype=np.float64)
+        t /= self.sample_rate
+        out[:] = 0
+        phase = np.empty_like(t)
+        for frequency, weight, phase0 in zip(self.frequencies, self.weights, self.phases):
+            np.multiply(t, 2 * np.pi * frequency, out=phase)
+            phase += phase0
+            np.sin(phase, out=phase)
+            phase *= weight
+            out += phase
+
+
+def colored_noise(size, noise_type='white', scale=1.0, rng=None, sample_rate=1.0, dtype=np.float64, out=None,
+                  **options):
+    # 一次生成 size 个指定类型的噪声点，功率为 scale^2；options 见 NoiseStream
+    return NoiseStream(noise_type, scale, rng, sample_rate, dtype, **options).generate(size, out=out)
+
+
+def add_noise(y, noise_type='white', scale=1.0, snr_db=None, rng=None, sample_rate=1.0, out=None,
+              **options):
+    # 在信号 y 上叠加指定类型的噪声，给定 snr_db 时按信噪比（相对于信号的交流功率）确定噪声强度，
+    # 否则噪声功率为 scale^2；逐块生成并相加，out 可以是 y 本身以实现原地修改
+    y = np.asarray(y)
+    if snr_db is not None:
+        scale = snr_scale(y, snr_db)
+    if out is None:
+        out = np.empty(y.shape, dtype=_float_dtype(y.dtype))
+    stream = NoiseStream(noise_type, scale, rng, sample_rate, out.dtype, **options)
+    buffer = np.empty(min(len(y), _BLOCK), dtype=out.dtype)
+    for start in range(0, len(y), _BLOCK):
+        stop = min(start + _BLOCK, len(y))
+        np.add(y[start:stop], stream.generate(stop - start, out=buffer[:stop - start]), out=out[start:stop])
+    return out
@@ -0,0 +1,589 @@
+import abc
+import collections
+import os
+import threading
+import weakref
+
+import numpy as np
+
+from .generators import SIGNAL_TYPES
+from .writers import EXPORT_CHUNK, export_signal, iter_chunks, generated_chunks, synthesized_chunks
+from .readers import read_signal
+from .noise import NOISE_TYPES, NoiseStream, snr_scale
+from .butterworth import ButterworthFilter, butter_filter
+from .filters import SMOOTH_MODES, smooth
+from .ecg_analysis import QrsDetector
+from .spectrum import get_window, next_fast_len, rfft_frequencies, _one_sided
+
+# 流水线默认的块大小（点数）
+PIPELINE_CHUNK = EXPORT_CHUNK
+# 缓存各阶段输出的默认内存预算（字节）
+CACHE_BUDGET = 256 << 20
+
+
+class _Identity:
+    # 以对象本身（而不是值）作为缓存键，只保留弱引用；对象被回收后不再与任何键相等
+    def __init__(self, obj):
+        self._ref = weakref.ref(obj)
+        self._id = id(obj)
+
+    def __hash__(self):
+        return self._id
+
+    def __eq__(self, other):
+        obj = self._ref()
+        return isinstance(other, _Identity) and obj is not None and obj is other._ref()
+
+
+# 数据源
+# 数据源给出 sample_rate、num_samples（未知时为 None），chunks(chunk_size) 逐块产生数据，
+# key() 由数据源的全部参数组成，相同的键保证产生相同的数据；返回 None 表示不可缓存
+# cache_output 为 False 的数据源（数据本来就在内存或文件中）不缓存其输出
+
+class SignalSource:
+    # 基本信号：按时间基准逐块生成
+    cache_output = True
+
+    def __init__(self, signal_type, timebase, period, amplitude=1.0, baseline=0.0, phase=0.0):
+        if signal_type not in SIGNAL_TYPES:
+            raise ValueError(f"未知的信号类型: {signal_type}")
+        self.signal_type = signal_type
+        self.timebase = timebase
+        self.params = (float(period), float(amplitude), float(baseline), float(phase))
+        self.sample_rate = timebase.sample_rate
+        self.num_samples = timebase.num_samples
+
+    def key(self):
+        return ('signal', self.signal_type, self.timebase.key()) + self.params
+
+    def chunks(self, chunk_size):
+        return generated_chunks(self.signal_type, self.timebase, *self.params, chunk_size=chunk_size)
+
+
+class SynthesisSource:
+    # 合成信号：signal_data_list 中每个分量有 signal_type、period、amplitude、baseline、phase
+    cache_output = True
+
+    def __init__(self, signal_data_list, timebase, phase_offset=0.0):
+        self.signal_data_list = list(signal_data_list)
+        self.timebase = timebase
+        self.phase_offset = float(phase_offset)
+        self.sample_rate = timebase.sample_rate
+        self.num_samples = timebase.num_samples
+
+    def key(self):
+        components = tuple((d.signal_type, d.period, d.amplitude, d.baseline, d.phase)
+                           for d in self.signal_data_list)
+        return ('synthesis', components, self.timebase.key(), self.phase_offset)
+
+    def chunks(self, chunk_size):
+        return synthesized_chunks(self.signal_data_list, self.timebase, self.phase_offset, chunk_size=chunk_size)
+
+
+class ArraySource:
+    # 已有的数组或内存映射（心电记录、导入的文件），按块切分，不复制
+    # 默认以数组对象本身作为缓存键，原地修改数组后需要给出新的 key
+    cache_output = False
+
+    def __init__(self, y, sample_rate=1.0, key=None):
+        self.y = y
+        self.sample_rate = float(sample_rate)
+        self.num_samples = len(y)
+        self._key = key
+
+    def key(self):
+        return ('array', self._key if self._key is not None else _Identity(self.y), self.sample_rate)
+
+    def chunks(self, chunk_size):
+        return iter_chunks(self.y, chunk_size)
+
+
+class FileSource:
+    # 信号文件（CSV、NPY、WAV、原始二进制），第一次使用时才打开；options 传给 read_signal
+    cache_output = False
+
+    def __init__(self, path, sample_rate=None, **options):
+        self.path = os.path.abspath(path)
+        self.options = options
+        self._sample_rate = sample_rate
+        self._signal = None
+
+    @property
+    def signal(self):
+        if self._signal is None:
+            self._signal = read_signal(self.path, **self.options)
+        return self._signal
+
+    @property
+    def sample_rate(self):
+        return float(self._sample_rate or self.signal.sample_rate or 1.0)
+
+    @property
+    def num_samples(self):
+        return len(self.signal)
+
+    def key(self):
+        # 文件被修改后键随之改变
+        return ('file', self.path, os.path.getmtime(self.path), self._sample_rate,
+                tuple(sorted(self.options.items())))
+
+    def chunks(self, chunk_size):
+        return iter_chunks(self.signal.data, chunk_size)
+
+
+# 处理阶段
+# 处理阶段逐块输入、逐块输出，状态在块之间延续；reset(sample_rate) 在每次运行前调用，
+# 不能原地修改输入的块（它可能是缓存中的数据）
+# streaming 为 False 的阶段需要整段数据（零相位滤波、按信噪比加噪声）：process 只保存输入，
+# 输入结束时由 flush 一次输出全部结果，内存占用与点数成正比
+
+class Stage(abc.ABC):
+    streaming = True
+
+    def key(self):
+        # 阶段类型和全部参数，返回 None 表示结果不可重复（如不固定种子的噪声），不缓存
+        return (type(self).__name__,) + tuple(sorted(self.params.items()))
+
+    def __repr__(self):
+        params = ', '.join(f'{key}={value!r}' for key, value in self.params.items())
+        return f"{type(self).__name__}({params})"
+
+    def replace(self, **params):
+        # 修改部分参数后的新阶段，不共享运行状态
+        return type(self)(**dict(self.params, **params))
+
+    def reset(self, sample_rate):
+        self.sample_rate = float(sample_rate)
+        self.held = []
+
+    def output_rate(self, sample_rate):
+        return sample_rate
+
+    def output_length(self, num_samples):
+        return num_samples
+
+    @abc.abstractmethod
+    def process(self, chunk):
+        # 处理一块，返回已经可以输出的部分（可能为空）
+        pass
+
+    def flush(self):
+        # 输入结束后剩余的输出
+        return np.empty(0)
+
+    def stream(self, chunks):
+        for chunk in chunks:
+            out = self.process(chunk)
+            if len(out):
+                yield out
+        out = self.flush()
+        if len(out):
+            yield out
+
+    def _hold(self, chunk):
+        # 非流式阶段保存输入，暂不输出
+        chunk = np.asarray(chunk)
+        self.held.append(chunk)
+        return chunk[:0]
+
+    def _release(self):
+        data = np.concatenate(self.held) if self.held else np.empty(0)
+        self.held = []
+        return data
+
+
+class NoiseStage(Stage):
+    # 叠加噪声（engine.NoiseStream），seed 为 None 时每次运行的噪声不同，结果不缓存；
+    # seed 也可以是整数序列，如动态演示中的 (种子, 帧号)
+    # 给定 snr_db 时按信噪比确定噪声强度（忽略 scale），需要整段数据，结果与 add_noise(snr_db=...) 相同
+    def __init__(self, noise_type='white', scale=1.0, seed=None, snr_db=None, **options):
+        if noise_type not in NOISE_TYPES:
+            raise ValueError(f"未知的噪声类型: {noise_type}")
+        if 'harmonics' in options:
+            options['harmonics'] = tuple(tuple(h) for h in options['harmonics'])
+        if isinstance(seed, list):
+            seed = tuple(seed)
+        snr_db = None if snr_db is None else float(snr_db)
+        self.params = dict(noise_type=noise_type, scale=float(scale), seed=seed, snr_db=snr_db, **options)
+        self.streaming = snr_db is None
+
+    def key(self):
+        return None if self.params['seed'] is None else super().key()
+
+    def reset(self, sample_rate):
+        super().reset(sample_rate)
+        self.noise = self._noise(self.params['scale']) if self.streaming else None
+
+    def _noise(self, scale, dtype=np.float64):
+        options = {key: value for key, value in self.params.items()
+                   if key not in ('noise_type', 'scale', 'seed', 'snr_db')}
+        return NoiseStream(self.params['noise_type'], scale, rng=self.params['seed'],
+                           sample_rate=self.sample_rate, dtype=dtype, **options)
+
+    def process(self, chunk):
+        if not self.streaming:
+            return self._hold(chunk)
+        chunk = np.asarray(chunk)
+        return chunk + self.noise.generate(len(chunk))
+
+    def flush(self):
+        if self.streaming:
+            return super().flush()
+        y = self._release()
+        if len(y) == 0:
+            return y
+        self.noise = self._noise(snr_scale(y, self.params['snr_db']), y.dtype)
+        return y + self.noise.generate(len(y))
+
+
+class FilterStage(Stage):
+    # 滤波：kind 为 'butterworth'（order、cutoff（Hz）、btype、zero_phase），或平滑滤波 'mean'、'median'、'ema'（size）
+    # 结果与对整段信号调用 butter_filter / smooth 相同；零相位滤波需要整段数据，其余逐块处理
+    def __init__(self, kind='butterworth', **options):
+        if kind != 'butterworth' and kind not in SMOOTH_MODES:
+            raise ValueError(f"未知的滤波方式: {kind}")
+        if kind == 'butterworth':
+            options = dict(order=int(options.get('order', 4)), cutoff=options['cutoff'],
+                           btype=options.get('btype', 'lowpass'), zero_phase=bool(options.get('zero_phase', False)))
+            if not isinstance(options['cutoff'], (int, float)):
+                options['cutoff'] = tuple(options['cutoff'])
+            self.streaming = not options['zero_phase']
+        else:
+            options = dict(size=int(options.get('size', 5)))
+        self.params = dict(kind=kind, **options)
+
+    def reset(self, sample_rate):
+        super().reset(sample_rate)
+        kind = self.params['kind']
+        if kind == 'butterworth':
+            self.filter = ButterworthFilter(self.params['order'], self.params['cutoff'], sample_rate,
+                                            self.params['btype'])
+        elif kind == 'ema':
+            self.alpha = 2.0 / (self.params['size'] + 1)
+            self.zi = None
+        else:
+            # 滑动窗口滤波：保留上一块末尾 size - 1 个点作为下一块的上下文
+            self.tail = np.empty(0)
+
+    def process(self, chunk):
+        from scipy.signal import lfilter
+
+        kind = self.params['kind']
+        if not self.streaming:
+            return self._hold(chunk)
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if kind == 'butterworth':
+            return self.filter.process(chunk)
+        if len(chunk) == 0:
+            return chunk
+        if kind == 'ema':
+            if self.zi is None:
+                self.zi = [(1 - self.alpha) * chunk[0]]
+            out, self.zi = lfilter([self.alpha], [1.0, self.alpha - 1.0], chunk, zi=self.zi)
+            return out
+        size = self.params['size']
+        data = np.concatenate((self.tail, chunk))
+        out = smooth(data, size, mode=kind)[len(self.tail):]
+        self.tail = data[len(data) - (size - 1):] if size > 1 else data[:0]
+        return out
+
+    def flush(self):
+        if self.streaming:
+            return super().flush()
+        return butter_filter(self._release(), self.params['order'], self.params['cutoff'], self.sample_rate,
+                             self.params['btype'], zero_phase=True)
+
+
+class DecimateStage(Stage):
+    # 整数倍降采样：先用 Butterworth 低通滤波（截止频率为新奈奎斯特频率的 0.8 倍）去除混叠，再每 factor 个点取一个
+    def __init__(self, factor, order=8):
+        if int(factor) < 1:
+            raise ValueError("降采样倍数必须大于 0")
+        self.params = dict(factor=int(factor), order=int(order))
+
+    def output_rate(self, sample_rate):
+        return sample_rate / self.params['factor']
+
+    def output_length(self, num_samples):
+        return None if num_samples is None else -(-num_samples // self.params['factor'])
+
+    def reset(self, sample_rate):
+        super().reset(sample_rate)
+        factor = self.params['factor']
+        self.filter = None
+        if factor > 1:
+            self.filter = ButterworthFilter(self.params['order'], 0.4 * sample_rate / factor, sample_rate)
+        self.position = 0
+
+    def process(self, chunk):
+        factor = self.params['factor']
+        if self.filter is None:
+            return np.asarray(chunk)
+        filtered = self.filter.process(chunk)
+        # 保留输入中下标为 factor 整数倍的点，块边界不必对齐
+        out = filtered[(-self.position) % factor::factor]
+        self.position += len(filtered)
+        return out
+
+
+# 输出
+# 输出端逐块接收流水线的最终结果：open(sample_rate, num_samples) 在运行前调用，write(chunk) 接收每一块，
+# close() 在运行结束后调用并返回结果
+
+class ArraySink:
+    # 把结果拼接成一个数组（用于绘图），总点数已知时直接写入预分配的数组
+    def __init__(self, dtype=np.float64):
+        self.dtype = dtype
+
+    def open(self, sample_rate, num_samples):
+        self.sample_rate = sample_rate
+        self.out = None if num_samples is None else np.empty(num_samples, dtype=self.dtype)
+        self.parts = []
+        self.count = 0
+
+    def write(self, chunk):
+        if self.out is not None and self.count + len(chunk) <= len(self.out):
+            self.out[self.count:self.count + len(chunk)] = chunk
+        else:
+            self.parts.append(np.array(chunk, dtype=self.dtype))
+        self.count += len(chunk)
+
+    def close(self):
+        if self.out is not None and not self.parts:
+            return self.out[:self.count]
+        head = [] if self.out is None else [self.out[:self.count - sum(len(p) for p in self.parts)]]
+        return np.concatenate(head + self.parts) if head or self.parts else np.empty(0, dtype=self.dtype)
+
+
+class SpectrumSink:
+    # 流式 Welch 功率谱：按 nperseg、overlap 分段，跨块的分段由保留的尾部数据补齐，
+    # 结果与对整段信号调用 engine.welch 相同；返回 (频率轴, 功率谱)
+    def __init__(self, nperseg=1024, overlap=0.5, window='hann', scaling='density', detrend=True):
+        if scaling not in ('density', 'spectrum'):
+            raise ValueError(f"未知的缩放方式: {scaling}")
+        if not 0 <= overlap < 1:
+            raise ValueError("overlap 必须在 [0, 1) 范围内")
+        self.nperseg = int(nperseg)
+        self.overlap = overlap
+        self.window_name = window
+        self.scaling = scaling
+        self.detrend = detrend
+
+    def open(self, sample_rate, num_samples):
+        self.sample_rate = float(sample_rate)
+        if num_samples:
+            # 与 welch 相同：信号比分段短时整段作为一段
+            self.nperseg = min(self.nperseg, num_samples)
+        self.step = max(1, int(round(self.nperseg * (1 - self.overlap))))
+        self.window = get_window(self.window_name, self.nperseg)
+        self.nfft = next_fast_len(self.nperseg)
+        self.power = np.zeros(self.nfft // 2 + 1)
+        self.segments = 0
+        self.tail = np.empty(0)
+
+    def write(self, chunk):
+        data = np.concatenate((self.tail, np.asarray(chunk, dtype=np.float64)))
+        if len(data) < self.nperseg:
+            self.tail = data
+            return
+        count = (len(data) - self.nperseg) // self.step + 1
+        segments = np.lib.stride_tricks.sliding_window_view(data, self.nperseg)[::self.step][:count]
+        if self.detrend:
+            segments = segments - segments.mean(axis=1, keepdims=True)
+        spectra = np.fft.rfft(segments * self.window, self.nfft, axis=1)
+        self.power += (spectra.real ** 2 + spectra.imag ** 2).sum(axis=0)
+        self.segments += count
+        self.tail = data[count * self.step:]
+
+    def close(self):
+        freqs = rfft_frequencies(self.nfft, self.sample_rate)
+        if self.segments == 0:
+            return np.empty(0), np.empty(0)
+        power = self.power / self.segments
+        if self.scaling == 'density':
+            power /= self.sample_rate * (self.window ** 2).sum()
+        else:
+            power /= self.window.sum() ** 2
+        return freqs, _one_sided(power, self.nfft)
+
+
+class PeakSink:
+    # 心电分析：流式检测 R 波（engine.QrsDetector），返回 R 波位置；options 见 QrsDetector
+    def __init__(self, **options):
+        self.options = options
+
+    def open(self, sample_rate, num_samples):
+        self.detector = QrsDetector(sample_rate, **self.options)
+        self.peaks = []
+
+    def write(self, chunk):
+        self.peaks.append(self.detector.process(chunk))
+
+    def close(self):
+        self.peaks.append(self.detector.flush())
+        return np.concatenate(self.peaks)
+
+
+# 缓存与流水线
+
+class StageCache:
+    # 各阶段输出的 LRU 缓存：键为“数据源 + 到该阶段为止所有阶段”的参数，值为该阶段输出的全部块（只读）
+    # 总字节数不超过 budget，超出时淘汰最久未使用的项；单项超过 budget 时不缓存
+    # 可以被多个线程中的流水线同时使用（界面在后台线程中计算）
+    def __init__(self, budget=CACHE_BUDGET):
+        self.budget = int(budget)
+        self.nbytes = 0
+        self.recording = 0  # 正在记录、尚未放入缓存的字节数
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key, chunks):
+        nbytes = sum(chunk.nbytes for chunk in chunks)
+        if nbytes > self.budget:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[0]
+            while self._entries and self.nbytes + nbytes > self.budget:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+                self.stats['evictions'] += 1
+            self._entries[key] = (nbytes, chunks)
+            self.nbytes += nbytes
+
+    def _reserve(self, nbytes):
+        # 为正在进行的记录预留预算，超出时返回 False
+        with self._lock:
+            if self.recording + nbytes > self.budget:
+                return False
+            self.recording += nbytes
+            return True
+
+    def _unreserve(self, nbytes):
+        with self._lock:
+            self.recording -= nbytes
+
+    def record(self, key, chunks):
+        # 透传 chunks，同时保存各块；全部产生完之后放入缓存。
+        # 所有正在进行的记录与已缓存的数据共用预算，超出时放弃记录，不影响透传
+        saved = []
+        nbytes = 0
+        try:
+            for chunk in chunks:
+                if saved is not None:
+                    if not self._reserve(chunk.nbytes):
+                        saved = None
+                        self._unreserve(nbytes)
+                        nbytes = 0
+                    else:
+                        chunk = np.asarray(chunk)
+                        chunk.flags.writeable = False
+                        saved.append(chunk)
+                        nbytes += chunk.nbytes
+                yield chunk
+            if saved is not None:
+                self.put(key, saved)
+        finally:
+            self._unreserve(nbytes)
+
+
+class Pipeline:
+    # 流式处理流水线：数据源 → 处理阶段（噪声、滤波、降采样）→ 输出端（数组、功率谱、R 波、文件），
+    # 各环节之间逐块传递固定大小的数组，内存占用只与块大小有关（缓存和 ArraySink 除外）
+    # 给出 cache 时记录每个阶段的输出，再次运行时从缓存中最靠后的已知阶段开始，只重新计算其下游
+    def __init__(self, source, stages=(), chunk_size=PIPELINE_CHUNK, cache=None):
+        self.source = source
+        self.stages = list(stages)
+        self.chunk_size = int(chunk_size)
+        self.cache = cache
+
+    @property
+    def sample_rate(self):
+        rate = self.source.sample_rate
+        for stage in self.stages:
+            rate = stage.output_rate(rate)
+        return rate
+
+    @property
+    def num_samples(self):
+        n = self.source.num_samples
+        for stage in self.stages:
+            n = stage.output_length(n)
+        return n
+
+    def keys(self):
+        # 数据源及每个阶段输出的缓存键，某个阶段不可缓存时它和所有下游阶段都为 None
+        key = self.source.key()
+        keys = [None if key is None else (self.chunk_size, key)]
+        for stage in self.stages:
+            stage_key = stage.key()
+            key = None if key is None or stage_key is None else keys[-1] + (stage_key,)
+            keys.append(key)
+        return keys
+
+    def chunks(self, taps=()):
+        # 逐块产生最终结果，同时把每一块交给 taps 中的输出端（调用方负责 open / close）
+        keys = self.keys() if self.cache is not None else [None] * (len(self.stages) + 1)
+        start, stream = 0, None
+        for level in range(len(self.stages), -1, -1):
+            cached = self.cache.get(keys[level]) if keys[level] is not None else None
+            if cached is not None:
+                start, stream = level, iter(cached)
+                break
+        if stream is None:
+            stream = self.source.chunks(self.chunk_size)
+            if self.source.cache_output:
+                stream = self._recorded(keys[0], stream)
+        rate = self.source.sample_rate
+        for level, stage in enumerate(self.stages):
+            if level >= start:
+                stage.reset(rate)
+                stream = self._recorded(keys[level + 1], stage.stream(stream))
+            rate = stage.output_rate(rate)
+        for chunk in stream:
+            for tap in taps:
+                tap.write(chunk)
+            yield chunk
+
+    def _recorded(self, key, chunks):
+        if self.cache is None or key is None:
+            return chunks
+        return self.cache.record(key, chunks)
+
+    def run(self, *sinks):
+        # 运行流水线，返回各输出端的结果
+        for sink in sinks:
+            sink.open(self.sample_rate, self.num_samples)
+        for _ in self.chunks(sinks):
+            pass
+        return [sink.close() for sink in sinks]
+
+    def export(self, path, *sinks, progress=None, **options):
+        # 把结果逐块写入文件（格式见 export_signal），同时交给 sinks，返回各输出端的结果
+        for sink in sinks:
+            sink.open(self.sample_rate, self.num_samples)
+        export_signal(path, self.chunks(sinks), sample_rate=self.sample_rate, num_samples=self.num_samples,
+                      progress=progress, **options)
+        return [sink.close() for sink in sinks]
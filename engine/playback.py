@@ -0,0 +1,94 @@
+import numpy as np
+
+
+class RingBuffer:
+    # 固定大小的环形缓冲区：数据在底层数组中存两份，
+    # 因此任何时刻最近 capacity 个点都是一段连续内存，view() 不需要复制
+    # item_shape 不为空时每个元素是一个数组（如频谱图的一列）
+    def __init__(self, capacity, dtype=np.float64, item_shape=(), fill_value=0):
+        if capacity < 1:
+            raise ValueError("缓冲区大小必须大于 0")
+        self.capacity = capacity
+        self._data = np.full((2 * capacity,) + tuple(item_shape), fill_value, dtype=dtype)
+        self._head = 0  # 最早的数据所在的位置，也是下一次写入的位置
+
+    def extend(self, chunk):
+        # 写入一块数据，只保留最后 capacity 个点，耗时与块大小成正比
+        chunk = np.asarray(chunk)[-self.capacity:]
+        n = len(chunk)
+        if n == 0:
+            return
+        cap = self.capacity
+        start = self._head
+        first = min(n, cap - start)
+        self._data[start:start + first] = chunk[:first]
+        self._data[start + cap:start + cap + first] = chunk[:first]
+        rest = n - first
+        if rest:
+            self._data[:rest] = chunk[first:]
+            self._data[cap:cap + rest] = chunk[first:]
+        self._head = (start + n) % cap
+
+    def view(self):
+        # 按时间顺序返回缓冲区中的数据（只读视图）
+        view = self._data[self._head:self._head + self.capacity]
+        view.flags.writeable = False
+        return view
+
+
+class EcgPlayback:
+    # 长心电记录的流式回放：按块从数组或内存映射文件中读取数据写入环形缓冲区，
+    # 显示窗口固定为 window 个点，内存占用恒定，每次更新的耗时只与窗口大小有关
+    def __init__(self, recording, window=2000, sample_rate=500.0, loop=True):
+        if len(recording) == 0:
+            raise ValueError("心电记录为空")
+        self.recording = recording
+        self.window = min(window, len(recording))
+        self.sample_rate = float(sample_rate)
+        self.loop = loop
+        self.ring = RingBuffer(self.window)
+        self.ring.extend(recording[:self.window])
+        self.position = self.window % len(recording)  # 下一个要读取的点在记录中的位置
+        self.last_count = 0  # 最近一次读取写入窗口的新点数
+        self.finished = False
+        self._pending = 0.0  # 不足一个点的累计时间（以点数计）
+
+    def read(self, n):
+        # 向前读取 n 个点，返回当前窗口
+        length = len(self.recording)
+        if n > self.window:
+            # 跳过的点不会显示，直接移动读取位置
+            skip = n - self.window
+            if not self.loop and self.position + skip >= length:
+                skip = max(0, length - self.position - self.window)
+            self.position = (self.position + skip) % length
+            n = self.window
+        self.last_count = 0
+        while n > 0 and not self.finished:
+            count = min(n, length - self.position)
+            self.ring.extend(self.recording[self.position:self.position + count])
+            self.position += count
+            self.last_count += count
+            n -= count
+            if self.position >= length:
+                if self.loop:
+                    self.position = 0
+                else:
+                    self.finished = True
+        return self.ring.view()
+
+    def advance(self, seconds):
+        # 按采样率推进 seconds 秒，返回当前窗口
+        self._pending += seconds * self.sample_rate
+        n = int(self._pending)
+        self._pending -= n
+        return self.read(n)
+
+    def seek(self, position):
+        # 跳转到记录中的指定位置，窗口显示该位置之前的 window 个点
+        length = len(self.recording)
+        start = max(0, min(position, length) - self.window)
+        self.ring.extend(self.recording[start:start + self.window])
+        self.position = (start + self.window) % length
+        self.finished = not self.loop and start + self.window >= length
+        self._pending = 0.0
@@ -0,0 +1,160 @@
+import numpy as np
+
+from .lod import UniformAxis, _as_axis
+
+# 空间索引网格的边长（像素）
+INDEX_CELL = 8.0
+
+
+def is_monotonic(x):
+    # x 是否单调不减（等间隔轴总是单调的）
+    if isinstance(x, UniformAxis):
+        return x.step > 0
+    x = np.asarray(x)
+    return bool(np.all(x[1:] >= x[:-1]))
+
+
+def nearest_sample(x, value):
+    # 在单调不减的 x 中二分查找横坐标最接近 value 的采样点下标，O(log N)
+    n = len(x)
+    if n == 0:
+        raise ValueError("x 不能为空")
+    i = int(x.searchsorted(value))
+    if i <= 0:
+        return 0
+    if i >= n:
+        return n - 1
+    return i if float(x[i]) - value < value - float(x[i - 1]) else i - 1
+
+
+def _affine(matrix):
+    # 3x3 仿射矩阵中的缩放和平移：显示坐标 = 数据坐标 * scale + offset（坐标轴为线性刻度）
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return matrix[0, 0], matrix[0, 2], matrix[1, 1], matrix[1, 2]
+
+
+class DisplayIndex:
+    # 任意曲线（x 不单调）的空间索引：把所有采样点按显示坐标（像素）分到边长为 cell 的网格中，
+    # 按网格编号排序，查询时只检查光标附近几个网格内的点；建好后与坐标轴范围、画布大小绑定
+    # bounds 为坐标轴的显示范围 (x0, y0, x1, y1)，给定时只索引范围外 margin 像素以内的点，
+    # 网格数较少（不超过 65536）时用基数排序，建索引的耗时与点数成线性关系
+    def __init__(self, x, y, matrix, bounds=None, cell=INDEX_CELL, margin=4 * INDEX_CELL):
+        sx, ox, sy, oy = _affine(matrix)
+        px = np.asarray(_as_axis(x)[:]) * sx + ox
+        py = np.asarray(y) * sy + oy
+        keep = np.isfinite(px) & np.isfinite(py)
+        if bounds is not None:
+            x0, y0, x1, y1 = bounds
+            keep &= (px >= x0 - margin) & (px <= x1 + margin) & (py >= y0 - margin) & (py <= y1 + margin)
+        self.cell = float(cell)
+        self.index = np.flatnonzero(keep)
+        self.px = px[self.index].astype(np.float32)
+        self.py = py[self.index].astype(np.float32)
+        self.gx0 = self.gy0 = 0
+        self.rows = 1
+        if len(self.index) == 0:
+            self.keys = np.empty(0, dtype=np.int64)
+            return
+        gx = np.floor(self.px / self.cell).astype(np.int64)
+        gy = np.floor(self.py / self.cell).astype(np.int64)
+        self.gx0, self.gy0 = int(gx.min()), int(gy.min())
+        self.rows = int(gy.max()) - self.gy0 + 1
+        keys = (gx - self.gx0) * self.rows + (gy - self.gy0)
+        if (int(gx.max()) - self.gx0 + 1) * self.rows <= 1 << 16:
+            order = np.argsort(keys.astype(np.uint16), kind='stable')
+        else:
+            order = np.argsort(keys)
+        self.index = self.index[order]
+        self.px = self.px[order]
+        self.py = self.py[order]
+        self.keys = keys[order]
+
+    def nearest(self, qx, qy, radius):
+        # 返回显示坐标 (qx, qy) 周围 radius 像素内最近的采样点下标，没有时返回 None
+        reach = int(np.ceil(radius / self.cell))
+        cx = int(np.floor(qx / self.cell)) - self.gx0
+        cy = int(np.floor(qy / self.cell)) - self.gy0
+        y_lo, y_hi = max(cy - reach, 0), min(cy + reach, self.rows - 1)
+        if y_lo > y_hi:
+            return None
+        # 同一网格列中相邻的几个网格编号连续，每列只需一次二分查找
+        columns = np.arange(cx - reach, cx + reach + 1)
+        columns = columns[columns >= 0]
+        lo = np.searchsorted(self.keys, columns * self.rows + y_lo)
+        hi = np.searchsorted(self.keys, columns * self.rows + y_hi, side='right')
+        if not np.any(hi > lo):
+            return None
+        candidates = np.concatenate([np.arange(a, b) for a, b in zip(lo, hi)])
+        d2 = (self.px[candidates] - qx) ** 2 + (self.py[candidates] - qy) ** 2
+        best = int(np.argmin(d2))
+        return int(self.index[candidates[best]]) if d2[best] <= radius * radius else None
+
+
+class PointQuery:
+    # 曲线取值：x 单调时用二分查找，O(log N)；否则使用按显示坐标建立的空间索引，
+    # 索引在坐标轴范围或画布大小改变后第一次查询时重建并缓存，之后每次查询都不再扫描整个数组
+    def __init__(self, x=None, y=None):
+        self.x = None
+        self.y = None
+        self.monotonic = False
+        self._index = None
+        self._index_key = None
+        if x is not None:
+            self.set_data(x, y)
+
+    def set_data(self, x, y):
+        # 替换数据；与当前数据是同一对象时不做任何计算
+        if x is not self.x:
+            self.x = _as_axis(x)
+            self.monotonic = is_monotonic(self.x)
+            self.invalidate()
+        if y is not self.y:
+            self.y = y
+            self.invalidate()
+
+    def invalidate(self):
+        # y 被原地修改后调用，丢弃缓存的空间索引
+        self._index = None
+        self._index_key = None
+
+    def __len__(self):
+        return 0 if self.x is None else len(self.x)
+
+    def point(self, i):
+        return float(self.x[i]), float(self.y[i])
+
+    def nearest_x(self, value):
+        # 横坐标最接近 value 的采样点下标（要求 x 单调）
+        if not self.monotonic:
+            raise ValueError("x 不是单调的，请使用 pick")
+        return nearest_sample(self.x, value)
+
+    def pick(self, qx, qy, matrix, radius=10.0, bounds=None):
+        # 显示坐标 (qx, qy) 周围 radius 像素内距离最近的采样点下标，没有时返回 None；
+        # matrix 为数据坐标到显示坐标的 3x3 仿射矩阵（matplotlib 中为 ax.transData.get_matrix()），
+        # bounds 为坐标轴的显示范围（ax.bbox.extents），x 不单调时只为范围内的点建索引
+        if len(self) == 0:
+            return None
+        if not self.monotonic:
+            return self._display_index(matrix, bounds).nearest(qx, qy, radius)
+        sx, ox, sy, oy = _affine(matrix)
+        # 只检查横向 radius 像素内的采样点，点数与可见点数 / 像素宽度成正比
+        x0, x1 = sorted(((qx - radius - ox) / sx, (qx + radius - ox) / sx))
+        i0 = int(self.x.searchsorted(x0))
+        i1 = int(self.x.searchsorted(x1, side='right'))
+        if i0 >= i1:
+            return None
+        px = np.asarray(self.x[i0:i1]) * sx + ox
+        py = np.asarray(self.y[i0:i1]) * sy + oy
+        d2 = (px - qx) ** 2 + (py - qy) ** 2
+        best = int(np.nanargmin(d2)) if np.isfinite(d2).any() else None
+        if best is None or d2[best] > radius * radius:
+            return None
+        return i0 + best
+
+    def _display_index(self, matrix, bounds):
+        key = (np.asarray(matrix, dtype=np.float64).tobytes(), None if bounds is None else tuple(bounds))
+        if self._index_key != key:
+            self._index = DisplayIndex(self.x, self.y, matrix, bounds)
+            self._index_key = key
+        return self._index
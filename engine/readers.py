@@ -0,0 +1,149 @@
+import os
+import re
+import wave
+
+import numpy as np
+
+from .ecg_data import HEADER_SUFFIX, load_recording, parse_csv, read_header, recording_sample_rate
+from .lod import UniformAxis
+
+# 扩展名到读取函数的映射，新的文件格式用 @reader('.ext') 注册
+READERS = {}
+# 原始二进制文件的默认数据类型（没有头文件说明时按扩展名确定）
+RAW_DTYPES = {
+    '.i16': 'int16',
+    '.pcm': 'int16',
+    '.f32': 'float32',
+    '.f64': 'float64',
+    '.raw': None,
+    '.bin': None,
+}
+# 原始二进制文件的头文件：与数据文件同名，加上该后缀
+RAW_HEADER_SUFFIX = HEADER_SUFFIX
+# engine.writers 导出的 CSV 的列名：时间轴、信号
+CSV_COLUMNS = ('x', 'y')
+
+
+class SignalFile:
+    # 读取结果：一维数据（大文件为内存映射，只在访问时读取）、采样率（未知时为 None）和文件路径
+    def __init__(self, data, sample_rate=None, path=None):
+        self.data = data
+        self.sample_rate = sample_rate
+        self.path = path
+
+    def __len__(self):
+        return len(self.data)
+
+    def axis(self):
+        # 时间轴（采样率未知时为采样点序号），不实际分配数组
+        step = 1.0 / self.sample_rate if self.sample_rate else 1.0
+        return UniformAxis(len(self.data), step)
+
+
+def reader(*extensions):
+    # 注册读取函数：func(path, **options) -> SignalFile
+    def register(func):
+        for extension in extensions:
+            READERS[extension] = func
+        return func
+    return register
+
+
+def read_signal(path, **options):
+    # 按扩展名选择读取函数
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        func = READERS[extension]
+    except KeyError:
+        raise ValueError(f"不支持的文件类型: {extension or path}") from None
+    return func(path, **options)
+
+
+@reader('.csv', '.txt')
+def read_csv(path, column=None, sample_rate=None, cache=False):
+    # 文本文件：直接解析指定的列，不在用户数据旁边写入文件；column 为 None 时，
+    # 本程序导出的文件（表头为 x、y）读取信号列，其余文件读取第一列
+    # cache=True 时第一列经 .npy 缓存（写在 CSV 旁边）后以内存映射方式打开，再次打开时不需要重新解析
+    if column is None:
+        column = CSV_COLUMNS.index('y') if _csv_columns(path) == CSV_COLUMNS else 0
+    # 采样率没有给出时取自同名头文件（如 bpm60.csv.json），与心电记录相同
+    data = load_recording(path) if cache and column == 0 else parse_csv(path, column)
+    return SignalFile(data, sample_rate or recording_sample_rate(path), path)
+
+
+def _csv_columns(path):
+    # 第一行的各列名称
+    with open(path, encoding='utf-8') as f:
+        first = f.readline()
+    return tuple(name.strip().lower() for name in re.split(r'[,;\t]', first))
+
+
+@reader('.npy')
+def read_npy(path, column=0, sample_rate=None):
+    # .npy 文件以内存映射方式打开；二维数组取其中一列
+    data = np.load(path, mmap_mode='r')
+    if data.ndim == 2:
+        data = data[:, column]
+    elif data.ndim != 1:
+        raise ValueError(f"只支持一维或二维数组，文件中的数组为 {data.ndim} 维")
+    return SignalFile(data, sample_rate, path)
+
+
+# WAV 样本宽度（字节）到数据类型的映射；8 位 WAV 为无符号数
+_WAV_DTYPES = {1: np.uint8, 2: np.dtype('<i2'), 4: np.dtype('<i4')}
+
+
+@reader('.wav')
+def read_wav(path, channel=0):
+    # 用标准库 wave 读取格式信息，数据区以内存映射方式打开；24 位样本不能直接映射，读入后转换
+    # wave 不支持的文件（浮点 WAV、不是 RIFF 格式的文件）报 ValueError
+    with open(path, 'rb') as f:
+        try:
+            w = wave.open(f)
+        except wave.Error as e:
+            raise ValueError(f"无法读取 WAV 文件（只支持整数 PCM）: {e}") from None
+        with w:
+            channels, width, rate, frames = w.getnchannels(), w.getsampwidth(), w.getframerate(), w.getnframes()
+            if channel >= channels:
+                raise ValueError(f"文件只有 {channels} 个声道")
+            if width not in _WAV_DTYPES:
+                raw = np.frombuffer(w.readframes(frames), dtype=np.uint8).reshape(-1, width)
+                # 小端 24 位有符号整数扩展到 32 位
+                samples = np.zeros((len(raw), 4), dtype=np.uint8)
+                samples[:, 1:] = raw
+                data = samples.view('<i4').ravel() >> 8
+                return SignalFile(data.reshape(frames, channels)[:, channel], float(rate), path)
+            # wave 读完文件头后停在数据区的起始位置
+            offset = f.tell()
+    data = np.memmap(path, dtype=_WAV_DTYPES[width], mode='r', offset=offset, shape=(frames, channels))
+    return SignalFile(data[:, channel], float(rate), path)
+
+
+def raw_header(path):
+    # 读取原始二进制文件的头文件（如 signal.bin.json），没有时返回空字典
+    # 头文件内容示例：{"dtype": "int16", "offset": 512, "channels": 2, "sample_rate": 1000}，
+    # scale 为整数样本换算成原始幅值的系数（可选）
+    return read_header(path)
+
+
+@reader(*RAW_DTYPES)
+def read_raw(path, dtype=None, offset=None, channels=None, channel=0, sample_rate=None, byteorder=None):
+    # 原始二进制文件：数据类型、文件头长度（字节）、声道数、采样率和字节序由参数或头文件给出，
+    # 按交错存放的多声道数据以内存映射方式打开
+    header = raw_header(path)
+    dtype = dtype or header.get('dtype') or RAW_DTYPES[os.path.splitext(path)[1].lower()]
+    if dtype is None:
+        raise ValueError(f"未知的数据类型：请在 {os.path.basename(path) + RAW_HEADER_SUFFIX} 中给出 dtype，"
+                         f"如 {{\"dtype\": \"int16\", \"sample_rate\": 1000}}")
+    dtype = np.dtype(dtype).newbyteorder(byteorder or header.get('byteorder', '='))
+    offset = int(offset if offset is not None else header.get('offset', 0))
+    channels = int(channels or header.get('channels', 1))
+    if channel >= channels:
+        raise ValueError(f"文件只有 {channels} 个声道")
+    frames = (os.path.getsize(path) - offset) // (dtype.itemsize * channels)
+    data = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(frames, channels))[:, channel]
+    if 'scale' in header:
+        # 由浮点数据缩放成整数导出的文件（见 engine.writers.write_raw）还原为原来的幅值，需要读入内存
+        data = np.multiply(data, header['scale'], dtype=np.float32)
+    rate = sample_rate or header.get('sample_rate')
+    return SignalFile(data, float(rate) if rate else None, path)
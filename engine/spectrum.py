@@ -0,0 +1,170 @@
+import functools
+
+import numpy as np
+
+from .playback import RingBuffer
+
+# 支持的窗函数
+WINDOWS = ('rectangular', 'hann', 'hamming', 'blackman')
+# Welch 方法每批处理的分段数，限制临时内存
+WELCH_BATCH = 64
+# 长度不超过该值的窗函数和频率轴（Welch、频谱图的分段）各缓存最近 32 个；
+# 更长的（整段信号的幅度谱，可达 10^7 点）只保留最近一个，缓存不会长期占用大量内存
+SPECTRUM_CACHE_LIMIT = 1 << 16
+
+
+def _size_limited_cache(index):
+    # 按第 index 个参数（长度）分成两个 LRU 缓存，被装饰的函数返回只读数组
+    def decorate(func):
+        small = functools.lru_cache(maxsize=32)(func)
+        large = functools.lru_cache(maxsize=1)(func)
+
+        @functools.wraps(func)
+        def cached(*args):
+            return (small if args[index] <= SPECTRUM_CACHE_LIMIT else large)(*args)
+        return cached
+    return decorate
+
+
+@_size_limited_cache(1)
+def get_window(name, n):
+    # 周期窗（DFT-even），按 (名称, 长度) 缓存，返回只读数组
+    if name == 'rectangular':
+        window = np.ones(n)
+    elif name == 'hann':
+        window = np.hanning(n + 1)[:-1]
+    elif name == 'hamming':
+        window = np.hamming(n + 1)[:-1]
+    elif name == 'blackman':
+        window = np.blackman(n + 1)[:-1]
+    else:
+        raise ValueError(f"未知的窗函数: {name}")
+    window.flags.writeable = False
+    return window
+
+
+@functools.lru_cache(maxsize=1024)
+def next_fast_len(n):
+    # 不小于 n 的最小 2^a 3^b 5^c，FFT 在这些长度上最快
+    if n <= 6:
+        return max(n, 1)
+    best = 2 * n
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # 用 2 的幂补足
+            quotient = -(-n // p35)
+            p2 = 1 << (quotient - 1).bit_length()
+            best = min(best, p2 * p35)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+@_size_limited_cache(0)
+def rfft_frequencies(nfft, sample_rate):
+    # 单边频率轴，按 (FFT 长度, 采样率) 缓存
+    freqs = np.fft.rfftfreq(nfft, 1.0 / sample_rate)
+    freqs.flags.writeable = False
+    return freqs
+
+
+def _one_sided(values, nfft):
+    # 单边谱：除直流和奈奎斯特频率外的分量乘 2
+    if nfft % 2 == 0:
+        values[1:-1] *= 2
+    else:
+        values[1:] *= 2
+    return values
+
+
+def amplitude_spectrum(y, sample_rate, window='rectangular', pad=True):
+    # 单边幅度谱，返回 (频率轴, 幅值)；正弦分量的峰值等于其幅值
+    # pad=True 时补零到最近的快速 FFT 长度
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n == 0:
+        return np.empty(0), np.empty(0)
+    w = get_window(window, n)
+    nfft = next_fast_len(n) if pad else n
+    amplitude = np.abs(np.fft.rfft(y * w, nfft))
+    amplitude /= w.sum()
+    return rfft_frequencies(nfft, float(sample_rate)), _one_sided(amplitude, nfft)
+
+
+def welch(y, sample_rate, nperseg=1024, overlap=0.5, window='hann', scaling='density', detrend=True):
+    # Welch 平均周期图：分段（可重叠）加窗后对功率谱取平均，返回 (频率轴, 功率谱)
+    # scaling='density' 为功率谱密度（单位²/Hz），'spectrum' 为功率谱（单位²）
+    # 按批处理分段，y 可以是内存映射数组，内存占用与信号长度无关
+    if scaling not in ('density', 'spectrum'):
+        raise ValueError(f"未知的缩放方式: {scaling}")
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap 必须在 [0, 1) 范围内")
+    n = len(y)
+    if n == 0:
+        return np.empty(0), np.empty(0)
+    nperseg = min(int(nperseg), n)
+    step = max(1, int(round(nperseg * (1 - overlap))))
+    w = get_window(window, nperseg)
+    nfft = next_fast_len(nperseg)
+    starts = np.arange(0, n - nperseg + 1, step)
+    power = np.zeros(nfft // 2 + 1)
+    for b0 in range(0, len(starts), WELCH_BATCH):
+        batch = starts[b0:b0 + WELCH_BATCH]
+        first, last = batch[0], batch[-1] + nperseg
+        block = np.asarray(y[first:last], dtype=np.float64)
+        segments = np.lib.stride_tricks.sliding_window_view(block, nperseg)[batch - first]
+        if detrend:
+            segments = segments - segments.mean(axis=1, keepdims=True)
+        spectra = np.fft.rfft(segments * w, nfft, axis=1)
+        power += (spectra.real ** 2 + spectra.imag ** 2).sum(axis=0)
+    power /= len(starts)
+    if scaling == 'density':
+        power /= float(sample_rate) * (w ** 2).sum()
+    else:
+        power /= w.sum() ** 2
+    return rfft_frequencies(nfft, float(sample_rate)), _one_sided(power, nfft)
+
+
+class StreamingSpectrogram:
+    # 增量短时傅里叶变换：新样本到达时只计算新形成的帧，
+    # 结果（功率谱密度，dB）写入预分配的环形缓冲区，保留最近 history 帧
+    def __init__(self, sample_rate, nperseg=256, hop=None, window='hann', history=200, floor_db=-120.0):
+        self.sample_rate = float(sample_rate)
+        self.nperseg = int(nperseg)
+        self.hop = int(hop) if hop else max(1, self.nperseg // 2)
+        self.window = get_window(window, self.nperseg)
+        self.nfft = next_fast_len(self.nperseg)
+        self.freqs = rfft_frequencies(self.nfft, self.sample_rate)
+        self.history = history
+        self.floor_db = floor_db
+        self.frames = 0  # 累计计算的帧数
+        self._scale = 1.0 / (self.sample_rate * (self.window ** 2).sum())
+        self._ring = RingBuffer(history, item_shape=(len(self.freqs),), fill_value=floor_db)
+        self._tail = np.empty(0)  # 还不足以组成下一帧的样本
+
+    def push(self, samples):
+        # 追加新样本，返回新计算的帧数
+        data = np.concatenate([self._tail, np.asarray(samples, dtype=np.float64)])
+        if len(data) < self.nperseg:
+            self._tail = data
+            return 0
+        count = (len(data) - self.nperseg) // self.hop + 1
+        # 超出 history 的旧帧不会显示，直接跳过
+        first = max(0, count - self.history)
+        starts = np.arange(first, count) * self.hop
+        segments = np.lib.stride_tricks.sliding_window_view(data, self.nperseg)[starts]
+        spectra = np.fft.rfft(segments * self.window, self.nfft, axis=1)
+        power = spectra.real ** 2 + spectra.imag ** 2
+        power *= self._scale
+        _one_sided(power.T, self.nfft)
+        np.maximum(power, 10 ** (self.floor_db / 10), out=power)
+        self._ring.extend(10 * np.log10(power))
+        self._tail = data[count * self.hop:].copy()
+        self.frames += count
+        return count
+
+    def image(self):
+        # 按时间顺序返回 (频率 × 帧) 的图像（只读视图，不复制）
+        return self._ring.view().T
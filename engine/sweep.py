@@ -0,0 +1,119 @@
+import numpy as np
+
+from .generators import SIGNAL_TYPES, _output_dtype
+from .synthesis import group_components, _unit_block
+
+# 参数扫描时每一步临时内存的上限（字节）
+SWEEP_BUDGET = 64 << 20
+
+
+def parameter_grid(**axes):
+    # 参数网格：对每个参数的取值做笛卡尔积，返回 {参数名: 一维数组}，可直接传给 sweep
+    # 例如 parameter_grid(period=[1, 2], amplitude=[1, 2, 3]) 得到 6 组参数
+    names = list(axes)
+    grids = np.meshgrid(*(np.atleast_1d(np.asarray(axes[name], dtype=np.float64)) for name in names),
+                        indexing='ij')
+    return {name: grid.ravel() for name, grid in zip(names, grids)}
+
+
+def _sweep_out(shape, dtype, out, path):
+    # 输出数组：使用给定的 out，或在 path 处创建内存映射的 .npy 文件，否则在内存中分配
+    if out is not None:
+        if out.shape != shape:
+            raise ValueError(f"out 的形状必须为 {shape}")
+        return out
+    if path is not None:
+        return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+    return np.empty(shape, dtype=dtype)
+
+
+def _block_shape(sets, n, itemsize, memory_budget):
+    # 每一步处理的（参数组数 × 点数）块，元素个数不超过内存预算
+    elements = max(1, memory_budget // itemsize)
+    if n >= elements:
+        return 1, elements
+    return min(sets, elements // n), n
+
+
+def _row_blocks(out, n, memory_budget, progress):
+    # 按块遍历输出，内存映射输出每写完一批行就刷新到磁盘，限制脏页占用的内存
+    sets = len(out)
+    rows, cols = _block_shape(sets, n, out.dtype.itemsize, memory_budget)
+    for r0 in range(0, sets, rows):
+        r1 = min(r0 + rows, sets)
+        for c0 in range(0, n, cols):
+            yield r0, r1, c0, min(c0 + cols, n)
+        if isinstance(out, np.memmap):
+            out.flush()
+        if progress is not None:
+            progress(r1 / sets)
+
+
+def sweep(signal_type, x, period, amplitude=1.0, baseline=0.0, phase=0.0, out=None, path=None,
+          memory_budget=SWEEP_BUDGET, progress=None):
+    # 参数扫描：period/amplitude/baseline/phase 可以是标量或数组，广播成 S 组参数后
+    # 一次广播计算出所有波形，返回（S × len(x)）数组，第 i 行对应第 i 组参数
+    # 按内存预算分块写入 out；给出 path 时结果直接写入内存映射的 .npy 文件
+    # progress(完成比例) 在每批行完成后调用，在其中抛出异常可以中止计算
+    if signal_type not in SIGNAL_TYPES:
+        raise ValueError(f"未知的信号类型: {signal_type}")
+    x = np.asarray(x)
+    periods, amplitudes, baselines, phases = (
+        np.ravel(a).astype(np.float64) for a in np.broadcast_arrays(period, amplitude, baseline, phase))
+    n = len(x)
+    out = _sweep_out((len(periods), n), _output_dtype(x), out, path)
+    if out.size == 0:
+        # 没有参数组或没有点时不需要计算
+        return out
+    for r0, r1, c0, c1 in _row_blocks(out, n, memory_budget, progress):
+        # 直接在输出块中原地计算，不需要额外的临时数组
+        block = out[r0:r1, c0:c1]
+        _unit_block(signal_type, x[c0:c1], periods[r0:r1], phases[r0:r1], block)
+        block *= amplitudes[r0:r1, np.newaxis]
+        block += baselines[r0:r1, np.newaxis]
+    return out
+
+
+def _flatten_sets(signal_data_lists, phase_offset):
+    # 把多组分量列表展开成按类型分组的数组 {类型: (所属组号, 周期, 幅值, 相位)}，组号递增排列
+    parts = {}
+    baselines = np.zeros(len(signal_data_lists))
+    for index, signal_data_list in enumerate(signal_data_lists):
+        groups, baselines[index] = group_components(signal_data_list, phase_offset)
+        for signal_type, (periods, amplitudes, phases) in groups.items():
+            parts.setdefault(signal_type, []).append(
+                (np.full(len(periods), index), periods, amplitudes, phases))
+    groups = {signal_type: tuple(np.concatenate(column) for column in zip(*columns))
+              for signal_type, columns in parts.items()}
+    return groups, baselines
+
+
+def sweep_synthesis(signal_data_lists, x, phase_offset=0.0, out=None, path=None,
+                    memory_budget=SWEEP_BUDGET, progress=None):
+    # 对多组 SignalData 列表做合成，返回（组数 × len(x)）数组，第 i 行等于 synthesize(signal_data_lists[i], x)
+    # 所有组中同类型的分量放在一个（分量数 × 点数）块上广播计算，乘以幅值后
+    # 用 np.add.reduceat 按组求和，临时内存不超过 memory_budget
+    x = np.asarray(x)
+    n = len(x)
+    groups, baselines = _flatten_sets(signal_data_lists, phase_offset)
+    out = _sweep_out((len(signal_data_lists), n), _output_dtype(x), out, path)
+    if out.size == 0:
+        return out
+    _, cols = _block_shape(len(out), n, out.dtype.itemsize, memory_budget)
+    comp_step = max(1, memory_budget // out.dtype.itemsize // cols)
+    scratch = np.empty(min(comp_step * cols, comp_step * n), dtype=out.dtype)
+    for r0, r1, c0, c1 in _row_blocks(out, n, memory_budget, progress):
+        view = out[r0:r1, c0:c1]
+        view[:] = baselines[r0:r1, np.newaxis]
+        for signal_type, (owners, periods, amplitudes, phases) in groups.items():
+            lo, hi = np.searchsorted(owners, [r0, r1])
+            for k0 in range(lo, hi, comp_step):
+                k1 = min(k0 + comp_step, hi)
+                block = scratch[:(k1 - k0) * (c1 - c0)].reshape(k1 - k0, c1 - c0)
+                _unit_block(signal_type, x[c0:c1], periods[k0:k1], phases[k0:k1], block)
+                block *= amplitudes[k0:k1, np.newaxis]
+                # 同一组的分量在 owners 中相邻，reduceat 一次求出每组的和
+                rows = owners[k0:k1]
+                starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+                view[rows[starts] - r0] += np.add.reduceat(block, starts, axis=0)
+    return out
@@ -0,0 +1,73 @@
+import numpy as np
+
+from .generators import SIGNAL_TYPES, SINE, TRIANGLE, SAWTOOTH, SQUARE, _prepare_out
+
+# 每个临时块（分量数 × 点数）的元素个数上限，限制合成时的临时内存
+BLOCK_ELEMENTS = 1 << 20
+
+
+def group_components(signal_data_list, phase_offset=0.0):
+    # 按信号类型分组，返回 {类型: (周期, 幅值, 相位) 数组}，以及所有分量基线之和
+    # signal_data_list 中的元素需要有 signal_type/period/amplitude/baseline/phase 属性（如 SignalData）
+    groups = {}
+    baseline = 0.0
+    for data in signal_data_list:
+        signal_type = int(data.signal_type)
+        if signal_type not in SIGNAL_TYPES:
+            raise ValueError(f"未知的信号类型: {signal_type}")
+        groups.setdefault(signal_type, []).append(
+            (float(data.period), float(data.amplitude), float(data.phase) + phase_offset))
+        baseline += float(data.baseline)
+    arrays = {signal_type: tuple(np.array(column) for column in zip(*params))
+              for signal_type, params in groups.items()}
+    return arrays, baseline
+
+
+def _unit_block(signal_type, x, periods, phases, block):
+    # 在 block（分量数 × 点数）中原地计算幅值为 1、基线为 0 的各分量波形
+    np.subtract(x[np.newaxis, :], phases[:, np.newaxis], out=block)
+    if signal_type in (SINE, SQUARE):
+        block *= (2 * np.pi / periods)[:, np.newaxis]
+        np.sin(block, out=block)
+        if signal_type == SQUARE:
+            np.sign(block, out=block)
+    else:
+        np.mod(block, periods[:, np.newaxis], out=block)
+        if signal_type == TRIANGLE:
+            block -= (periods / 2)[:, np.newaxis]
+            np.abs(block, out=block)
+        elif signal_type == SAWTOOTH:
+            block /= periods[:, np.newaxis]
+    return block
+
+
+def synthesize(signal_data_list, x, phase_offset=0.0, out=None, block_elements=BLOCK_ELEMENTS, progress=None):
+    # 合成多个信号分量：同类型的分量在一个（分量数 × 点数）块上广播计算，
+    # 再用幅值向量做一次矩阵乘法完成缩放和求和，直接累加到 out 中；
+    # 按块处理点数和分量，临时内存不超过 block_elements 个元素
+    # phase_offset 会加到每个分量的相位上，用于动态演示
+    # progress(完成比例) 在每块计算完成后调用，可用于显示进度；在其中抛出异常可以中止计算
+    x = np.asarray(x)
+    out = _prepare_out(x, out)
+    groups, baseline = group_components(signal_data_list, phase_offset)
+    # 所有分量的基线是常数，合在一起只加一次
+    out.fill(baseline)
+    n = len(x)
+    total = sum(len(params[0]) for params in groups.values()) * n
+    done = 0
+    for signal_type, (periods, amplitudes, phases) in groups.items():
+        count = len(periods)
+        comp_step = min(count, block_elements)
+        sample_step = max(1, block_elements // comp_step)
+        scratch = np.empty(comp_step * min(sample_step, n), dtype=out.dtype)
+        for c0 in range(0, count, comp_step):
+            c1 = min(c0 + comp_step, count)
+            for s0 in range(0, n, sample_step):
+                s1 = min(s0 + sample_step, n)
+                block = scratch[:(c1 - c0) * (s1 - s0)].reshape(c1 - c0, s1 - s0)
+                _unit_block(signal_type, x[s0:s1], periods[c0:c1], phases[c0:c1], block)
+                out[s0:s1] += amplitudes[c0:c1] @ block
+                if progress is not None:
+                    done += block.size
+                    progress(done / total)
+    return out
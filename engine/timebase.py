@@ -0,0 +1,77 @@
+import numpy as np
+
+# 支持的时间轴数据类型
+DTYPES = (np.float32, np.float64)
+
+
+class TimeBase:
+    # 时间基准：明确给出采样率、点数、起始时间和数据类型，
+    # 时间轴只在第一次使用时生成并缓存，所有生成、频谱分析和导出都应共享同一个对象
+    def __init__(self, sample_rate, num_samples, start=0.0, dtype=np.float64):
+        if sample_rate <= 0:
+            raise ValueError("采样率必须大于 0")
+        if num_samples < 0:
+            raise ValueError("点数不能为负数")
+        dtype = np.dtype(dtype)
+        if dtype not in DTYPES:
+            raise ValueError(f"不支持的数据类型: {dtype}")
+        self.sample_rate = float(sample_rate)
+        self.num_samples = int(num_samples)
+        self.start = float(start)
+        self.dtype = dtype
+        self._axis = None
+
+    @classmethod
+    def from_duration(cls, duration, num_samples, start=0.0, dtype=np.float64, endpoint=True):
+        # 用时长和点数确定采样率；endpoint=True 时与 np.linspace(start, start + duration, num_samples) 相同
+        intervals = num_samples - 1 if endpoint else num_samples
+        if duration <= 0 or intervals <= 0:
+            raise ValueError("时长和点数必须大于 0")
+        return cls(intervals / duration, num_samples, start, dtype)
+
+    @property
+    def dt(self):
+        # 采样间隔
+        return 1.0 / self.sample_rate
+
+    @property
+    def duration(self):
+        # 第一个点到最后一个点之间的时长
+        return max(self.num_samples - 1, 0) * self.dt
+
+    def key(self):
+        # 用于判断两个时间基准是否相同
+        return (self.sample_rate, self.num_samples, self.start, self.dtype.str)
+
+    def __eq__(self, other):
+        return isinstance(other, TimeBase) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return (f'TimeBase(sample_rate={self.sample_rate!r}, num_samples={self.num_samples!r}, '
+                f'start={self.start!r}, dtype={self.dtype.name})')
+
+    def axis(self):
+        # 返回缓存的时间轴（只读），第一次调用时生成
+        if self._axis is None:
+            axis = np.arange(self.num_samples, dtype=self.dtype)
+            axis *= self.dtype.type(self.dt)
+            axis += self.dtype.type(self.start)
+            axis.flags.writeable = False
+            self._axis = axis
+        return self._axis
+
+    def chunks(self, chunk_size):
+        # 逐块生成时间轴，每块最多 chunk_size 个点，数值与 axis() 中对应的部分完全相同；
+        # 用于流式生成和导出很长的信号，不需要分配整个时间轴
+        for i0 in range(0, self.num_samples, chunk_size):
+            chunk = np.arange(i0, min(i0 + chunk_size, self.num_samples), dtype=self.dtype)
+            chunk *= self.dtype.type(self.dt)
+            chunk += self.dtype.type(self.start)
+            yield chunk
+
+    def empty(self):
+        # 分配一个与时间轴长度、类型相同的输出缓冲区
+        return np.empty(self.num_samples, dtype=self.dtype)
@@ -0,0 +1,222 @@
+import json
+import os
+import wave
+
+import numpy as np
+
+from .generators import generate
+from .readers import RAW_DTYPES, RAW_HEADER_SUFFIX, CSV_COLUMNS
+from .synthesis import synthesize
+
+# 导出时每块的点数
+EXPORT_CHUNK = 1 << 16
+# 扩展名到导出函数的映射，新的文件格式用 @writer('.ext') 注册
+WRITERS = {}
+# 16 位 WAV 的满幅值
+WAV_FULL_SCALE = 32767
+
+
+def writer(*extensions):
+    # 注册导出函数：func(f, chunks, path, source, x, sample_rate, num_samples, **options)
+    # f 为已打开的二进制临时文件，chunks 逐块给出 y，path 为目标路径，
+    # source 为传给 export_signal 的原始数据（数组或迭代器）
+    # 需要附带其它文件（如头文件）时用 _write_sidecar 写入临时文件，返回 [(临时文件, 目标路径), ...]，
+    # 由 export_signal 与数据文件一起替换
+    def register(func):
+        for extension in extensions:
+            WRITERS[extension] = func
+        return func
+    return register
+
+
+def iter_chunks(y, chunk_size=EXPORT_CHUNK):
+    # 把数组按块切分（视图，不复制）
+    for i0 in range(0, len(y), chunk_size):
+        yield y[i0:i0 + chunk_size]
+
+
+def generated_chunks(signal_type, timebase, period, amplitude=1.0, baseline=0.0, phase=0.0,
+                     chunk_size=EXPORT_CHUNK):
+    # 逐块生成基本信号，内存占用与总点数无关，结果与 generate(..., timebase.axis()) 相同
+    for x in timebase.chunks(chunk_size):
+        yield generate(signal_type, x, period, amplitude, baseline, phase, out=x)
+
+
+def synthesized_chunks(signal_data_list, timebase, phase_offset=0.0, chunk_size=EXPORT_CHUNK):
+    # 逐块生成合成信号
+    for x in timebase.chunks(chunk_size):
+        yield synthesize(signal_data_list, x, phase_offset, out=np.empty_like(x))
+
+
+def export_signal(path, y, x=None, sample_rate=None, num_samples=None, chunk_size=EXPORT_CHUNK,
+                  progress=None, **options):
+    # 按扩展名导出信号，y 可以是数组，也可以是逐块给出数据的迭代器（如 generated_chunks）
+    # x 只用于 CSV 的第一列，可以是数组或 UniformAxis；不给出时按 sample_rate 计算时间，或使用序号
+    # 迭代器的总点数由 num_samples 给出（.npy 需要，并用于进度汇报）
+    # 先写入临时文件，完成后再替换目标文件，中途失败或取消时不会留下不完整的文件
+    # progress(完成比例) 在每块写入后调用，在其中抛出异常可以中止导出
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        func = WRITERS[extension]
+    except KeyError:
+        raise ValueError(f"不支持的导出格式: {extension or path}") from None
+    if hasattr(y, '__len__'):
+        num_samples = len(y)
+        chunks = iter_chunks(y, chunk_size)
+    else:
+        chunks = iter(y)
+    if progress is not None and num_samples:
+        chunks = _report(chunks, num_samples, progress)
+    tmp_path = path + '.part'
+    sidecars = []
+    try:
+        with open(tmp_path, 'wb') as f:
+            sidecars = func(f, chunks, path=path, source=y, x=x, sample_rate=sample_rate, num_samples=num_samples,
+                            **options) or []
+        for sidecar_tmp, sidecar_path in sidecars:
+            os.replace(sidecar_tmp, sidecar_path)
+        os.replace(tmp_path, path)
+    finally:
+        for name in [tmp_path] + [sidecar_tmp for sidecar_tmp, _ in sidecars]:
+            if os.path.exists(name):
+                os.remove(name)
+    return path
+
+
+def _write_sidecar(path, text):
+    # 把附带文件写入临时文件 <path>.part，返回 (临时文件, 目标路径)
+    tmp_path = path + '.part'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return tmp_path, path
+
+
+def _report(chunks, num_samples, progress):
+    done = 0
+    for chunk in chunks:
+        yield chunk
+        done += len(chunk)
+        progress(min(done / num_samples, 1.0))
+
+
+def _output_dtype(chunks, dtype):
+    # 取出第一块确定数据类型，返回 (类型, 包含第一块的迭代器)
+    first = next(chunks, None)
+    if first is None:
+        return np.dtype(dtype or np.float64), iter(())
+    return np.dtype(dtype or np.asarray(first).dtype), _prepend(first, chunks)
+
+
+def _prepend(first, chunks):
+    yield first
+    yield from chunks
+
+
+@writer('.npy')
+def write_npy(f, chunks, path, source, x=None, sample_rate=None, num_samples=None, dtype=None):
+    # 先写 .npy 文件头，再逐块追加数据；总点数必须事先知道
+    if num_samples is None:
+        raise ValueError("导出 .npy 需要给出 num_samples")
+    dtype, chunks = _output_dtype(chunks, dtype)
+    np.lib.format.write_array_header_1_0(f, {'descr': np.lib.format.dtype_to_descr(dtype),
+                                             'fortran_order': False, 'shape': (num_samples,)})
+    written = 0
+    for chunk in chunks:
+        f.write(np.ascontiguousarray(chunk, dtype=dtype).data)
+        written += len(chunk)
+    if written != num_samples:
+        raise ValueError(f"数据点数 {written} 与 num_samples={num_samples} 不一致")
+
+
+@writer(*RAW_DTYPES)
+def write_raw(f, chunks, path, source, x=None, sample_rate=None, num_samples=None, dtype=None, peak=None):
+    # 原始二进制：数据类型由 dtype 或扩展名（.i16/.f32/.f64）确定，默认 float32，
+    # 同时写出 engine.readers 能够读取的同名 .json 头文件
+    # 浮点数据导出为整数类型时与 WAV 相同：幅值 peak 对应满幅（默认同 write_wav），四舍五入，超出部分截断，
+    # 换算系数记录在头文件的 scale 中
+    dtype = np.dtype(dtype or RAW_DTYPES[os.path.splitext(path)[1].lower()] or np.float32)
+    source_dtype, chunks = _output_dtype(chunks, None)
+    header = {'dtype': dtype.name, 'offset': 0, 'channels': 1}
+    if dtype.kind in 'iu' and source_dtype.kind == 'f':
+        if peak is None:
+            peak = _peak(source) if hasattr(source, '__len__') else 1.0
+        info = np.iinfo(dtype)
+        full_scale = min(info.max, -info.min) if dtype.kind == 'i' else info.max
+        scale = full_scale / (peak or 1.0)
+        header['scale'] = 1.0 / scale
+        for chunk in chunks:
+            samples = np.multiply(chunk, scale, dtype=np.float64)
+            np.clip(samples, info.min, info.max, out=samples)
+            f.write(np.rint(samples).astype(dtype).data)
+    else:
+        for chunk in chunks:
+            f.write(np.ascontiguousarray(chunk, dtype=dtype).data)
+    if sample_rate:
+        header['sample_rate'] = sample_rate
+    return [_write_sidecar(path + RAW_HEADER_SUFFIX, json.dumps(header))]
+
+
+@writer('.wav')
+def write_wav(f, chunks, path, source, x=None, sample_rate=None, num_samples=None, peak=None):
+    # 16 位单声道 PCM：幅值 peak 对应满幅，超出部分截断；
+    # 数组输入时 peak 默认为最大绝对值，迭代器输入时默认为 1
+    if not sample_rate:
+        raise ValueError("导出 WAV 需要给出采样率")
+    if peak is None:
+        peak = _peak(source) if hasattr(source, '__len__') else 1.0
+    scale = WAV_FULL_SCALE / (peak or 1.0)
+    with wave.open(f, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(int(round(sample_rate)))
+        if num_samples:
+            w.setnframes(num_samples)
+        for chunk in chunks:
+            samples = np.multiply(chunk, scale, dtype=np.float64)
+            np.clip(samples, -WAV_FULL_SCALE, WAV_FULL_SCALE, out=samples)
+            w.writeframesraw(np.rint(samples).astype('<i2').tobytes())
+
+
+def _peak(y):
+    # 逐块求最大绝对值，内存映射的数据不会被整体读入
+    return max((float(np.abs(chunk).max()) for chunk in iter_chunks(y) if len(chunk)), default=0.0)
+
+
+def _number_format(dtype):
+    # 能够精确还原数值的最短固定格式：float64 需要 17 位有效数字，float32 需要 9 位
+    dtype = np.dtype(dtype)
+    if dtype.kind in 'iub':
+        return '%d'
+    return '%.9g' if dtype.itemsize <= 4 else '%.17g'
+
+
+@writer('.csv', '.txt')
+def write_csv(f, chunks, path, source, x=None, sample_rate=None, num_samples=None, fmt=None,
+              delimiter=',', header=None):
+    # 两列 x、y 的文本文件（表头默认为 x、y，engine.readers.read_csv 据此读取 y 列，header='' 时不写表头）；
+    # 每块数据只做一次字符串格式化，比 np.savetxt 的逐行格式化快数倍
+    if header is None:
+        header = delimiter.join(CSV_COLUMNS)
+    if header:
+        f.write((header + '\n').encode('utf-8'))
+    position = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        n = len(chunk)
+        if x is not None:
+            xs = np.asarray(x[position:position + n])
+        elif sample_rate:
+            xs = np.arange(position, position + n) / sample_rate
+        else:
+            xs = np.arange(position, position + n)
+        values = [None] * (2 * n)
+        values[0::2] = xs.tolist()
+        values[1::2] = chunk.tolist()
+        row = (fmt or _number_format(xs.dtype)) + delimiter + (fmt or _number_format(chunk.dtype)) + '\n'
+        f.write(((row * n) % tuple(values)).encode('ascii'))
+        position += n
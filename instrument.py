@@ -0,0 +1,167 @@
+# 性能统计：记录热点函数的耗时，给出最近若干次调用的 p50/p95/p99
+# 不依赖 PyQt5，界面线程和后台线程中都可以使用；统计关闭时被统计的函数只多一次属性判断
+# 环境变量：
+#   SIGVIS_STATS=1             启动时开启耗时统计并显示统计面板
+#   SIGVIS_PROFILE=文件.prof   整个会话在界面线程上运行 cProfile，退出时写入文件（python -m pstats 查看）
+#   SIGVIS_TRACE=文件.json     记录每次被统计函数的调用区间（含后台线程），退出时写成 Chrome trace 格式，
+#                              可在 chrome://tracing 或 Perfetto 中打开
+import atexit
+import collections
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# 每个统计项保留的最近调用次数
+HISTORY = 1024
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyStats:
+    # 一个统计项最近 history 次调用耗时的滚动窗口
+    def __init__(self, history=HISTORY):
+        self.samples = collections.deque(maxlen=history)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        # 返回调用次数、最近一次耗时以及滚动窗口内的百分位耗时（毫秒）
+        samples = np.array(self.samples) * 1000
+        result = {'count': self.count, 'last': samples[-1] if len(samples) else 0.0,
+                  'mean': self.total * 1000 / max(self.count, 1)}
+        for q, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES) if len(samples) else [0.0] * 3):
+            result[f'p{q}'] = value
+        return result
+
+
+class _Timer:
+    # with registry.timer(名称): 统计代码块的耗时
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.record(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    # 统计关闭时使用的空计时器
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Registry:
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        # 开启跟踪时记录 (名称, 开始时间, 耗时, 线程号)
+        self.events = None
+        self._lock = threading.Lock()
+
+    def record(self, name, start, seconds):
+        stats = self.stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.setdefault(name, LatencyStats())
+        stats.add(seconds)
+        if self.events is not None:
+            self.events.append((name, start, seconds, threading.get_ident()))
+
+    def timed(self, name=None):
+        # 装饰器：@timed 或 @timed('名称')，默认以函数的限定名作为统计项名称
+        if callable(name):
+            return self.timed()(name)
+
+        def decorate(func):
+            label = name or func.__qualname__
+            code = getattr(func, '__code__', None)
+            # 直接连接到 Qt 信号的函数，PyQt 会丢弃多出的信号参数；包装后由这里丢弃
+            limit = None if code is None or code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if limit is not None:
+                    args = args[:limit]
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, start, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def timer(self, name):
+        return _Timer(self, name) if self.enabled else _NULL_TIMER
+
+    def summary(self):
+        # {名称: 统计结果}，按名称排序
+        with self._lock:
+            items = sorted(self.stats.items())
+        return {name: stats.summary() for name, stats in items}
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+
+    def start_trace(self):
+        self.events = collections.deque()
+
+    def write_trace(self, path):
+        # Chrome trace 格式：每次调用是一个完整事件（ph='X'），时间单位为微秒
+        events = [{'name': name, 'ph': 'X', 'ts': start * 1e6, 'dur': seconds * 1e6,
+                   'pid': os.getpid(), 'tid': tid}
+                  for name, start, seconds, tid in list(self.events or ())]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+registry = Registry()
+timed = registry.timed
+timer = registry.timer
+
+
+def configure_from_env(environ=os.environ):
+    # 按环境变量开启统计、cProfile 和调用跟踪，结果在程序退出时写入文件
+    if environ.get('SIGVIS_STATS'):
+        registry.enabled = True
+    trace_path = environ.get('SIGVIS_TRACE')
+    if trace_path:
+        registry.enabled = True
+        registry.start_trace()
+        atexit.register(registry.write_trace, trace_path)
+    profile_path = environ.get('SIGVIS_PROFILE')
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def dump():
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+        atexit.register(dump)
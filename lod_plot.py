@@ -0,0 +1,77 @@
+import numpy as np
+
+from engine.lod import MinMaxPyramid, minmax_decimate, preview_minmax
+
+
+class LodView:
+    # 大数据量曲线的分级显示：为当前曲线维护极值金字塔，
+    # 坐标轴范围（放大、缩小、平移）或画布大小改变时，只按可见范围和像素宽度重新抽取约 2 倍宽度个点
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.ax = None
+        self.line = None
+        self.pyramid = None
+        # 当前曲线的全分辨率 x（预览期间金字塔还没有建好）
+        self.x = None
+        self.canvas.mpl_connect('resize_event', self._on_change)
+
+    def buckets(self):
+        # 每个像素列一个桶
+        return max(1, int(self.ax.bbox.width)) if self.ax is not None else 1
+
+    def plot(self, ax, x, y, **kwargs):
+        # 绘制曲线并接管其数据，返回 Line2D
+        # ax.clear() 会清除坐标轴上的回调，所以每次绘图都重新连接
+        self.ax = ax
+        self.x = x
+        self.pyramid = MinMaxPyramid(x, y)
+        xs, ys = self._query_full()
+        self.line, = ax.plot(xs, ys, **kwargs)
+        ax.callbacks.connect('xlim_changed', self._on_change)
+        return self.line
+
+    def plot_preview(self, ax, x, y, **kwargs):
+        # 很长的信号先只显示快速预览，金字塔在后台建好后调用 set_pyramid 换成完整的分级显示
+        self.ax = ax
+        self.x = x
+        self.pyramid = None
+        self.line, = ax.plot(*preview_minmax(x, y, self.buckets()), **kwargs)
+        ax.callbacks.connect('xlim_changed', self._on_change)
+        return self.line
+
+    def set_pyramid(self, pyramid):
+        self.pyramid = pyramid
+        self.refresh()
+
+    def set_data(self, x, y):
+        # 替换 x 和 y（如周期改变之后）
+        self.x = x
+        self.pyramid = MinMaxPyramid(x, y)
+        self.refresh()
+
+    def set_ydata(self, y):
+        # x 不变，只替换 y（如加噪声、滤波之后）
+        # 预览期间金字塔还没有建好，使用保存的全分辨率 x
+        self.pyramid = MinMaxPyramid(self.x, np.asarray(y))
+        self.refresh()
+
+    def refresh(self):
+        # 按当前可见范围重新抽取曲线数据
+        if self.line is None or self.pyramid is None:
+            return
+        x0, x1 = self.ax.get_xlim()
+        self.line.set_data(*self.pyramid.query(x0, x1, self.buckets()))
+
+    def decimate(self, y):
+        # 动态演示中 y 每帧都在变化，不建金字塔，直接对可见范围抽取
+        x0, x1 = self.ax.get_xlim()
+        return minmax_decimate(self.x, y, x0, x1, self.buckets())
+
+    def _query_full(self):
+        x = self.pyramid.x
+        if len(x) == 0:
+            return x, self.pyramid.y
+        return self.pyramid.query(x[0], x[-1], self.buckets())
+
+    def _on_change(self, event):
+        self.refresh()
@@ -1,15 +1,28 @@
+import os
 import sys
-import csv
+import time
+import functools
 import numpy as np
-from PyQt5.QtWidgets import QApplication, QMainWindow,QMessageBox,QFileDialog
+from PyQt5.QtWidgets import QApplication, QMainWindow,QMessageBox,QFileDialog,QProgressBar
+from PyQt5.QtGui import QGuiApplication
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from PyQt5.QtCore import QTimer,Qt
 from signalGenerator import Ui_MainWindow  # 导入 signalGenerator.py 中的 Ui_MainWindow 界面类
-from child_window1 import SignalSynthesisDialog
-from child_window2 import SpectrumDialog
+from realtime_plot import BlitRenderer, FpsCounter
+from lod_plot import LodView
+from crosshair import Crosshair
+from tasks import TaskRunner
+import engine
+import instrument
+# 子窗口（合成、频谱、频谱图）在第一次打开时才导入，缩短程序启动时间
 
 class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_MainWindow界面类
+    # “数据类型”下拉框各项对应的样本数据类型
+    SAMPLE_DTYPES = (np.float64, np.float32)
+    # “滤波方式”下拉框各项对应的滤波方式
+    FILTER_MODES = ('butterworth', 'mean', 'median', 'ema')
+
     def __init__(self, parent=None):
         super(MyMainWindow, self).__init__(parent)  # 初始化父类
         self.setupUi(self)  # 继承 Ui_MainWindow 界面类
@@ -19,6 +32,22 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
         self.canvas = FigureCanvas(self.fig)
         self.verticalLayout1.addWidget(self.canvas)
         self.ax = self.fig.add_subplot(111)
+        # 动态演示使用的实时绘图器和帧率计数器
+        self.renderer = BlitRenderer(self.canvas, self.ax)
+        self.fps_counter = FpsCounter()
+        # 按可见范围和像素宽度抽取极值点绘图，重绘耗时与信号长度无关
+        self.lod = LodView(self.canvas)
+        # 悬停十字光标和点击取值，查询全分辨率数据，与信号长度基本无关
+        self.crosshair = Crosshair(self.canvas, self.ax, self.point_data)
+        # 后台计算，数据量大时生成、加噪声、滤波、频谱计算不阻塞界面
+        self.tasks = TaskRunner(parent=self)
+        self.tasks.busyChanged.connect(self.on_busy_changed)
+        self.tasks.progressChanged.connect(self.on_task_progress)
+        # 状态栏中的忙碌/进度指示
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setMaximumWidth(160)
+        self.busy_bar.setVisible(False)
+        self.statusbar.addPermanentWidget(self.busy_bar)
 
         # 连接信号与槽
         self.connect_signals_slots()
@@ -38,6 +67,9 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
         self.signalBaseline.editingFinished.connect(self.check_parameter)  # 信号基线
         self.signalPeriod.editingFinished.connect(self.check_parameter)  # 信号周期
         self.signalPhase.editingFinished.connect(self.check_parameter)  # 信号相位
+        self.sampleCount.editingFinished.connect(self.check_parameter)  # 采样点数
+        self.sampleDtype.currentIndexChanged.connect(self.check_parameter)  # 样本数据类型
+        self.filterMode.currentIndexChanged.connect(self.filter_mode_changed)  # 滤波方式
 
         # 点击放大缩小按钮连接波形放大缩小的函数
         self.zoomin_Button.clicked.connect(self.zoomin_update)  # 波形放大
@@ -61,8 +93,16 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
         self.ecg_valueSlider.valueChanged.connect(self.check_signalType)
 
         # 点击菜单栏触发的动作信号连接相应功能的函数
+        self.actionOpen.triggered.connect(self.open_file)
         self.actionSave.triggered.connect(self.save_figure)
+        self.actionExport.triggered.connect(self.export_data)
         self.actionInstruct.triggered.connect(self.show_help)
+        self.actionSpectrogram.triggered.connect(self.open_child_window3)
+        self.actionStats.triggered.connect(self.toggle_stats)
+        self.actionUndo.triggered.connect(self.undo_step)
+        self.actionRedo.triggered.connect(self.redo_step)
+        self.actionOriginal.triggered.connect(self.show_original)
+        self.actionClearSteps.triggered.connect(self.clear_steps)
 
     def init_signal_parameters(self):
         # 初始化信号参数
@@ -70,8 +110,21 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
         self.baseline = float(self.signalBaseline.text())  # 基线
         self.period = float(self.signalPeriod.text())  # 周期
         self.phase = float(self.signalPhase.text())  # 相位（以周期为单位）
-        self.x = np.linspace(0, 10 * self.period, 1000)  # 生成0到10 * self.period之间的1000个等间距点
-        self.y = None
+        # 时间基准：sample_count 个等间距点覆盖 10 个周期，所有生成、频谱分析共用
+        self.sample_count = int(self.sampleCount.text())  # 采样点数
+        self.sample_dtype = self.SAMPLE_DTYPES[self.sampleDtype.currentIndex()]  # 样本数据类型，大数据量时可选 float32 节省内存
+        self.timebase = None
+        self.update_timebase()
+        # 缓存波形计算的中间结果，修改参数时只重新计算受影响的部分
+        self.incremental = engine.IncrementalGenerator()
+        self.async_threshold = 200000  # 点数不少于该值时在后台计算
+        self.y = None  # 当前显示的信号（应用处理步骤之后）
+        # 非破坏式处理：加噪声、滤波作为步骤记录在处理历史中，原始信号保持不变，
+        # 各步骤的输出按上游参数缓存，撤销、停用或修改某一步时只重新计算其下游
+        self.history = engine.ProcessingHistory()
+        self.clean_frame = None  # 动态演示中当前帧的原始信号
+        self.frame_index = 0  # 动态演示的帧序号，逐帧处理时每帧的噪声不同
+        self.update_history_actions()
 
         # 初始化文本对象（一开始不显示）
         self.click_text = None
@@ -80,8 +133,17 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
         # 初始化动态演示使能参数
         self.dynamic_enable = False
         self.noise_scale = 0.1  # 噪声强度
+        # 以下三项在添加噪声时从“功能设置”中的噪声类型、信噪比、随机种子读取（read_noise_parameters）
+        self.noise_type = 'white'  # 噪声类型：'white' 白噪声，'pink' 粉红噪声，'brown' 布朗噪声，'impulse' 脉冲噪声，'hum' 工频干扰
+        self.noise_snr = None  # 信噪比（dB），不为 None 时按信噪比确定噪声强度，忽略 noise_scale
+        self.noise_seed = None  # 随机种子，固定后每次运行添加的噪声序列相同
+        self.noise_rng = np.random.default_rng(self.noise_seed)
         self.apply_filter = True  # 是否应用滤波
+        # 以下四项在进行滤波时从“功能设置”中的滤波方式、截止频率、阶数/窗口大小读取（read_filter_parameters）
         self.filter_size = 5  # 滤波器大小
+        self.filter_mode = 'butterworth'  # 滤波方式：'butterworth'，或平滑滤波 'mean' 移动平均，'median' 中值，'ema' 指数移动平均
+        self.filter_order = 4  # Butterworth 滤波器阶数
+        self.filter_cutoff = 0.1  # Butterworth 截止频率（相对于奈奎斯特频率）
 
         # 合成信号使能参数
         self.synthesis_enable = False
@@ -93,6 +155,26 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
         self.ecg_valueSlider.setMaximum(7)  # 设置最大值
         self.ecg_valueSlider.setSingleStep(1)  # 设置步长 0 30 60 80 90 120 150 300
 
+        # 心电记录数据集，CSV 只在第一次读取时解析，之后从二进制缓存读取
+        self.ecg_dataset = engine.EcgDataset()
+        self.ecg_window = 2000  # 心电波形显示的点数
+        # 当前心电记录的采样率（每秒点数），也是动态演示的回放速率；读取记录时从其头文件更新，未知时为 500
+        self.ecg_sample_rate = engine.ECG_SAMPLE_RATE
+        self.playback = None
+        # 心电分析：每条记录的 R 波位置（按心率值缓存），动态演示中的流式 R 波检测器和当前窗口内的 R 波
+        self.ecg_peaks = {}
+        self.qrs_detector = None
+        self.stream_peaks = np.empty(0, dtype=np.int64)
+        self.peak_markers = None
+
+        # 实时频谱图窗口（第一次打开时创建）
+        self.spectrogram_dialog = None
+        # 性能统计面板（第一次打开时创建）
+        self.stats_dock = None
+        # 通过“文件 → 打开”导入的信号（engine.SignalFile），重新生成波形后清除
+        self.imported = None
+        self.stream_pending = 0.0  # 动态演示中不足一个点的平移量（以点数计）
+
         # 滑动条值的映射字典
         self.value_mapping = {
             1: 30,
@@ -104,9 +186,21 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
             7: 300
         }
 
+    def update_timebase(self):
+        # 只有点数、时长或数据类型改变时才重新生成时间轴，修改幅值、基线、相位时复用缓存的时间轴
+        # 不含终点：时间轴正好覆盖 10 个整周期，只修改相位时波形可以由循环移位得到（见 IncrementalGenerator）
+        timebase = engine.TimeBase.from_duration(10 * abs(self.period), self.sample_count, dtype=self.sample_dtype,
+                                                 endpoint=False)
+        if timebase != self.timebase:
+            self.timebase = timebase
+        self.x = self.timebase.axis()
+
+    @instrument.timed
     def check_signalType(self):
+        self.imported = None
         # 清除之前的图形
-        self.ax.clear()
+        with instrument.timer('ax.clear'):
+            self.ax.clear()
         # 检查基本信号复选框是否被选中
         if self.basic_signal.isChecked():
             if not self.synthesis_enable:
@@ -125,18 +219,26 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
         if self.ecg_signal.isChecked():
             self.plot_ecg()
 
+    @instrument.timed
     def check_parameter(self):
         try:
-            # 清除旧的图形
-            self.ax.clear()
             self.amplitude = float(self.signalAmplitude.text())  # 幅值
             self.baseline = float(self.signalBaseline.text())  # 基线
             self.period = float(self.signalPeriod.text())  # 周期
             if self.period == 0:
                 raise ValueError("周期不能为零")
             self.phase = float(self.signalPhase.text())  # 相位（以周期为单位）
+            self.sample_count = int(self.sampleCount.text())  # 采样点数
+            if self.sample_count < 2:
+                raise ValueError("点数至少为 2")
+            self.sample_dtype = self.SAMPLE_DTYPES[self.sampleDtype.currentIndex()]
+            # 周期、点数或数据类型改变时更新时间轴
+            self.update_timebase()
             # 生成新的波形
-            self.check_signalType()
+            if self.can_update_in_place():
+                self.update_basic_plot()
+            else:
+                self.check_signalType()
         except ValueError as e:
             # 创建一个 QMessageBox 实例
             msgBox = QMessageBox()
@@ -145,6 +247,8 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
             if "周期不能为零" in str(e):
                 # 如果异常消息包含“周期不能为零”，则设置特定的错误消息
                 msgBox.setText("请输入一个非零的有效数字！")
+            elif "点数至少为 2" in str(e):
+                msgBox.setText("采样点数请输入不小于 2 的整数！")
             else:
                 # 对于其他类型的ValueError，使用通用错误消息
                 msgBox.setText("请输入一个有效数字！")
@@ -153,121 +257,165 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
             # 显示消息框，并等待用户响应
             msgBox.exec_()
 
+    def can_update_in_place(self):
+        # 当前显示的是基本信号时，修改参数只需更新曲线数据，不必清除坐标轴重新绘图
+        return (self.basic_signal.isChecked() and not self.synthesis_enable
+                and self.y is not None and getattr(self, 'line', None) in self.ax.lines)
+
+    @instrument.timed
+    def update_basic_plot(self):
+        # 只重新计算受参数修改影响的阶段，并原地更新曲线
+        self.run_task('signal', len(self.x), self.basic_signal_task(),
+                      on_done=functools.partial(self.apply_basic_signal, self.x))
+
+    def apply_basic_signal(self, x, y):
+        self.set_source(y)
+        if not self.dynamic_enable:
+            # 周期改变后时间轴的范围也变了，先把横轴设为新的范围，曲线才会按完整的时间轴抽取
+            self.ax.set_xlim(x[0], x[-1])
+            self.ax.set_autoscalex_on(True)
+        self.lod.set_data(x, self.y)
+        if not self.dynamic_enable:
+            # 调整坐标轴范围以适应数据
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw_idle()
+            self.reprocess()
+
+    @instrument.timed
     def plot_sin(self):
-        # 计算正弦波
-        self.y = self.amplitude * np.sin(2 * np.pi * (self.x - self.phase) / self.period) + self.baseline
-        # 清除之前的图形
-        self.ax.clear()
-        # 绘制图形
-        self.line, = self.ax.plot(self.x, self.y)
-        # 设置坐标轴标签和标题
-        self.ax.set_xlabel('x')
-        self.ax.set_ylabel('Sine Wave')
-        self.ax.set_title('Sine Wave Plot')
-        # 显示网格
-        self.ax.grid(True)
-        # 调整坐标轴范围以适应数据
-        self.ax.relim()
-        self.ax.autoscale_view()
-         # 刷新画布
-        self.canvas.draw()
+        # 计算正弦波，完成后绘制
+        self.run_task('signal', len(self.x),
+                      functools.partial(self.incremental.generate, engine.SINE, self.timebase,
+                                        self.period, self.amplitude, self.baseline, self.phase),
+                      on_done=functools.partial(self.draw_wave, self.x, 'Sine Wave', 'Sine Wave Plot'))
 
+    @instrument.timed
     def plot_triangle(self):
-        # 考虑相位偏移# 将 x_shifted 映射到 [0, period) 以确保周期性# 计算三角波
-        x_shifted = self.x - self.phase
-        x_wrapped = np.mod(x_shifted, self.period)
-        self.y = self.amplitude * np.abs(x_wrapped - self.period / 2) + self.baseline
-        # 清除之前的图形
-        self.ax.clear()
-        # 绘制三角波
-        self.line, = self.ax.plot(self.x, self.y)
-        # 设置坐标轴标签和标题
-        self.ax.set_xlabel('x')
-        self.ax.set_ylabel('Triangle Wave')
-        self.ax.set_title('Triangle Wave Plot')
-        # 显示网格
-        self.ax.grid(True)
-        # 调整坐标轴范围以适应数据
-        self.ax.relim()
-        self.ax.autoscale_view()
-        # 更新画布以显示图形
-        self.canvas.draw()
+        # 计算三角波，完成后绘制
+        self.run_task('signal', len(self.x),
+                      functools.partial(self.incremental.generate, engine.TRIANGLE, self.timebase,
+                                        self.period, self.amplitude, self.baseline, self.phase),
+                      on_done=functools.partial(self.draw_wave, self.x, 'Triangle Wave', 'Triangle Wave Plot'))
 
+    @instrument.timed
     def plot_sawtooth(self):
-        # 计算锯齿波
-        x_shifted = self.x - self.phase
-        x_wrapped = np.mod(x_shifted, self.period)
-        self.y = self.baseline + self.amplitude * x_wrapped / self.period
-        # 清除之前的图形
-        self.ax.clear()
-        # 绘制三角波
-        self.line, = self.ax.plot(self.x, self.y)
-        # 设置坐标轴标签和标题
-        self.ax.set_xlabel('x')
-        self.ax.set_ylabel('Sawtooth Wave')
-        self.ax.set_title('Sawtooth Wave Plot')
-        # 显示网格
-        self.ax.grid(True)
-        # 调整坐标轴范围以适应数据
-        self.ax.relim()
-        self.ax.autoscale_view()
-        # 更新画布以显示图形
-        self.canvas.draw()
+        # 计算锯齿波，完成后绘制
+        self.run_task('signal', len(self.x),
+                      functools.partial(self.incremental.generate, engine.SAWTOOTH, self.timebase,
+                                        self.period, self.amplitude, self.baseline, self.phase),
+                      on_done=functools.partial(self.draw_wave, self.x, 'Sawtooth Wave', 'Sawtooth Wave Plot'))
 
+    @instrument.timed
     def plot_square(self):
-        #计算方波
-        x_shifted = self.x - self.phase
-        self.y=self.baseline + self.amplitude * np.sign(np.sin(2 * np.pi * x_shifted / self.period))
+        # 计算方波，完成后绘制
+        self.run_task('signal', len(self.x),
+                      functools.partial(self.incremental.generate, engine.SQUARE, self.timebase,
+                                        self.period, self.amplitude, self.baseline, self.phase),
+                      on_done=functools.partial(self.draw_wave, self.x, 'Square Wave', 'Square Wave Plot'))
+
+    @instrument.timed
+    def draw_wave(self, x, ylabel, title, y):
+        self.set_source(y)
         # 清除之前的图形
-        self.ax.clear()
-        # 绘制方波
-        self.line, = self.ax.plot(self.x, self.y)
+        with instrument.timer('ax.clear'):
+            self.ax.clear()
+        # 绘制图形
+        self.line = self.lod.plot(self.ax, x, self.y)
         # 设置坐标轴标签和标题
         self.ax.set_xlabel('x')
-        self.ax.set_ylabel('Square Wave')
-        self.ax.set_title('Square Wave Plot')
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_title(title)
         # 显示网格
         self.ax.grid(True)
         # 调整坐标轴范围以适应数据
         self.ax.relim()
         self.ax.autoscale_view()
         # 更新画布以显示图形
-        self.canvas.draw()
+        with instrument.timer('canvas.draw'):
+            self.canvas.draw()
+        self.after_plot()
+
+    def after_plot(self):
+        # 已有处理步骤时对新的原始信号重新应用
+        self.reprocess()
+        # 动态演示过程中重新绘图后，需要让实时绘图器接管新的曲线
+        if self.dynamic_enable:
+            if self.ecg_signal.isChecked():
+                self.playback = self.create_ecg_playback()
+            self.renderer.start(self.line, self.overlay_artists())
 
+    def overlay_artists(self):
+        # 动态演示中需要随曲线一起逐帧重绘的标注（心电 R 波标记）
+        if self.ecg_signal.isChecked() and self.peak_markers in self.ax.lines:
+            return (self.peak_markers,)
+        return ()
+
+    @instrument.timed
     def plot_ecg(self):
         # 清除之前的图形
-        self.ax.clear()
-        self.y = []  # 初始化为空列表
+        with instrument.timer('ax.clear'):
+            self.ax.clear()
+        self.y = np.empty(0)  # 初始化为空数组
 
         # 根据滑块的值获取映射后的数值
         heart_rate_value = self.value_mapping.get(self.ecg_valueSlider.value())
         self.ecg_valueText.setText(f'心率值： {heart_rate_value}')
 
-        # 根据映射后的数值读取相应的CSV文件
+        # 根据映射后的数值读取相应的心电记录
         if heart_rate_value != None:
-            file_path = f'data/bpm{heart_rate_value}.csv'
-            # 计数器，记录已读取的行数
-            row_count = 0
-            # 使用 'utf-8' 编码打开文件
-            with open(file_path, mode='r', encoding='utf-8') as csv_file:
-                csv_reader = csv.reader(csv_file)
-                # 读取CSV文件的每一行
-                for row in csv_reader:
-                    self.y.append(int(row[0]))
-                    row_count += 1
-
-                    # 如果读取的行数达到两千行，则停止读取
-                    if row_count >= 2000:
-                        break
+            # 只复制需要显示的前 self.ecg_window 个点
+            with instrument.timer('ecg.load'):
+                recording = self.ecg_dataset.load(heart_rate_value)
+            self.ecg_sample_rate = self.ecg_dataset.sample_rate(heart_rate_value)
+            self.y = np.array(recording[:self.ecg_window], dtype=np.float64)
+        self.set_source(self.y)
         # 绘制心电波形
-        self.line, =self.ax.plot(self.y)
+        self.line = self.lod.plot(self.ax, np.arange(len(self.y)), self.y)
+        # R 波标记，检测完成后填入数据
+        self.peak_markers, = self.ax.plot([], [], 'rv', markersize=6)
         # 设置坐标轴标签和标题
         self.ax.set_ylabel('ECG Wave')
         self.ax.set_title('ECG Wave Plot')
         # 显示网格
         self.ax.grid(True)
         # 更新画布以显示图形
-        self.canvas.draw()
+        with instrument.timer('canvas.draw'):
+            self.canvas.draw()
+        if heart_rate_value is not None and len(self.y):
+            self.analyze_ecg(heart_rate_value)
+        self.after_plot()
+
+    def analyze_ecg(self, heart_rate_value):
+        # 检测整条心电记录的 R 波（结果按心率值缓存），完成后在波形上标注并显示实测心率
+        if heart_rate_value in self.ecg_peaks:
+            self.annotate_ecg(heart_rate_value, self.ecg_peaks[heart_rate_value])
+            return
+        recording = self.ecg_dataset.load(heart_rate_value)
+        self.run_task('analysis', len(recording),
+                      functools.partial(engine.detect_r_peaks, recording, self.ecg_sample_rate),
+                      on_done=functools.partial(self.annotate_ecg, heart_rate_value))
+
+    @instrument.timed
+    def annotate_ecg(self, heart_rate_value, peaks):
+        self.ecg_peaks[heart_rate_value] = peaks
+        # 检测期间切换了记录或重新绘图，结果只缓存不显示
+        if (not self.ecg_signal.isChecked() or self.peak_markers not in self.ax.lines
+                or self.value_mapping.get(self.ecg_valueSlider.value()) != heart_rate_value):
+            return
+        self.show_heart_rate(heart_rate_value, engine.mean_heart_rate(peaks, self.ecg_sample_rate))
+        if not self.dynamic_enable:
+            # 静态显示的是记录开头的 len(self.y) 个点
+            visible = peaks[peaks < len(self.y)]
+            self.peak_markers.set_data(visible, self.y[visible])
+            self.canvas.draw_idle()
+
+    def show_heart_rate(self, heart_rate_value, measured):
+        # 显示记录标称的心率值和从 R 波间期测得的心率
+        text = f'心率值： {heart_rate_value}'
+        if measured is not None:
+            text += f'（实测 {measured:.0f} 次/分）'
+        self.ecg_valueText.setText(text)
 
     def dynamic_enable(self):
         # 当y有值时才能对状态进行动态演示
@@ -275,159 +423,349 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
             # 动态演示使能状态取反
             self.dynamic_enable = not self.dynamic_enable
             if self.dynamic_enable:
-                # 清除之前的图形
-                self.ax.clear()
-                # 设置定时器
+                # 设置定时器，帧率上限为屏幕刷新率
                 self.timer = QTimer(self)
+                self.timer.setTimerType(Qt.PreciseTimer)
                 # 检查基本信号复选框是否被选中
                 if self.basic_signal.isChecked():
+                    # 复用预分配的缓冲区逐帧生成波形
+                    self.frame_buffer = self.timebase.empty()
                     self.timer.timeout.connect(self.basic_update_plot)
                 # 检查心电信号复选框是否被选中
                 if self.ecg_signal.isChecked():
+                    # 从整条记录中流式读取数据，窗口在记录中向前滑动
+                    self.playback = self.create_ecg_playback()
                     self.timer.timeout.connect(self.ecg_update_plot)
-                self.timer.start(1)  # 每1毫秒更新一次
+                # 每帧重新生成（或读入）原始信号后应用处理步骤
+                self.clean_frame = self.history.source
+                # 保留当前的曲线和坐标轴，缓存静态背景后只做局部重绘
+                self.crosshair.clear()
+                self.renderer.start(self.line, self.overlay_artists())
+                self.fps_counter.reset()
+                self.timer.start(self.frame_interval())
                 self.dynamicButton.setStyleSheet("background-color: rgb(255, 225, 255);")
             elif not self.dynamic_enable:
                 self.timer.stop()
+                self.renderer.stop()
+                if self.playback is not None:
+                    # 停止后保留当前窗口的数据，不再引用环形缓冲区
+                    self.y = np.array(self.y, dtype=np.float64)
+                    self.clean_frame = np.array(self.clean_frame, dtype=np.float64)
+                    self.playback = None
+                # 最后一帧的原始信号作为之后撤销、修改步骤的起点
+                y = self.y
+                self.set_source(self.clean_frame)
+                self.y = y
+                self.statusbar.clearMessage()
                 self.dynamicButton.setStyleSheet("background-color:white;")
 
+    def frame_interval(self):
+        # 根据屏幕刷新率计算每帧的间隔（毫秒），获取不到时按 60Hz 处理
+        screen = QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen is not None else 0
+        if refresh_rate <= 0:
+            refresh_rate = 60
+        return max(1, int(1000 / refresh_rate))
+
+    def basic_signal_task(self):
+        # 按当前参数构造计算基本信号（或合成信号）的函数，参数在构造时确定，可以在后台线程中执行
+        if self.synthesis_enable:
+            return functools.partial(engine.synthesize, list(self.signal_data_list), self.x,
+                                     phase_offset=self.phase)
+        return functools.partial(self.incremental.generate, self.signalType.currentIndex() + 1, self.timebase,
+                                 self.period, self.amplitude, self.baseline, self.phase)
+
+    def compute_basic_signal(self, out=None):
+        # 只计算当前基本信号（或合成信号）的波形，不进行绘图
+        return self.basic_signal_task()(out=out)
+
+    def update_fps(self):
+        # 在状态栏显示实测帧率
+        fps = self.fps_counter.tick()
+        if fps is not None:
+            self.statusbar.showMessage(f'FPS: {fps:.1f}')
+
+    @instrument.timed
     def basic_update_plot(self):
         # 更新相位
-        self.phase -= 0.05
-        # 更新曲线数据
-        self.line.set_ydata(self.y)
-        # 生成新的波形
-        self.check_signalType()
+        # 每帧约平移 0.05，取采样间隔的整数倍，使波形可以由上一帧循环移位得到
+        phase_step = max(1, round(0.05 * self.timebase.sample_rate)) * self.timebase.dt
+        self.phase -= phase_step
+        if self.frame_buffer.shape != self.x.shape or self.frame_buffer.dtype != self.x.dtype:
+            self.frame_buffer = self.timebase.empty()
+        # 生成新的波形并只重绘曲线
+        self.clean_frame = self.compute_basic_signal(out=self.frame_buffer)
+        self.frame_index += 1
+        self.y = self.process_frame(self.clean_frame)
+        xs, ys = self.lod.decimate(self.y)
+        self.renderer.update(ys, xs)
+        # 波形向左平移 phase_step，窗口右端新出现的点送入实时频谱图
+        self.stream_pending += phase_step * self.timebase.sample_rate
+        count = min(int(self.stream_pending), len(self.y))
+        self.stream_pending -= int(self.stream_pending)
+        self.push_spectrogram(self.y[len(self.y) - count:])
+        self.update_fps()
 
+    def create_ecg_playback(self):
+        # 为当前心率值的心电记录创建流式回放，窗口从记录开头开始
+        heart_rate_value = self.value_mapping.get(self.ecg_valueSlider.value())
+        if heart_rate_value is None:
+            return None
+        recording = self.ecg_dataset.load(heart_rate_value)
+        if len(recording) == 0:
+            return None
+        self.ecg_sample_rate = self.ecg_dataset.sample_rate(heart_rate_value)
+        self.last_tick = time.perf_counter()
+        playback = engine.EcgPlayback(recording, window=self.ecg_window, sample_rate=self.ecg_sample_rate)
+        # 流式 R 波检测：先输入初始窗口，之后每帧输入新读入的点
+        self.qrs_detector = engine.QrsDetector(self.ecg_sample_rate)
+        self.stream_peaks = self.qrs_detector.process(recording[:playback.window])
+        return playback
+
+    @instrument.timed
     def ecg_update_plot(self):
-        # 清除之前的图形
-        self.ax.clear()
-        # 实现循环移位
-        shift_amount = 15  # 每次移位的数量
-        self.y = self.y[shift_amount:] + self.y[:shift_amount]
-        # 更新曲线数据
-        self.line.set_ydata(self.y)
-        # 刷新画布
-        self.fig.canvas.draw_idle()
-        # 绘制心电波形
-        self.line, =self.ax.plot(self.y)
-        # 设置坐标轴标签和标题
-        self.ax.set_ylabel('ECG Wave')
-        self.ax.set_title('ECG Wave Plot')
-        # 显示网格
-        self.ax.grid(True)
-        # 更新画布以显示图形
-        self.canvas.draw()
+        if self.playback is None:
+            return
+        # 按实际经过的时间推进回放位置，与帧率无关
+        now = time.perf_counter()
+        self.clean_frame = self.playback.advance(now - self.last_tick)
+        self.last_tick = now
+        self.frame_index += 1
+        self.y = self.process_frame(self.clean_frame)
+        count = self.playback.last_count
+        # 本次新读入的原始数据送入流式 R 波检测，更新窗口内的 R 波标记
+        self.update_stream_peaks(self.clean_frame[len(self.clean_frame) - count:])
+        # 更新曲线数据并只重绘曲线
+        xs, ys = self.lod.decimate(self.y)
+        self.renderer.update(ys, xs)
+        # 本次新读入的点送入实时频谱图
+        self.push_spectrogram(self.y[len(self.y) - count:])
+        self.update_fps()
+
+    def process_frame(self, frame):
+        # 对动态演示的一帧应用处理步骤；演示中修改了参数使某一步无法计算（如采样率低于工频的 2 倍）时显示原始信号
+        try:
+            return self.history.apply(frame, frame=self.frame_index)
+        except ValueError as e:
+            self.statusbar.showMessage(f'计算失败：{e}', 5000)
+            return frame
+
+    def update_stream_peaks(self, chunk):
+        new_peaks = self.qrs_detector.process(chunk)
+        # 窗口第一个点在输入流中的位置，移出窗口的 R 波不再保留
+        start = self.qrs_detector.count - len(self.y)
+        peaks = np.concatenate((self.stream_peaks, new_peaks)) if len(new_peaks) else self.stream_peaks
+        self.stream_peaks = peaks[peaks >= start]
+        if self.peak_markers is not None:
+            self.peak_markers.set_data(self.stream_peaks - start, self.y[self.stream_peaks - start])
+        if len(new_peaks):
+            self.show_heart_rate(self.value_mapping.get(self.ecg_valueSlider.value()),
+                                 engine.mean_heart_rate(self.stream_peaks, self.ecg_sample_rate))
 
     def zoomin_update(self):
         #放大缩小是相对于波形来说
         self.scale_factor /= 1.1  # 缩小坐标轴，放大波形
-        # 应用放大因子
-        if self.basic_signal.isChecked():
-            self.ax.set_xlim(min(self.x) * self.scale_factor, max(self.x) * self.scale_factor)
-            self.ax.set_ylim(min(self.y) * self.scale_factor, max(self.y) * self.scale_factor)
-        if self.ecg_signal.isChecked():
-            self.ax.set_xlim(500 * self.scale_factor, 1500 * self.scale_factor)
-            self.ax.set_ylim(2150 * self.scale_factor, 2200 * self.scale_factor)
-
-        # 刷新画布
-        self.ax.relim()  # 自动调整轴限制
-        self.ax.autoscale_view()  # 自动缩放视图
-        self.fig.canvas.draw_idle()  # 刷新画布
+        self.apply_zoom()
 
     def zoomout_update(self):
         # 放大缩小是相对于波形来说
         self.scale_factor *= 1.1  # 放大坐标轴，缩小波形
-        # 应用缩小因子
-        if self.basic_signal.isChecked():
-            self.ax.set_xlim(min(self.x) * self.scale_factor, max(self.x) * self.scale_factor)
-            self.ax.set_ylim(min(self.y) * self.scale_factor, max(self.y) * self.scale_factor)
-        if self.ecg_signal.isChecked():
+        self.apply_zoom()
+
+    def apply_zoom(self):
+        # 应用缩放因子
+        if self.imported is not None:
+            # 导入的信号按文件的横轴（采样率或序号）缩放；数据可能很大，纵轴不扫描数据
+            x = self.lod.x
+            if x is not None and len(x):
+                self.ax.set_xlim(x[0] * self.scale_factor, x[-1] * self.scale_factor)
+        elif self.basic_signal.isChecked():
+            self.ax.set_xlim(self.x[0] * self.scale_factor, self.x[-1] * self.scale_factor)
+            self.ax.set_ylim(np.min(self.y) * self.scale_factor, np.max(self.y) * self.scale_factor)
+        elif self.ecg_signal.isChecked():
             self.ax.set_xlim(500 * self.scale_factor, 1500 * self.scale_factor)
             self.ax.set_ylim(2150 * self.scale_factor, 2200 * self.scale_factor)
 
-
         # 刷新画布
         self.ax.relim()  # 自动调整轴限制
         self.ax.autoscale_view()  # 自动缩放视图
         self.fig.canvas.draw_idle()  # 刷新画布
 
+    def point_data(self):
+        # 悬停和点击取值使用的全分辨率数据；动态演示中数据逐帧变化，不提供取值
+        if self.dynamic_enable or self.y is None or self.lod.x is None or len(self.lod.x) != len(self.y):
+            return None
+        return self.lod.x, self.y
+
+    @instrument.timed
     def on_click(self, event):
         # 检查点击是否在坐标轴上
         if event.inaxes == self.ax:
-            x, y = event.xdata, event.ydata
-            print("1")
-
-            # 清除之前可能存在的文本对象
+            # 清除之前可能存在的文本对象（重新绘图时 ax.clear() 已经把它移除）
             if self.click_text is not None:
-                self.click_text.remove()
+                if self.click_text in self.ax.texts:
+                    self.click_text.remove()
                 self.click_text = None
 
-            # 计算波形上最接近点击位置的点的索引
-            distances = np.sqrt((x - self.line.get_xdata()) ** 2 + (y - self.line.get_ydata()) ** 2)
-
-            closest_index = np.argmin(distances)
-            closest_x, closest_y = self.line.get_xdata()[closest_index], self.line.get_ydata()[closest_index]
-
-            # 检查点击位置是否在波形的容差范围内
-            tolerance = 0.5  # 根据需要调整容差大小
-            if np.isclose(x, closest_x, atol=tolerance) and np.isclose(y, closest_y, atol=tolerance):
-                # 在波形上创建一个文本对象，显示点击位置的坐标
+            # 在显示坐标中查找点击位置容差范围内最近的采样点（x 单调时二分查找，不扫描整条曲线）
+            tolerance = 10  # 容差（像素）
+            index = self.crosshair.pick(event, tolerance)
+            if index is not None:
+                # 在波形上创建一个文本对象，显示该采样点的坐标
+                x, y = self.crosshair.query.point(index)
                 self.click_text = self.ax.text(x, y, f'({x:.2f}, {y:.2f})', color='purple')
 
-                # 重绘图形
-                self.fig.canvas.draw_idle()
+            # 重绘图形
+            self.fig.canvas.draw_idle()
 
+    @instrument.timed
     def addNoise_enable(self):
         # 当y有值时才能对状态进行修改
         if self.y is not None:
             # 添加噪声
             if hasattr(self, 'noise_scale') and self.noise_scale > 0:
-                noise = self.noise_scale * np.random.normal(size=len(self.x))
-                if self.basic_signal.isChecked():
-                    self.y += noise
-                    # 更新曲线数据
-                    self.line.set_ydata(self.y)
-                    # 刷新画布
-                    self.fig.canvas.draw_idle()
-                if self.ecg_signal.isChecked():
-                    self.y = [x + np.random.normal(0, 10) for x in self.y]
-                    # 更新曲线数据
-                    self.line.set_ydata(self.y)
-                    # 刷新画布
-                    self.fig.canvas.draw_idle()
+                if self.basic_signal.isChecked() or self.ecg_signal.isChecked():
+                    # 基本信号的噪声强度为 noise_scale，心电信号为 10
+                    scale = self.noise_scale if self.basic_signal.isChecked() else 10
+                    if not self.read_noise_parameters():
+                        return
+                    rate = self.current_sample_rate()
+                    try:
+                        # 先检查参数（如工频干扰要求采样率高于 2 倍工频），不合适时不添加步骤
+                        engine.NoiseStream(self.noise_type, scale, sample_rate=rate)
+                    except ValueError as e:
+                        QMessageBox.warning(self, '无法添加噪声', f'{e}（当前采样率 {rate:g} Hz，可增加采样点数）')
+                        return
+                    # 每一步的种子在添加时确定，重新计算（撤销其它步骤、修改参数）时噪声不变
+                    self.history.add(engine.NoiseStage(self.noise_type, scale, snr_db=self.noise_snr,
+                                                       seed=int(self.noise_rng.integers(2 ** 63))))
+                    self.history_changed()
+
+    def read_noise_parameters(self):
+        # 读取“功能设置”中的噪声类型、信噪比和随机种子；种子改变时重新创建随机数生成器，
+        # 固定种子后每次运行依次添加的噪声序列相同
+        try:
+            snr = self.noiseSnr.text().strip()
+            seed = self.noiseSeed.text().strip()
+            snr = float(snr) if snr else None
+            seed = int(seed) if seed else None
+            if seed is not None and seed < 0:
+                raise ValueError(seed)
+        except ValueError:
+            QMessageBox.warning(self, '警告', '信噪比请输入数字，随机种子请输入非负整数！')
+            return False
+        self.noise_type = engine.NOISE_TYPES[self.noiseType.currentIndex()]
+        self.noise_snr = snr
+        if seed != self.noise_seed:
+            self.noise_seed = seed
+            self.noise_rng = np.random.default_rng(seed)
+        return True
+
+    def filter_mode_changed(self):
+        # Butterworth 滤波设置截止频率和阶数，平滑滤波只设置窗口大小
+        butterworth = self.FILTER_MODES[self.filterMode.currentIndex()] == 'butterworth'
+        self.filterCutoff.setEnabled(butterworth)
+        self.label_13.setText('阶数' if butterworth else '窗口大小')
+        self.filterSize.setText(str(self.filter_order if butterworth else self.filter_size))
+
+    def read_filter_parameters(self):
+        # 读取“功能设置”中的滤波方式、截止频率（相对于奈奎斯特频率）和阶数或窗口大小
+        mode = self.FILTER_MODES[self.filterMode.currentIndex()]
+        try:
+            value = int(self.filterSize.text())
+            cutoff = float(self.filterCutoff.text()) if mode == 'butterworth' else self.filter_cutoff
+            if value < 1 or not 0 < cutoff < 1:
+                raise ValueError(value)
+        except ValueError:
+            QMessageBox.warning(self, '警告', '截止频率请输入 0~1 之间的数（相对于奈奎斯特频率），阶数和窗口大小请输入正整数！')
+            return False
+        self.filter_mode = mode
+        self.filter_cutoff = cutoff
+        if mode == 'butterworth':
+            self.filter_order = value
+        else:
+            self.filter_size = value
+        return True
 
+    @instrument.timed
     def filter_enable(self):
         # 当y有值时才能对状态进行修改
         if self.y is not None:
             # 应用滤波
             if hasattr(self, 'apply_filter') and self.apply_filter:
-                if self.basic_signal.isChecked():
-                    # 使用简单的平均滤波器
-                    self.y = np.convolve(self.y, np.ones((self.filter_size,)))/ self.filter_size
-                    # 需要调整x轴的数据以适应滤波后的y轴数据长度
-                    self.y = self.y[:len(self.x)]
-                    # 更新曲线数据
-                    self.line.set_ydata(self.y)
-                    # 刷新画布
-                    self.fig.canvas.draw_idle()
+                if self.basic_signal.isChecked() or self.ecg_signal.isChecked():
+                    if not self.read_filter_parameters():
+                        return
+                    if self.filter_mode == 'butterworth':
+                        # 零相位 Butterworth 低通滤波，没有相位延迟；filter_cutoff 以奈奎斯特频率归一化，换算为 Hz
+                        cutoff = self.filter_cutoff * self.current_sample_rate() / 2
+                        self.history.add(engine.FilterStage('butterworth', order=self.filter_order, cutoff=cutoff,
+                                                            zero_phase=True))
+                    else:
+                        # 因果平滑滤波，开头不足窗口长度的部分只对已有的点求平均
+                        self.history.add(engine.FilterStage(self.filter_mode, size=self.filter_size))
+                    self.history_changed()
 
-                if self.ecg_signal.isChecked():
-                    # 对数据进行移动平均滤波
-                    filtered_y = []
-                    for i in range(len(self.y)):
-                        # 确保索引不会超出范围
-                        start_idx = max(0, i - self.filter_size + 1)
-                        end_idx = min(i + 1, len(self.y))
-                        window = self.y[start_idx:end_idx]
-                        # 计算窗口内元素的平均值，并将其添加到滤波后的列表中
-                        filtered_y.append(np.mean(window))
-                    # 更新self.y为滤波后的数据
-                    self.y = filtered_y
-                    # 更新曲线数据
-                    self.line.set_ydata(self.y)
-                    # 刷新画布
-                    self.fig.canvas.draw_idle()
+    def undo_step(self):
+        # 撤销最后一个处理步骤
+        if self.history.undo() is not None:
+            self.history_changed()
+
+    def redo_step(self):
+        if self.history.redo() is not None:
+            self.history_changed()
+
+    def show_original(self, checked):
+        # 暂时显示原始信号，处理步骤保留
+        self.history.bypass = checked
+        self.history_changed()
+
+    def clear_steps(self):
+        # 删除所有处理步骤，之后仍可逐步重做
+        if len(self.history):
+            self.history.clear()
+            self.history_changed()
+
+    def history_changed(self):
+        # 处理步骤改变后更新菜单状态并重新计算显示的信号
+        self.update_history_actions()
+        self.statusbar.showMessage(f'处理步骤：{len(self.history)}', 3000)
+        self.reprocess()
+
+    def update_history_actions(self):
+        self.actionUndo.setEnabled(len(self.history) > 0)
+        self.actionRedo.setEnabled(len(self.history.undone) > 0)
+        self.actionClearSteps.setEnabled(len(self.history) > 0)
+
+    def set_source(self, y):
+        # 显示新的原始信号（重新生成、读取心电记录、导入文件），处理步骤保留
+        self.history.set_source(y, self.current_sample_rate())
+        self.y = y
+
+    def reprocess(self):
+        # 对原始信号应用处理步骤，缓存中已有的上游结果直接复用；动态演示中从下一帧开始生效
+        source = self.history.source
+        if source is None or self.dynamic_enable is True:
+            return
+        if not self.history.active and self.y is source:
+            return
+        self.run_task('process', len(source), self.history.task(),
+                      on_done=functools.partial(self.apply_processed, source))
+
+    @instrument.timed
+    def apply_processed(self, source, y):
+        # 处理期间原始信号已被重新生成或开始了动态演示时丢弃结果
+        if self.history.source is not source or self.dynamic_enable is True:
+            return
+        self.y = y
+        # 更新曲线数据
+        self.lod.set_ydata(self.y)
+        if self.ecg_signal.isChecked() and self.peak_markers in self.ax.lines:
+            # R 波标记跟随处理后的波形
+            visible = np.asarray(self.peak_markers.get_xdata(), dtype=np.intp)
+            self.peak_markers.set_ydata(self.y[visible])
+        # 刷新画布
+        self.fig.canvas.draw_idle()
 
     def synthesis_enable(self):
         # 使能状态取反
@@ -441,6 +779,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
 
     def open_child_window1(self):
         # 创建并显示子窗口，传递父窗口的实例作为参数
+        from child_window1 import SignalSynthesisDialog
         child_window1 = SignalSynthesisDialog(self)
         child_window1.data_returned.connect(self.on_data_returned)
         # 生成非模态对话框
@@ -452,55 +791,155 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
         # 生成新的波形
         self.check_signalType()
 
+    @instrument.timed
     def plot_synthesis(self):
-        list_y = []
-        #i为列表中的组数的索引值
-        for i in range(len(self.signal_data_list)):
-            amplitude = float(self.signal_data_list[i].amplitude)  # 幅值
-            baseline = float(self.signal_data_list[i].baseline)  # 基线
-            period = float(self.signal_data_list[i].period)  # 周期
-            phase = float(self.signal_data_list[i].phase) + self.phase # 相位（以周期为单位）+self.phase是为了实现动态更新
-            if self.signal_data_list[i].signal_type == 1:  # 正弦波
-                result = amplitude * np.sin(2 * np.pi * (self.x - phase) / period) + baseline
-                list_y.append(result)
-            if self.signal_data_list[i].signal_type == 2:  # 三角波
-                x_shifted = self.x - phase
-                x_wrapped = np.mod(x_shifted, period)
-                result= amplitude * np.abs(np.mod(x_wrapped, period) - period / 2) + baseline
-                list_y.append(result)
-            if self.signal_data_list[i].signal_type == 3:  # 锯齿波
-                x_shifted = self.x - phase
-                x_wrapped = np.mod(x_shifted, period)
-                result = baseline + amplitude * x_wrapped / period
-                list_y.append(result)
-            if self.signal_data_list[i].signal_type == 4:  # 方波
-                x_shifted = self.x - phase
-                result = baseline + amplitude * np.sign(np.sin(2 * np.pi * x_shifted / period))
-                list_y.append(result)
-
-        self.y = sum(list_y)
-
-        # 绘制合成波
-        self.line, = self.ax.plot(self.x, self.y)
-        # 设置坐标轴标签和标题
-        self.ax.set_xlabel('x')
-        self.ax.set_ylabel('Synthesis Wave')
-        self.ax.set_title('Synthesis Wave Plot')
-        # 显示网格
+        # 所有分量叠加到同一个输出缓冲区中，+self.phase是为了实现动态更新；分量多时显示计算进度
+        self.run_task('signal', len(self.x) * max(1, len(self.signal_data_list)),
+                      functools.partial(engine.synthesize, list(self.signal_data_list), self.x,
+                                        phase_offset=self.phase),
+                      on_done=functools.partial(self.draw_wave, self.x, 'Synthesis Wave', 'Synthesis Wave Plot'),
+                      with_progress=True)
+
+    def open_child_window2(self):
+        # 当y有值时才能对状态进行修改
+        if self.y is not None:
+            # 创建频谱图对话框并显示，采样率与实际数据的采样间隔一致
+            # 心电信号使用 Welch 平均功率谱，基本信号使用加窗的幅度谱
+            method = 'welch' if self.ecg_signal.isChecked() else 'amplitude'
+            from child_window2 import compute_spectrum
+            self.run_task('spectrum', len(self.y),
+                          functools.partial(compute_spectrum, self.y, self.current_sample_rate(), method),
+                          on_done=functools.partial(self.show_spectrum, self.y, method))
+
+    def show_spectrum(self, signal_data, method, spectrum):
+        from child_window2 import SpectrumDialog
+        spectrum_dialog = SpectrumDialog(signal_data, self.current_sample_rate(), method=method, spectrum=spectrum)
+        spectrum_dialog.exec_()
+
+    def run_task(self, channel, size, func, on_done, with_progress=False):
+        # 数据量小时直接计算；数据量大时提交到后台线程，同一通道上只有最新一次请求的结果会回到界面
+        if instrument.registry.enabled:
+            func = instrument.timed(f'task.{channel}')(func)
+        if size < self.async_threshold:
+            self.tasks.cancel(channel)
+            # 与后台计算相同，计算出错时在状态栏报告，不让异常离开 Qt 槽函数
+            try:
+                result = func()
+            except Exception as e:
+                self.on_task_failed(e)
+                return
+            on_done(result)
+        else:
+            self.tasks.submit(channel, func, on_done=on_done, on_error=self.on_task_failed,
+                              with_progress=with_progress)
+
+    def on_busy_changed(self, busy):
+        # 后台计算期间在状态栏显示忙碌指示，并暂时禁用依赖当前波形的按钮
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setVisible(busy)
+        self.addButton.setEnabled(not busy)
+        self.filterButton.setEnabled(not busy)
+        self.spectrumButton.setEnabled(not busy)
+        if busy:
+            self.statusbar.showMessage('计算中…')
+        else:
+            self.statusbar.clearMessage()
+
+    def on_task_progress(self, channel, fraction):
+        # 支持进度汇报的任务显示百分比
+        self.busy_bar.setRange(0, 100)
+        self.busy_bar.setValue(int(fraction * 100))
+
+    def on_task_failed(self, error):
+        self.statusbar.showMessage(f'计算失败：{error}', 5000)
+
+    def current_sample_rate(self):
+        # 当前显示信号的采样率；导入的文件没有采样率信息时按 1 计算（横轴为采样点序号）
+        if self.imported is not None:
+            return self.imported.sample_rate or 1.0
+        if self.ecg_signal.isChecked():
+            return self.ecg_sample_rate
+        return self.timebase.sample_rate
+
+    def open_child_window3(self):
+        # 创建（或重新显示）非模态的实时频谱图窗口
+        if self.spectrogram_dialog is None:
+            from child_window3 import SpectrogramDialog
+            self.spectrogram_dialog = SpectrogramDialog(self.current_sample_rate(), self)
+        else:
+            self.spectrogram_dialog.reset(self.current_sample_rate())
+        # 先送入当前显示的波形，动态演示时再持续送入新样本
+        if self.y is not None:
+            self.spectrogram_dialog.push(self.y)
+        self.spectrogram_dialog.show()
+        self.spectrogram_dialog.raise_()
+
+    def toggle_stats(self, checked):
+        # 打开性能统计面板时开启耗时统计，关闭时停止统计
+        instrument.registry.enabled = checked
+        if self.stats_dock is None:
+            if not checked:
+                return
+            from stats_dock import StatsDock
+            self.stats_dock = StatsDock(instrument.registry, self)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.stats_dock)
+        self.stats_dock.setVisible(checked)
+
+    def push_spectrogram(self, samples):
+        # 实时频谱图窗口打开时才进行计算
+        dialog = self.spectrogram_dialog
+        if dialog is None or not dialog.isVisible() or len(samples) == 0:
+            return
+        if dialog.spectrogram.sample_rate != self.current_sample_rate():
+            dialog.reset(self.current_sample_rate())
+        dialog.push(samples)
+
+    def open_file(self):
+        # 导入信号文件：CSV/TXT、NPY、WAV 以及原始二进制（.i16/.f32/.raw 等，格式见同名 .json 头文件）
+        extensions = ' '.join('*' + extension for extension in sorted(engine.READERS))
+        file_path, _ = QFileDialog.getOpenFileName(self, 'Open File', '',
+                                                   f'Signal Files ({extensions});;All Files (*)')
+        if not file_path:
+            return
+        try:
+            signal = engine.read_signal(file_path)
+        except (OSError, ValueError, EOFError) as e:
+            QMessageBox.warning(self, '打开失败', f'无法读取文件：{e}')
+            return
+        self.show_imported(signal)
+
+    @instrument.timed
+    def show_imported(self, signal):
+        # 动态演示中导入文件时先停止演示
+        if self.dynamic_enable is True:
+            type(self).dynamic_enable(self)
+        self.imported = signal
+        self.scale_factor = 1
+        # 导入的文件从原始数据开始显示，之前的处理步骤可以重做
+        self.history.clear()
+        self.update_history_actions()
+        self.set_source(signal.data)
+        x = signal.axis()
+        with instrument.timer('ax.clear'):
+            self.ax.clear()
+        # 大文件以内存映射方式打开，先只读取少量数据显示预览，完整的极值金字塔在后台计算
+        self.line = self.lod.plot_preview(self.ax, x, self.y)
+        self.ax.set_xlabel('t (s)' if signal.sample_rate else 'sample')
+        self.ax.set_title(os.path.basename(signal.path))
         self.ax.grid(True)
-        # 调整坐标轴范围以适应数据
         self.ax.relim()
         self.ax.autoscale_view()
-        # 更新画布以显示图形
         self.canvas.draw()
+        self.statusbar.showMessage(f'{len(signal)} 点', 5000)
+        self.run_task('signal', len(self.y), functools.partial(engine.MinMaxPyramid, x, self.y),
+                      on_done=functools.partial(self.apply_imported_pyramid, signal))
 
-    def open_child_window2(self):
-        # 当y有值时才能对状态进行修改
-        if self.y is not None:
-            # 创建频谱图对话框并显示
-            sampling_frequency=10*(1/self.period)# 采样率要大于最高频率成分的两倍
-            spectrum_dialog = SpectrumDialog(self.y, sampling_frequency)
-            spectrum_dialog.exec_()
+    def apply_imported_pyramid(self, signal, pyramid):
+        # 期间重新生成了波形或导入了其它文件时丢弃结果
+        # 期间已应用了处理步骤时，显示的不再是原始数据，保留处理后的金字塔
+        if self.imported is signal and self.y is signal.data:
+            self.lod.set_pyramid(pyramid)
+            self.canvas.draw_idle()
 
     def on_checkbox_state_changed(self, state):
         # 检查是哪个复选框的状态发生了变化
@@ -518,13 +957,56 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
             # 使用 Figure 对象的 savefig 方法保存图形
             self.fig.savefig(file_path)
 
+    def export_data(self):
+        # 导出当前显示的信号数据（加噪声、滤波、合成后的结果），在后台逐块写入
+        if self.y is None:
+            return
+        file_path, selected = QFileDialog.getSaveFileName(
+            self, 'Export Data', '',
+            'NumPy (*.npy);;CSV (*.csv);;WAV (*.wav);;Raw float32 (*.f32);;Raw int16 (*.i16);;All Files (*)')
+        if not file_path:
+            return
+        # 没有输入扩展名时使用所选类型的扩展名
+        if not os.path.splitext(file_path)[1] and '(*.' in selected:
+            file_path += selected[selected.index('(*') + 2:-1]
+        # 不支持的扩展名在开始导出前提示；写入失败（目录不可写等）由 run_task 报告到状态栏
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in engine.WRITERS:
+            QMessageBox.warning(self, '导出失败', f'不支持的导出格式：{extension or file_path}\n'
+                                f'支持的格式：{", ".join(sorted(engine.WRITERS))}')
+            return
+        # 动态演示中 y 的缓冲区每帧都会被改写，导出一份副本
+        y = self.y.copy() if self.dynamic_enable is True else self.y
+        # CSV 的横轴与显示一致：导入的文件按采样率或序号，心电信号按序号，基本信号使用时间轴
+        if self.imported is not None:
+            x = self.imported.axis()
+        elif self.ecg_signal.isChecked():
+            x = engine.UniformAxis(len(y))
+        else:
+            x = self.x
+        sample_rate = self.current_sample_rate()
+        self.run_task('export', len(y),
+                      functools.partial(engine.export_signal, file_path, y, x=x, sample_rate=sample_rate),
+                      on_done=lambda path: self.statusbar.showMessage(f'已导出到 {path}', 5000),
+                      with_progress=True)
+
+    def closeEvent(self, event):
+        # 关闭窗口时取消尚未开始的后台计算
+        self.tasks.shutdown()
+        super(MyMainWindow, self).closeEvent(event)
+
     def show_help(self):
         # 准备帮助文档内容
         help_text = """
 帮助文档：
     勾选“基本信号”或“心电信号”复选框后，再进行参数的设置和功能的使用。
     “基本信号”可以修改信号的周期、幅值、基线、时移，编辑框内的数字，可以实现参数的调整。
+    “采样点数”和“数据类型”决定时间轴（点数覆盖 10 个周期）；点数很大时可选 float32 节省一半内存。
     “心电信号”可以改变滑动条调整心率。
+    “添加噪声”按“功能设置”下方选择的噪声类型添加；填写信噪比（dB）时按信噪比确定强度，填写随机种子后结果可重复。
+    工频干扰要求采样率高于 100 Hz（基本信号可增加采样点数）。
+    “进行滤波”按“功能设置”下方的滤波方式滤波：Butterworth 低通（零相位）需要截止频率（相对于奈奎斯特频率，0~1）和阶数，
+    移动平均、中值滤波、指数移动平均需要窗口大小。
     点击各功能按钮即可实现相应功能。
     波形右上角的“+”，“-”按钮可实现波形的放大与缩小。
     当有波形显示时，点击波形上的点，可显示波形该点的数值。
@@ -532,7 +1014,7 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
 注意：
 1.各功能在波形Y值为空时使用不了，即点击无效，但不会造成程序崩溃。
 2.放大缩小功能只能在信号静态演示时使用。
-3.添加噪声后仍可动态演示。
+3.添加噪声、滤波后仍可动态演示；“编辑”菜单可以撤销、重做处理步骤或显示原始信号。
 4.点击动态演示按钮，按钮有颜色时为使能态；按钮无颜色为无效态。
 5.合成信号按钮必须在勾选“基本信号”时使用。
     
@@ -544,6 +1026,14 @@ class MyMainWindow(QMainWindow, Ui_MainWindow):  # 继承 QMainWindow类和 Ui_M
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)  # 在 QApplication 方法中使用，创建应用程序对象
+    # 按环境变量开启性能统计、cProfile 或调用跟踪
+    instrument.configure_from_env()
     myWin = MyMainWindow()  # 实例化 MyMainWindow 类，创建主窗口
+    if instrument.registry.enabled:
+        myWin.actionStats.setChecked(True)
+        myWin.toggle_stats(True)
     myWin.show()  # 在桌面显示控件 myWin
+    # 启动时间测试（benchmarks/startup_time.py）：主窗口显示后处理完第一轮事件即退出
+    if os.environ.get('SIGVIS_QUIT_ON_SHOW'):
+        QTimer.singleShot(0, app.quit)
     sys.exit(app.exec_())  # 结束进程，退出程序
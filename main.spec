@@ -1,5 +1,34 @@
 # -*- mode: python ; coding: utf-8 -*-
+# 打包：pyinstaller main.spec            单文件 exe（每次启动需先解压到临时目录）
+#       pyinstaller main.spec -- --onedir  目录版（不需要解压，启动更快，见 README 中的启动时间测试）
+import argparse
 
+parser = argparse.ArgumentParser()
+parser.add_argument('--onedir', action='store_true', help='生成目录版而不是单文件 exe')
+options = parser.parse_args()
+
+# 程序只用到 Qt5Agg 绘图和 Agg 导出（png/pdf/svg），其它 GUI 工具包和 matplotlib 后端不打包
+excludes = [
+    'tkinter', '_tkinter',
+    'wx', 'gi', 'cairo', 'cairocffi',
+    'PyQt6', 'PySide2', 'PySide6',
+    'IPython', 'ipykernel', 'jupyter_client', 'tornado',
+    'matplotlib.backends.backend_tkagg', 'matplotlib.backends.backend_tkcairo',
+    'matplotlib.backends._backend_tk',
+    'matplotlib.backends.backend_gtk3', 'matplotlib.backends.backend_gtk3agg',
+    'matplotlib.backends.backend_gtk3cairo', 'matplotlib.backends.backend_gtk4',
+    'matplotlib.backends.backend_gtk4agg', 'matplotlib.backends.backend_gtk4cairo',
+    'matplotlib.backends._backend_gtk',
+    'matplotlib.backends.backend_wx', 'matplotlib.backends.backend_wxagg',
+    'matplotlib.backends.backend_wxcairo',
+    'matplotlib.backends.backend_macosx',
+    'matplotlib.backends.backend_webagg', 'matplotlib.backends.backend_webagg_core',
+    'matplotlib.backends.backend_nbagg',
+    'matplotlib.backends.backend_qtcairo', 'matplotlib.backends.backend_qt5cairo',
+    'matplotlib.backends.backend_cairo', 'matplotlib.backends.backend_template',
+    # 批处理和性能测试脚本不属于桌面程序
+    'batch', 'engine.jobs', 'pytest',
+]
 
 a = Analysis(
     ['main.py'],
@@ -10,29 +39,58 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=excludes,
     noarchive=False,
-    optimize=0,
+    # 去掉 assert 语句，跳过调试代码；保留文档字符串（optimize=2 会去掉），避免依赖 __doc__ 的第三方库出错
+    optimize=1,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='main',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
+if options.onedir:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        # 目录版不压缩：UPX 压缩的 Qt 库每次加载都要解压，反而拖慢启动
+        upx=False,
+        name='main',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
@@ -0,0 +1,80 @@
+import time
+
+
+class BlitRenderer:
+    # 实时绘图：只保留一条 Line2D，缓存坐标轴、网格、标签等静态背景，
+    # 每帧只恢复背景、更新曲线数据并 blit，避免 ax.clear() + canvas.draw() 的整图重绘
+    def __init__(self, canvas, ax):
+        self.canvas = canvas
+        self.ax = ax
+        self.line = None
+        self.overlays = ()
+        self._background = None
+        self._draw_cid = None
+
+    def start(self, line, overlays=()):
+        # 将已绘制好的曲线设为动画对象，并重绘一次以缓存不含曲线的背景
+        # overlays 为随曲线一起逐帧重绘的标注（如 R 波标记），其数据由调用方在 update 之前更新
+        self.stop()
+        self.line = line
+        self.overlays = tuple(overlays)
+        for artist in (self.line,) + self.overlays:
+            artist.set_animated(True)
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.canvas.draw()
+
+    def _on_draw(self, event):
+        # 每次完整重绘（包括窗口缩放、坐标轴范围变化）后重新缓存背景
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        self.ax.draw_artist(self.line)
+        for artist in self.overlays:
+            self.ax.draw_artist(artist)
+
+    def update(self, ydata, xdata=None):
+        # 恢复背景，只更新并重绘曲线；xdata 不为 None 时同时更新 x（抽取后的点数可能变化）
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        if xdata is None:
+            self.line.set_ydata(ydata)
+        else:
+            self.line.set_data(xdata, ydata)
+        self._draw_artists()
+        self.canvas.blit(self.ax.bbox)
+
+    def stop(self):
+        # 退出实时模式，曲线恢复为普通对象并按常规方式重绘
+        if self._draw_cid is not None:
+            self.canvas.mpl_disconnect(self._draw_cid)
+            self._draw_cid = None
+        self._background = None
+        if self.line is not None:
+            for artist in (self.line,) + self.overlays:
+                artist.set_animated(False)
+            self.line = None
+            self.overlays = ()
+            self.canvas.draw_idle()
+
+
+class FpsCounter:
+    # 统计实际渲染帧率，每隔 interval 秒返回一次测得的 FPS，其余时间返回 None
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.reset()
+
+    def reset(self):
+        self._frames = 0
+        self._start = time.perf_counter()
+
+    def tick(self):
+        self._frames += 1
+        elapsed = time.perf_counter() - self._start
+        if elapsed < self.interval:
+            return None
+        fps = self._frames / elapsed
+        self._frames = 0
+        self._start += elapsed
+        return fps
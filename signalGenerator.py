@@ -135,6 +135,20 @@ class Ui_MainWindow(object):
         self.label_5 = QtWidgets.QLabel(self.gridLayoutWidget)
         self.label_5.setObjectName("label_5")
         self.gridLayout.addWidget(self.label_5, 1, 2, 1, 1)
+        self.label_6 = QtWidgets.QLabel(self.gridLayoutWidget)
+        self.label_6.setObjectName("label_6")
+        self.gridLayout.addWidget(self.label_6, 2, 0, 1, 1)
+        self.sampleCount = QtWidgets.QLineEdit(self.gridLayoutWidget)
+        self.sampleCount.setObjectName("sampleCount")
+        self.gridLayout.addWidget(self.sampleCount, 2, 1, 1, 1)
+        self.label_7 = QtWidgets.QLabel(self.gridLayoutWidget)
+        self.label_7.setObjectName("label_7")
+        self.gridLayout.addWidget(self.label_7, 2, 2, 1, 1)
+        self.sampleDtype = QtWidgets.QComboBox(self.gridLayoutWidget)
+        self.sampleDtype.setObjectName("sampleDtype")
+        self.sampleDtype.addItem("")
+        self.sampleDtype.addItem("")
+        self.gridLayout.addWidget(self.sampleDtype, 2, 3, 1, 1)
         self.splitter = QtWidgets.QSplitter(self.groupBox2)
         self.splitter.setGeometry(QtCore.QRect(110, 20, 121, 81))
         self.splitter.setOrientation(QtCore.Qt.Vertical)
@@ -172,7 +186,7 @@ class Ui_MainWindow(object):
         self.groupBox3.setFont(font)
         self.groupBox3.setObjectName("groupBox3")
         self.layoutWidget = QtWidgets.QWidget(self.groupBox3)
-        self.layoutWidget.setGeometry(QtCore.QRect(50, 60, 171, 491))
+        self.layoutWidget.setGeometry(QtCore.QRect(50, 40, 171, 331))
         self.layoutWidget.setObjectName("layoutWidget")
         self.verticalLayout2 = QtWidgets.QVBoxLayout(self.layoutWidget)
         self.verticalLayout2.setContentsMargins(0, 0, 0, 0)
@@ -241,14 +255,75 @@ class Ui_MainWindow(object):
 "}")
         self.spectrumButton.setObjectName("spectrumButton")
         self.verticalLayout2.addWidget(self.spectrumButton)
+        self.noiseLayoutWidget = QtWidgets.QWidget(self.groupBox3)
+        self.noiseLayoutWidget.setGeometry(QtCore.QRect(20, 390, 231, 111))
+        self.noiseLayoutWidget.setObjectName("noiseLayoutWidget")
+        self.noiseLayout = QtWidgets.QGridLayout(self.noiseLayoutWidget)
+        self.noiseLayout.setContentsMargins(0, 0, 0, 0)
+        self.noiseLayout.setObjectName("noiseLayout")
+        self.label_8 = QtWidgets.QLabel(self.noiseLayoutWidget)
+        self.label_8.setObjectName("label_8")
+        self.noiseLayout.addWidget(self.label_8, 0, 0, 1, 1)
+        self.noiseType = QtWidgets.QComboBox(self.noiseLayoutWidget)
+        self.noiseType.setObjectName("noiseType")
+        self.noiseType.addItem("")
+        self.noiseType.addItem("")
+        self.noiseType.addItem("")
+        self.noiseType.addItem("")
+        self.noiseType.addItem("")
+        self.noiseLayout.addWidget(self.noiseType, 0, 1, 1, 1)
+        self.label_9 = QtWidgets.QLabel(self.noiseLayoutWidget)
+        self.label_9.setObjectName("label_9")
+        self.noiseLayout.addWidget(self.label_9, 1, 0, 1, 1)
+        self.noiseSnr = QtWidgets.QLineEdit(self.noiseLayoutWidget)
+        self.noiseSnr.setObjectName("noiseSnr")
+        self.noiseLayout.addWidget(self.noiseSnr, 1, 1, 1, 1)
+        self.label_10 = QtWidgets.QLabel(self.noiseLayoutWidget)
+        self.label_10.setObjectName("label_10")
+        self.noiseLayout.addWidget(self.label_10, 2, 0, 1, 1)
+        self.noiseSeed = QtWidgets.QLineEdit(self.noiseLayoutWidget)
+        self.noiseSeed.setObjectName("noiseSeed")
+        self.noiseLayout.addWidget(self.noiseSeed, 2, 1, 1, 1)
+        self.filterLayoutWidget = QtWidgets.QWidget(self.groupBox3)
+        self.filterLayoutWidget.setGeometry(QtCore.QRect(20, 510, 231, 111))
+        self.filterLayoutWidget.setObjectName("filterLayoutWidget")
+        self.filterLayout = QtWidgets.QGridLayout(self.filterLayoutWidget)
+        self.filterLayout.setContentsMargins(0, 0, 0, 0)
+        self.filterLayout.setObjectName("filterLayout")
+        self.label_11 = QtWidgets.QLabel(self.filterLayoutWidget)
+        self.label_11.setObjectName("label_11")
+        self.filterLayout.addWidget(self.label_11, 0, 0, 1, 1)
+        self.filterMode = QtWidgets.QComboBox(self.filterLayoutWidget)
+        self.filterMode.setObjectName("filterMode")
+        self.filterMode.addItem("")
+        self.filterMode.addItem("")
+        self.filterMode.addItem("")
+        self.filterMode.addItem("")
+        self.filterLayout.addWidget(self.filterMode, 0, 1, 1, 1)
+        self.label_12 = QtWidgets.QLabel(self.filterLayoutWidget)
+        self.label_12.setObjectName("label_12")
+        self.filterLayout.addWidget(self.label_12, 1, 0, 1, 1)
+        self.filterCutoff = QtWidgets.QLineEdit(self.filterLayoutWidget)
+        self.filterCutoff.setObjectName("filterCutoff")
+        self.filterLayout.addWidget(self.filterCutoff, 1, 1, 1, 1)
+        self.label_13 = QtWidgets.QLabel(self.filterLayoutWidget)
+        self.label_13.setObjectName("label_13")
+        self.filterLayout.addWidget(self.label_13, 2, 0, 1, 1)
+        self.filterSize = QtWidgets.QLineEdit(self.filterLayoutWidget)
+        self.filterSize.setObjectName("filterSize")
+        self.filterLayout.addWidget(self.filterSize, 2, 1, 1, 1)
         MainWindow.setCentralWidget(self.centralwidget)
         self.menubar = QtWidgets.QMenuBar(MainWindow)
         self.menubar.setGeometry(QtCore.QRect(0, 0, 945, 26))
         self.menubar.setObjectName("menubar")
         self.menu = QtWidgets.QMenu(self.menubar)
         self.menu.setObjectName("menu")
+        self.menuEdit = QtWidgets.QMenu(self.menubar)
+        self.menuEdit.setObjectName("menuEdit")
         self.menuQuit = QtWidgets.QMenu(self.menubar)
         self.menuQuit.setObjectName("menuQuit")
+        self.menuView = QtWidgets.QMenu(self.menubar)
+        self.menuView.setObjectName("menuView")
         self.menuHelp = QtWidgets.QMenu(self.menubar)
         self.menuHelp.setObjectName("menuHelp")
         MainWindow.setMenuBar(self.menubar)
@@ -259,15 +334,41 @@ class Ui_MainWindow(object):
         self.actionOpen.setObjectName("actionOpen")
         self.actionSave = QtWidgets.QAction(MainWindow)
         self.actionSave.setObjectName("actionSave")
+        self.actionExport = QtWidgets.QAction(MainWindow)
+        self.actionExport.setObjectName("actionExport")
         self.actionQuit = QtWidgets.QAction(MainWindow)
         self.actionQuit.setObjectName("actionQuit")
         self.actionInstruct = QtWidgets.QAction(MainWindow)
         self.actionInstruct.setObjectName("actionInstruct")
+        self.actionSpectrogram = QtWidgets.QAction(MainWindow)
+        self.actionSpectrogram.setObjectName("actionSpectrogram")
+        self.actionStats = QtWidgets.QAction(MainWindow)
+        self.actionStats.setCheckable(True)
+        self.actionStats.setObjectName("actionStats")
+        self.actionUndo = QtWidgets.QAction(MainWindow)
+        self.actionUndo.setObjectName("actionUndo")
+        self.actionRedo = QtWidgets.QAction(MainWindow)
+        self.actionRedo.setObjectName("actionRedo")
+        self.actionOriginal = QtWidgets.QAction(MainWindow)
+        self.actionOriginal.setCheckable(True)
+        self.actionOriginal.setObjectName("actionOriginal")
+        self.actionClearSteps = QtWidgets.QAction(MainWindow)
+        self.actionClearSteps.setObjectName("actionClearSteps")
+        self.menu.addAction(self.actionOpen)
         self.menu.addAction(self.actionSave)
+        self.menu.addAction(self.actionExport)
+        self.menuEdit.addAction(self.actionUndo)
+        self.menuEdit.addAction(self.actionRedo)
+        self.menuEdit.addAction(self.actionOriginal)
+        self.menuEdit.addAction(self.actionClearSteps)
         self.menuQuit.addAction(self.actionQuit)
+        self.menuView.addAction(self.actionSpectrogram)
+        self.menuView.addAction(self.actionStats)
         self.menuHelp.addAction(self.actionInstruct)
         self.menubar.addAction(self.menu.menuAction())
+        self.menubar.addAction(self.menuEdit.menuAction())
         self.menubar.addAction(self.menuQuit.menuAction())
+        self.menubar.addAction(self.menuView.menuAction())
         self.menubar.addAction(self.menuHelp.menuAction())
 
         self.retranslateUi(MainWindow)
@@ -290,6 +391,11 @@ class Ui_MainWindow(object):
         self.signalBaseline.setText(_translate("MainWindow", "1.0"))
         self.label_4.setText(_translate("MainWindow", "信号幅值"))
         self.label_5.setText(_translate("MainWindow", "信号时移"))
+        self.label_6.setText(_translate("MainWindow", "采样点数"))
+        self.sampleCount.setText(_translate("MainWindow", "1000"))
+        self.label_7.setText(_translate("MainWindow", "数据类型"))
+        self.sampleDtype.setItemText(0, _translate("MainWindow", "float64"))
+        self.sampleDtype.setItemText(1, _translate("MainWindow", "float32"))
         self.label.setText(_translate("MainWindow", "          信号类型"))
         self.signalType.setItemText(0, _translate("MainWindow", "正弦波"))
         self.signalType.setItemText(1, _translate("MainWindow", "三角波"))
@@ -304,10 +410,41 @@ class Ui_MainWindow(object):
         self.filterButton.setText(_translate("MainWindow", "进行滤波"))
         self.syntheticButton.setText(_translate("MainWindow", "合成信号"))
         self.spectrumButton.setText(_translate("MainWindow", "生成频谱"))
+        self.label_8.setText(_translate("MainWindow", "噪声类型"))
+        self.noiseType.setItemText(0, _translate("MainWindow", "白噪声"))
+        self.noiseType.setItemText(1, _translate("MainWindow", "粉红噪声"))
+        self.noiseType.setItemText(2, _translate("MainWindow", "布朗噪声"))
+        self.noiseType.setItemText(3, _translate("MainWindow", "脉冲噪声"))
+        self.noiseType.setItemText(4, _translate("MainWindow", "工频干扰"))
+        self.label_9.setText(_translate("MainWindow", "信噪比(dB)"))
+        self.noiseSnr.setPlaceholderText(_translate("MainWindow", "空：按默认强度"))
+        self.label_10.setText(_translate("MainWindow", "随机种子"))
+        self.noiseSeed.setPlaceholderText(_translate("MainWindow", "空：每次不同"))
+        self.label_11.setText(_translate("MainWindow", "滤波方式"))
+        self.filterMode.setItemText(0, _translate("MainWindow", "Butterworth 低通"))
+        self.filterMode.setItemText(1, _translate("MainWindow", "移动平均"))
+        self.filterMode.setItemText(2, _translate("MainWindow", "中值滤波"))
+        self.filterMode.setItemText(3, _translate("MainWindow", "指数移动平均"))
+        self.label_12.setText(_translate("MainWindow", "截止频率"))
+        self.filterCutoff.setToolTip(_translate("MainWindow", "相对于奈奎斯特频率，0~1"))
+        self.filterCutoff.setText(_translate("MainWindow", "0.1"))
+        self.label_13.setText(_translate("MainWindow", "阶数"))
+        self.filterSize.setText(_translate("MainWindow", "4"))
         self.menu.setTitle(_translate("MainWindow", "文件"))
+        self.menuEdit.setTitle(_translate("MainWindow", "编辑"))
         self.menuQuit.setTitle(_translate("MainWindow", "退出"))
+        self.menuView.setTitle(_translate("MainWindow", "视图"))
         self.menuHelp.setTitle(_translate("MainWindow", "帮助"))
         self.actionOpen.setText(_translate("MainWindow", "打开"))
         self.actionSave.setText(_translate("MainWindow", "保存"))
+        self.actionExport.setText(_translate("MainWindow", "导出数据"))
         self.actionQuit.setText(_translate("MainWindow", "退出"))
         self.actionInstruct.setText(_translate("MainWindow", "使用说明"))
+        self.actionSpectrogram.setText(_translate("MainWindow", "实时频谱图"))
+        self.actionStats.setText(_translate("MainWindow", "性能统计"))
+        self.actionUndo.setText(_translate("MainWindow", "撤销"))
+        self.actionUndo.setShortcut(_translate("MainWindow", "Ctrl+Z"))
+        self.actionRedo.setText(_translate("MainWindow", "重做"))
+        self.actionRedo.setShortcut(_translate("MainWindow", "Ctrl+Y"))
+        self.actionOriginal.setText(_translate("MainWindow", "显示原始信号"))
+        self.actionClearSteps.setText(_translate("MainWindow", "清除处理步骤"))
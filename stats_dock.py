@@ -0,0 +1,56 @@
+from PyQt5.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem,
+                             QPushButton, QHeaderView)
+from PyQt5.QtCore import QTimer, Qt
+
+COLUMNS = ['名称', '次数', '最近', 'p50', 'p95', 'p99']
+
+
+class StatsDock(QDockWidget):
+    # 性能统计面板：定时刷新各热点函数的调用次数和耗时百分位（毫秒）
+    def __init__(self, registry, parent=None, refresh_interval=500):
+        super().__init__('性能统计 (ms)', parent)
+        self.registry = registry
+        # 只能通过“视图”菜单开关，关闭面板时同时关闭统计
+        self.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
+        self.initUI()
+        self.timer = QTimer(self)
+        self.timer.setInterval(refresh_interval)
+        self.timer.timeout.connect(self.refresh)
+
+    def initUI(self):
+        widget = QWidget(self)
+        layout = QVBoxLayout(widget)
+        self.table = QTableWidget(0, len(COLUMNS), widget)
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+        reset_button = QPushButton('清零', widget)
+        reset_button.clicked.connect(self.reset)
+        layout.addWidget(reset_button)
+        self.setWidget(widget)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def reset(self):
+        self.registry.reset()
+        self.refresh()
+
+    def refresh(self):
+        summary = self.registry.summary()
+        self.table.setRowCount(len(summary))
+        for row, (name, stats) in enumerate(summary.items()):
+            values = [name, str(stats['count'])] + [f"{stats[key]:.2f}" for key in ('last', 'p50', 'p95', 'p99')]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
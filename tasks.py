@@ -0,0 +1,107 @@
+import concurrent.futures
+import itertools
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class TaskCancelled(Exception):
+    # 任务已被同一通道上更新的请求取代
+    pass
+
+
+class TaskRunner(QObject):
+    # 后台计算：在线程池中执行耗时的 NumPy 计算，结果通过 Qt 信号回到界面线程
+    # 同一通道上新提交的任务会取代旧任务：尚未开始的旧任务直接取消，正在执行的旧任务结果被丢弃；
+    # 支持进度汇报的任务在汇报进度时检查是否已被取代，被取代时提前结束
+    busyChanged = pyqtSignal(bool)  # 是否有任务正在执行
+    progressChanged = pyqtSignal(str, float)  # 通道, 进度（0~1）
+
+    # 以下信号从工作线程发出，经队列连接回到界面线程处理
+    _finished = pyqtSignal(str, int, object)
+    _failed = pyqtSignal(str, int, object)
+    _progress = pyqtSignal(str, int, float)
+
+    def __init__(self, max_workers=2, parent=None):
+        super(TaskRunner, self).__init__(parent)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                              thread_name_prefix='signal-worker')
+        self._ids = itertools.count(1)
+        self._latest = {}  # 通道 → (任务编号, future, 完成回调, 失败回调)
+        self._finished.connect(self._on_finished)
+        self._failed.connect(self._on_failed)
+        self._progress.connect(self._on_progress)
+
+    def is_busy(self, channel=None):
+        if channel is None:
+            return bool(self._latest)
+        return channel in self._latest
+
+    def submit(self, channel, func, on_done=None, on_error=None, with_progress=False):
+        # 提交任务，返回任务编号；with_progress=True 时以 progress= 关键字参数传入进度回调
+        task_id = next(self._ids)
+        was_busy = self.is_busy()
+        self._cancel_future(channel)
+
+        def progress(fraction):
+            entry = self._latest.get(channel)
+            if entry is None or entry[0] != task_id:
+                raise TaskCancelled()
+            self._progress.emit(channel, task_id, fraction)
+
+        def run():
+            try:
+                result = func(progress=progress) if with_progress else func()
+            except TaskCancelled:
+                return
+            except Exception as e:
+                self._failed.emit(channel, task_id, e)
+                return
+            self._finished.emit(channel, task_id, result)
+
+        future = self.executor.submit(run)
+        self._latest[channel] = (task_id, future, on_done, on_error)
+        if not was_busy:
+            self.busyChanged.emit(True)
+        return task_id
+
+    def cancel(self, channel):
+        # 取消通道上的任务，正在执行的任务结果会被丢弃
+        if self._cancel_future(channel) and not self._latest:
+            self.busyChanged.emit(False)
+
+    def shutdown(self):
+        # 关闭线程池，尚未开始的任务被取消
+        self._latest.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cancel_future(self, channel):
+        entry = self._latest.pop(channel, None)
+        if entry is None:
+            return False
+        entry[1].cancel()
+        return True
+
+    def _take(self, channel, task_id):
+        # 只有通道上最新的任务才会被处理
+        entry = self._latest.get(channel)
+        if entry is None or entry[0] != task_id:
+            return None
+        del self._latest[channel]
+        if not self._latest:
+            self.busyChanged.emit(False)
+        return entry
+
+    def _on_finished(self, channel, task_id, result):
+        entry = self._take(channel, task_id)
+        if entry is not None and entry[2] is not None:
+            entry[2](result)
+
+    def _on_failed(self, channel, task_id, error):
+        entry = self._take(channel, task_id)
+        if entry is not None and entry[3] is not None:
+            entry[3](error)
+
+    def _on_progress(self, channel, task_id, fraction):
+        entry = self._latest.get(channel)
+        if entry is not None and entry[0] == task_id:
+            self.progressChanged.emit(channel, fraction)